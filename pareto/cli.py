@@ -0,0 +1,58 @@
+#####################################################################################################
+# PARETO was produced under the DOE Produced Water Application for Beneficial Reuse Environmental
+# Impact and Treatment Optimization (PARETO), and is copyright (c) 2021-2026 by the software owners:
+# The Regents of the University of California, through Lawrence Berkeley National Laboratory, et al.
+# All rights reserved.
+#
+# NOTICE. This Software was developed under funding from the U.S. Department of Energy and the U.S.
+# Government consequently retains certain rights. As such, the U.S. Government has been granted for
+# itself and others acting on its behalf a paid-up, nonexclusive, irrevocable, worldwide license in
+# the Software to reproduce, distribute copies to the public, prepare derivative works, and perform
+# publicly and display publicly, and to permit others to do so.
+#####################################################################################################
+"""
+Command line interface of PARETO, available as the ``pareto`` command.
+
+Commands:
+    pareto solvers [NAME ...]: list which solvers are available and how long each
+    check took
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+
+def _solvers(solver_names: List[str]) -> int:
+    from pareto.utilities.solvers import SUPPORTED_SOLVERS, check_solvers
+
+    checks = check_solvers(solver_names or SUPPORTED_SOLVERS)
+    width = max(len("solver"), *(len(check["solver"]) for check in checks))
+    print(f"{'solver':<{width}}  available  check time [s]")
+    for check in checks:
+        available = "yes" if check["available"] else "no"
+        print(f"{check['solver']:<{width}}  {available:<9}  {check['check_time']:.3f}")
+    # Fail if none of the solvers can be used
+    return 0 if any(check["available"] for check in checks) else 1
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="pareto", description=__doc__.split("\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    solvers = commands.add_parser(
+        "solvers", help="list which solvers are available and how long each check took"
+    )
+    solvers.add_argument(
+        "solver_names",
+        nargs="*",
+        metavar="NAME",
+        help="solver names to check (default: the solvers supported by PARETO)",
+    )
+    args = parser.parse_args(args)
+
+    if args.command == "solvers":
+        return _solvers(args.solver_names)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
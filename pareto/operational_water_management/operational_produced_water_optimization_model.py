@@ -338,34 +338,26 @@ def create_model(df_sets, df_parameters, default={}):
     build_common_constraints(model)
 
     def TrucksMaxCapacityRule(model, l, l_tilde, t):
-        if (l, l_tilde) in model.s_LLT:
-            return (
-                model.v_F_Trucked[l, l_tilde, t]
-                <= model.p_sigma_MaxTruckFlow * model.vb_y_Truck[l, l_tilde, t]
-            )
-        else:
-            return Constraint.Skip
+        return (
+            model.v_F_Trucked[l, l_tilde, t]
+            <= model.p_sigma_MaxTruckFlow * model.vb_y_Truck[l, l_tilde, t]
+        )
 
     model.TrucksMaxCapacity = Constraint(
-        model.s_L,
-        model.s_L,
+        model.s_LLT,
         model.s_T,
         rule=TrucksMaxCapacityRule,
         doc="Maximum amount of water that can be transported by trucks",
     )
 
     def TrucksMinCapacityRule(model, l, l_tilde, t):
-        if (l, l_tilde) in model.s_LLT:
-            return (
-                model.v_F_Trucked[l, l_tilde, t]
-                >= model.p_sigma_MinTruckFlow * model.vb_y_Truck[l, l_tilde, t]
-            )
-        else:
-            return Constraint.Skip
+        return (
+            model.v_F_Trucked[l, l_tilde, t]
+            >= model.p_sigma_MinTruckFlow * model.vb_y_Truck[l, l_tilde, t]
+        )
 
     model.TrucksMinCapacity = Constraint(
-        model.s_L,
-        model.s_L,
+        model.s_LLT,
         model.s_T,
         rule=TrucksMinCapacityRule,
         doc="Minimum amount of water that can be transported by trucks",
@@ -555,16 +547,10 @@ def create_model(df_sets, df_parameters, default={}):
         return (
             model.p_epsilon_Treatment[r, "TDS"]
             * (
-                sum(
-                    model.v_F_Piped[l, r, t] for l in model.s_L if (l, r) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[l, r, t]
-                    for l in model.s_L
-                    if (l, r) in model.s_LLT
-                )
+                sum(model.v_F_Piped[l, r, t] for l in model.s_PipingIn[r])
+                + sum(model.v_F_Trucked[l, r, t] for l in model.s_TruckingIn[r])
             )
-            == sum(model.v_F_Piped[r, l, t] for l in model.s_L if (l, r) in model.s_LLA)
+            == sum(model.v_F_Piped[r, l, t] for l in model.s_PipingIn[r])
             + model.v_F_UnusedTreatedWater[r, t]
         )
 
@@ -577,10 +563,8 @@ def create_model(df_sets, df_parameters, default={}):
 
     def BeneficialReuseCapacityRule(model, o, t):
         return (
-            sum(model.v_F_Piped[l, o, t] for l in model.s_L if (l, o) in model.s_LLA)
-            + sum(
-                model.v_F_Trucked[l, o, t] for l in model.s_L if (l, o) in model.s_LLT
-            )
+            sum(model.v_F_Piped[l, o, t] for l in model.s_PipingIn[o])
+            + sum(model.v_F_Trucked[l, o, t] for l in model.s_TruckingIn[o])
             <= model.p_sigma_Reuse[o] + model.v_S_BeneficialReuseCapacity[o]
         )
 
@@ -597,14 +581,8 @@ def create_model(df_sets, df_parameters, default={}):
         return (
             model.v_C_Treatment[r, t]
             == (
-                sum(
-                    model.v_F_Piped[l, r, t] for l in model.s_L if (l, r) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[l, r, t]
-                    for l in model.s_L
-                    if (l, r) in model.s_LLT
-                )
+                sum(model.v_F_Piped[l, r, t] for l in model.s_PipingIn[r])
+                + sum(model.v_F_Trucked[l, r, t] for l in model.s_TruckingIn[r])
             )
             * model.p_pi_Treatment[r]
         )
@@ -637,8 +615,8 @@ def create_model(df_sets, df_parameters, default={}):
 
     def TreatmentDestinationDeliveriesRule(model, r, t):
         return model.v_F_TreatmentDestination[r, t] == sum(
-            model.v_F_Piped[l, r, t] for l in model.s_L if (l, r) in model.s_LLA
-        ) + sum(model.v_F_Trucked[l, r, t] for l in model.s_L if (l, r) in model.s_LLT)
+            model.v_F_Piped[l, r, t] for l in model.s_PipingIn[r]
+        ) + sum(model.v_F_Trucked[l, r, t] for l in model.s_TruckingIn[r])
 
     model.TreatmentDestinationDeliveries = Constraint(
         model.s_R,
@@ -708,38 +686,38 @@ def water_quality(model):
         return (
             sum(
                 model.v_F_Piped[n, k, t] * model.v_Q[n, qc, t]
-                for n in model.s_N
-                if model.p_NKA[n, k]
+                for n in model.s_PipingIn[k]
+                if n in model.s_N and model.p_NKA[n, k]
             )
             + sum(
                 model.v_F_Piped[s, k, t] * model.v_Q[s, qc, t]
-                for s in model.s_S
-                if model.p_SKA[s, k]
+                for s in model.s_PipingIn[k]
+                if s in model.s_S and model.p_SKA[s, k]
             )
             + sum(
                 model.v_F_Piped[r, k, t] * model.v_Q[r, qc, t]
-                for r in model.s_R
-                if model.p_RKA[r, k]
+                for r in model.s_PipingIn[k]
+                if r in model.s_R and model.p_RKA[r, k]
             )
             + sum(
                 model.v_F_Trucked[s, k, t] * model.v_Q[s, qc, t]
-                for s in model.s_S
-                if model.p_SKT[s, k]
+                for s in model.s_TruckingIn[k]
+                if s in model.s_S and model.p_SKT[s, k]
             )
             + sum(
                 model.v_F_Trucked[p, k, t] * model.v_Q[p, qc, t]
-                for p in model.s_PP
-                if model.p_PKT[p, k]
+                for p in model.s_TruckingIn[k]
+                if p in model.s_PP and model.p_PKT[p, k]
             )
             + sum(
                 model.v_F_Trucked[p, k, t] * model.v_Q[p, qc, t]
-                for p in model.s_CP
-                if model.p_CKT[p, k]
+                for p in model.s_TruckingIn[k]
+                if p in model.s_CP and model.p_CKT[p, k]
             )
             + sum(
                 model.v_F_Trucked[r, k, t] * model.v_Q[r, qc, t]
-                for r in model.s_R
-                if model.p_RKT[r, k]
+                for r in model.s_TruckingIn[k]
+                if r in model.s_R and model.p_RKT[r, k]
             )
             == model.v_Q[k, qc, t] * model.v_F_DisposalDestination[k, t]
         )
@@ -756,30 +734,54 @@ def water_quality(model):
         if t == model.s_T.first():
             return model.p_lambda_Storage[s] * model.p_xi[s, qc] + sum(
                 model.v_F_Piped[n, s, t] * model.v_Q[n, qc, t]
-                for n in model.s_N
-                if model.p_NSA[n, s]
+                for n in model.s_PipingIn[s]
+                if n in model.s_N and model.p_NSA[n, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * model.v_Q[p, qc, t]
-                for p in model.s_PP
-                if model.p_PST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_PP and model.p_PST[p, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * model.v_Q[p, qc, t]
-                for p in model.s_CP
-                if model.p_CST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_CP and model.p_CST[p, s]
             ) == model.v_Q[
                 s, qc, t
             ] * (
                 model.v_L_Storage[s, t]
-                + sum(model.v_F_Piped[s, n, t] for n in model.s_N if model.p_SNA[s, n])
-                + sum(model.v_F_Piped[s, p, t] for p in model.s_CP if model.p_SCA[s, p])
-                + sum(model.v_F_Piped[s, k, t] for k in model.s_K if model.p_SKA[s, k])
-                + sum(model.v_F_Piped[s, r, t] for r in model.s_R if model.p_SRA[s, r])
-                + sum(model.v_F_Piped[s, o, t] for o in model.s_O if model.p_SOA[s, o])
                 + sum(
-                    model.v_F_Trucked[s, p, t] for p in model.s_CP if model.p_SCT[s, p]
+                    model.v_F_Piped[s, n, t]
+                    for n in model.s_PipingOut[s]
+                    if n in model.s_N and model.p_SNA[s, n]
+                )
+                + sum(
+                    model.v_F_Piped[s, p, t]
+                    for p in model.s_PipingOut[s]
+                    if p in model.s_CP and model.p_SCA[s, p]
+                )
+                + sum(
+                    model.v_F_Piped[s, k, t]
+                    for k in model.s_PipingOut[s]
+                    if k in model.s_K and model.p_SKA[s, k]
+                )
+                + sum(
+                    model.v_F_Piped[s, r, t]
+                    for r in model.s_PipingOut[s]
+                    if r in model.s_R and model.p_SRA[s, r]
+                )
+                + sum(
+                    model.v_F_Piped[s, o, t]
+                    for o in model.s_PipingOut[s]
+                    if o in model.s_O and model.p_SOA[s, o]
+                )
+                + sum(
+                    model.v_F_Trucked[s, p, t]
+                    for p in model.s_TruckingOut[s]
+                    if p in model.s_CP and model.p_SCT[s, p]
                 )
                 + sum(
-                    model.v_F_Trucked[s, k, t] for k in model.s_K if model.p_SKT[s, k]
+                    model.v_F_Trucked[s, k, t]
+                    for k in model.s_TruckingOut[s]
+                    if k in model.s_K and model.p_SKT[s, k]
                 )
             )
         else:
@@ -787,30 +789,54 @@ def water_quality(model):
                 s, qc, model.s_T.prev(t)
             ] + sum(
                 model.v_F_Piped[n, s, t] * model.v_Q[n, qc, t]
-                for n in model.s_N
-                if model.p_NSA[n, s]
+                for n in model.s_PipingIn[s]
+                if n in model.s_N and model.p_NSA[n, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * model.v_Q[p, qc, t]
-                for p in model.s_PP
-                if model.p_PST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_PP and model.p_PST[p, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * model.v_Q[p, qc, t]
-                for p in model.s_CP
-                if model.p_CST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_CP and model.p_CST[p, s]
             ) == model.v_Q[
                 s, qc, t
             ] * (
                 model.v_L_Storage[s, t]
-                + sum(model.v_F_Piped[s, n, t] for n in model.s_N if model.p_SNA[s, n])
-                + sum(model.v_F_Piped[s, p, t] for p in model.s_CP if model.p_SCA[s, p])
-                + sum(model.v_F_Piped[s, k, t] for k in model.s_K if model.p_SKA[s, k])
-                + sum(model.v_F_Piped[s, r, t] for r in model.s_R if model.p_SRA[s, r])
-                + sum(model.v_F_Piped[s, o, t] for o in model.s_O if model.p_SOA[s, o])
                 + sum(
-                    model.v_F_Trucked[s, p, t] for p in model.s_CP if model.p_SCT[s, p]
+                    model.v_F_Piped[s, n, t]
+                    for n in model.s_PipingOut[s]
+                    if n in model.s_N and model.p_SNA[s, n]
+                )
+                + sum(
+                    model.v_F_Piped[s, p, t]
+                    for p in model.s_PipingOut[s]
+                    if p in model.s_CP and model.p_SCA[s, p]
+                )
+                + sum(
+                    model.v_F_Piped[s, k, t]
+                    for k in model.s_PipingOut[s]
+                    if k in model.s_K and model.p_SKA[s, k]
+                )
+                + sum(
+                    model.v_F_Piped[s, r, t]
+                    for r in model.s_PipingOut[s]
+                    if r in model.s_R and model.p_SRA[s, r]
+                )
+                + sum(
+                    model.v_F_Piped[s, o, t]
+                    for o in model.s_PipingOut[s]
+                    if o in model.s_O and model.p_SOA[s, o]
                 )
                 + sum(
-                    model.v_F_Trucked[s, k, t] for k in model.s_K if model.p_SKT[s, k]
+                    model.v_F_Trucked[s, p, t]
+                    for p in model.s_TruckingOut[s]
+                    if p in model.s_CP and model.p_SCT[s, p]
+                )
+                + sum(
+                    model.v_F_Trucked[s, k, t]
+                    for k in model.s_TruckingOut[s]
+                    if k in model.s_K and model.p_SKT[s, k]
                 )
             )
 
@@ -827,26 +853,30 @@ def water_quality(model):
         return model.p_epsilon_Treatment[r, qc] * (
             sum(
                 model.v_F_Piped[n, r, t] * model.v_Q[n, qc, t]
-                for n in model.s_N
-                if model.p_NRA[n, r]
+                for n in model.s_PipingIn[r]
+                if n in model.s_N and model.p_NRA[n, r]
             )
             + sum(
                 model.v_F_Piped[s, r, t] * model.v_Q[s, qc, t]
-                for s in model.s_S
-                if model.p_SRA[s, r]
+                for s in model.s_PipingIn[r]
+                if s in model.s_S and model.p_SRA[s, r]
             )
             + sum(
                 model.v_F_Trucked[p, r, t] * model.v_Q[p, qc, t]
-                for p in model.s_PP
-                if model.p_PRT[p, r]
+                for p in model.s_TruckingIn[r]
+                if p in model.s_PP and model.p_PRT[p, r]
             )
             + sum(
                 model.v_F_Trucked[p, r, t] * model.v_Q[p, qc, t]
-                for p in model.s_CP
-                if model.p_CRT[p, r]
+                for p in model.s_TruckingIn[r]
+                if p in model.s_CP and model.p_CRT[p, r]
             )
         ) == model.v_Q[r, qc, t] * (
-            sum(model.v_F_Piped[r, p, t] for p in model.s_CP if model.p_RCA[r, p])
+            sum(
+                model.v_F_Piped[r, p, t]
+                for p in model.s_PipingOut[r]
+                if p in model.s_CP and model.p_RCA[r, p]
+            )
             + model.v_F_UnusedTreatedWater[r, t]
         )
 
@@ -861,33 +891,53 @@ def water_quality(model):
     def NetworkNodeWaterQualityRule(model, n, qc, t):
         return sum(
             model.v_F_Piped[p, n, t] * model.v_Q[p, qc, t]
-            for p in model.s_PP
-            if model.p_PNA[p, n]
+            for p in model.s_PipingIn[n]
+            if p in model.s_PP and model.p_PNA[p, n]
         ) + sum(
             model.v_F_Piped[p, n, t] * model.v_Q[p, qc, t]
-            for p in model.s_CP
-            if model.p_CNA[p, n]
+            for p in model.s_PipingIn[n]
+            if p in model.s_CP and model.p_CNA[p, n]
         ) + sum(
             model.v_F_Piped[s, n, t] * model.v_Q[s, qc, t]
-            for s in model.s_S
-            if model.p_SNA[s, n]
+            for s in model.s_PipingIn[n]
+            if s in model.s_S and model.p_SNA[s, n]
         ) + sum(
             model.v_F_Piped[n_tilde, n, t] * model.v_Q[n_tilde, qc, t]
-            for n_tilde in model.s_N
-            if model.p_NNA[n_tilde, n]
+            for n_tilde in model.s_PipingIn[n]
+            if n_tilde in model.s_N and model.p_NNA[n_tilde, n]
         ) == model.v_Q[
             n, qc, t
         ] * (
             sum(
                 model.v_F_Piped[n, n_tilde, t]
-                for n_tilde in model.s_N
-                if model.p_NNA[n, n_tilde]
+                for n_tilde in model.s_PipingOut[n]
+                if n_tilde in model.s_N and model.p_NNA[n, n_tilde]
+            )
+            + sum(
+                model.v_F_Piped[n, p, t]
+                for p in model.s_PipingOut[n]
+                if p in model.s_CP and model.p_NCA[n, p]
+            )
+            + sum(
+                model.v_F_Piped[n, k, t]
+                for k in model.s_PipingOut[n]
+                if k in model.s_K and model.p_NKA[n, k]
+            )
+            + sum(
+                model.v_F_Piped[n, r, t]
+                for r in model.s_PipingOut[n]
+                if r in model.s_R and model.p_NRA[n, r]
+            )
+            + sum(
+                model.v_F_Piped[n, s, t]
+                for s in model.s_PipingOut[n]
+                if s in model.s_S and model.p_NSA[n, s]
+            )
+            + sum(
+                model.v_F_Piped[n, o, t]
+                for o in model.s_PipingOut[n]
+                if o in model.s_O and model.p_NOA[n, o]
             )
-            + sum(model.v_F_Piped[n, p, t] for p in model.s_CP if model.p_NCA[n, p])
-            + sum(model.v_F_Piped[n, k, t] for k in model.s_K if model.p_NKA[n, k])
-            + sum(model.v_F_Piped[n, r, t] for r in model.s_R if model.p_NRA[n, r])
-            + sum(model.v_F_Piped[n, s, t] for s in model.s_S if model.p_NSA[n, s])
-            + sum(model.v_F_Piped[n, o, t] for o in model.s_O if model.p_NOA[n, o])
         )
 
     model.NetworkWaterQuality = Constraint(
@@ -902,18 +952,18 @@ def water_quality(model):
         return (
             sum(
                 model.v_F_Piped[n, o, t] * model.v_Q[n, qc, t]
-                for n in model.s_N
-                if model.p_NOA[n, o]
+                for n in model.s_PipingIn[o]
+                if n in model.s_N and model.p_NOA[n, o]
             )
             + sum(
                 model.v_F_Piped[s, o, t] * model.v_Q[s, qc, t]
-                for s in model.s_S
-                if model.p_SOA[s, o]
+                for s in model.s_PipingIn[o]
+                if s in model.s_S and model.p_SOA[s, o]
             )
             + sum(
                 model.v_F_Trucked[p, o, t] * model.v_Q[p, qc, t]
-                for p in model.s_PP
-                if model.p_POT[p, o]
+                for p in model.s_TruckingIn[o]
+                if p in model.s_PP and model.p_POT[p, o]
             )
             == model.v_Q[o, qc, t] * model.v_F_BeneficialReuseDestination[o, t]
         )
@@ -1252,31 +1302,39 @@ def water_quality_discrete(model, df_parameters, df_sets):
             <= (
                 model.p_sigma_Storage[s]
                 + sum(
-                    model.p_sigma_Pipeline[s, n] for n in model.s_N if model.p_SNA[s, n]
+                    model.p_sigma_Pipeline[s, n]
+                    for n in model.s_PipingOut[s]
+                    if n in model.s_N and model.p_SNA[s, n]
                 )
                 + sum(
                     model.p_sigma_Pipeline[s, p]
-                    for p in model.s_CP
-                    if model.p_SCA[s, p]
+                    for p in model.s_PipingOut[s]
+                    if p in model.s_CP and model.p_SCA[s, p]
                 )
                 + sum(
-                    model.p_sigma_Pipeline[s, k] for k in model.s_K if model.p_SKA[s, k]
+                    model.p_sigma_Pipeline[s, k]
+                    for k in model.s_PipingOut[s]
+                    if k in model.s_K and model.p_SKA[s, k]
                 )
                 + sum(
-                    model.p_sigma_Pipeline[s, r] for r in model.s_R if model.p_SRA[s, r]
+                    model.p_sigma_Pipeline[s, r]
+                    for r in model.s_PipingOut[s]
+                    if r in model.s_R and model.p_SRA[s, r]
                 )
                 + sum(
-                    model.p_sigma_Pipeline[s, o] for o in model.s_O if model.p_SOA[s, o]
+                    model.p_sigma_Pipeline[s, o]
+                    for o in model.s_PipingOut[s]
+                    if o in model.s_O and model.p_SOA[s, o]
                 )
                 + sum(
                     (model.p_delta_Truck * model.p_max_number_of_trucks)
-                    for p in model.s_CP
-                    if model.p_SCT[s, p]
+                    for p in model.s_TruckingOut[s]
+                    if p in model.s_CP and model.p_SCT[s, p]
                 )
                 + sum(
                     (model.p_delta_Truck * model.p_max_number_of_trucks)
-                    for k in model.s_K
-                    if model.p_SKT[s, k]
+                    for k in model.s_TruckingOut[s]
+                    if k in model.s_K and model.p_SKT[s, k]
                 )
             )
             * model.v_DQ[s, t, qc, q],
@@ -1292,16 +1350,40 @@ def water_quality_discrete(model, df_parameters, df_sets):
             )
             == (
                 model.v_L_Storage[s, t]
-                + sum(model.v_F_Piped[s, n, t] for n in model.s_N if model.p_SNA[s, n])
-                + sum(model.v_F_Piped[s, p, t] for p in model.s_CP if model.p_SCA[s, p])
-                + sum(model.v_F_Piped[s, k, t] for k in model.s_K if model.p_SKA[s, k])
-                + sum(model.v_F_Piped[s, r, t] for r in model.s_R if model.p_SRA[s, r])
-                + sum(model.v_F_Piped[s, o, t] for o in model.s_O if model.p_SOA[s, o])
                 + sum(
-                    model.v_F_Trucked[s, p, t] for p in model.s_CP if model.p_SCT[s, p]
+                    model.v_F_Piped[s, n, t]
+                    for n in model.s_PipingOut[s]
+                    if n in model.s_N and model.p_SNA[s, n]
+                )
+                + sum(
+                    model.v_F_Piped[s, p, t]
+                    for p in model.s_PipingOut[s]
+                    if p in model.s_CP and model.p_SCA[s, p]
+                )
+                + sum(
+                    model.v_F_Piped[s, k, t]
+                    for k in model.s_PipingOut[s]
+                    if k in model.s_K and model.p_SKA[s, k]
                 )
                 + sum(
-                    model.v_F_Trucked[s, k, t] for k in model.s_K if model.p_SKT[s, k]
+                    model.v_F_Piped[s, r, t]
+                    for r in model.s_PipingOut[s]
+                    if r in model.s_R and model.p_SRA[s, r]
+                )
+                + sum(
+                    model.v_F_Piped[s, o, t]
+                    for o in model.s_PipingOut[s]
+                    if o in model.s_O and model.p_SOA[s, o]
+                )
+                + sum(
+                    model.v_F_Trucked[s, p, t]
+                    for p in model.s_TruckingOut[s]
+                    if p in model.s_CP and model.p_SCT[s, p]
+                )
+                + sum(
+                    model.v_F_Trucked[s, k, t]
+                    for k in model.s_TruckingOut[s]
+                    if k in model.s_K and model.p_SKT[s, k]
                 )
             ),
             doc="The sum of discretized outflows at storage site s equals the total outflow for storage site s",
@@ -1368,8 +1450,16 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 model.v_F_DiscreteFlowTreatment[r, t, qc, q] for q in model.s_Q
             )
             == (
-                sum(model.v_F_Piped[r, p, t] for p in model.s_CP if model.p_RCA[r, p])
-                + sum(model.v_F_Piped[r, s, t] for s in model.s_S if model.p_RSA[r, s])
+                sum(
+                    model.v_F_Piped[r, p, t]
+                    for p in model.s_PipingOut[r]
+                    if p in model.s_CP and model.p_RCA[r, p]
+                )
+                + sum(
+                    model.v_F_Piped[r, s, t]
+                    for s in model.s_PipingOut[r]
+                    if s in model.s_S and model.p_RSA[r, s]
+                )
                 + model.v_F_UnusedTreatedWater[r, t]
             ),
             doc="The sum of discretized quantities at treatment site r equals the total quantity for treatment site r",
@@ -1395,25 +1485,33 @@ def water_quality_discrete(model, df_parameters, df_sets):
             <= (
                 sum(
                     model.p_sigma_Pipeline[n, n_tilde]
-                    for n_tilde in model.s_N
-                    if model.p_NNA[n, n_tilde]
+                    for n_tilde in model.s_PipingOut[n]
+                    if n_tilde in model.s_N and model.p_NNA[n, n_tilde]
                 )
                 + sum(
                     model.p_sigma_Pipeline[n, p]
-                    for p in model.s_CP
-                    if model.p_NCA[n, p]
+                    for p in model.s_PipingOut[n]
+                    if p in model.s_CP and model.p_NCA[n, p]
                 )
                 + sum(
-                    model.p_sigma_Pipeline[n, k] for k in model.s_K if model.p_NKA[n, k]
+                    model.p_sigma_Pipeline[n, k]
+                    for k in model.s_PipingOut[n]
+                    if k in model.s_K and model.p_NKA[n, k]
                 )
                 + sum(
-                    model.p_sigma_Pipeline[n, r] for r in model.s_R if model.p_NRA[n, r]
+                    model.p_sigma_Pipeline[n, r]
+                    for r in model.s_PipingOut[n]
+                    if r in model.s_R and model.p_NRA[n, r]
                 )
                 + sum(
-                    model.p_sigma_Pipeline[n, s] for s in model.s_S if model.p_NSA[n, s]
+                    model.p_sigma_Pipeline[n, s]
+                    for s in model.s_PipingOut[n]
+                    if s in model.s_S and model.p_NSA[n, s]
                 )
                 + sum(
-                    model.p_sigma_Pipeline[n, o] for o in model.s_O if model.p_NOA[n, o]
+                    model.p_sigma_Pipeline[n, o]
+                    for o in model.s_PipingOut[n]
+                    if o in model.s_O and model.p_NOA[n, o]
                 )
             )
             * model.v_DQ[n, t, qc, q],
@@ -1430,14 +1528,34 @@ def water_quality_discrete(model, df_parameters, df_sets):
             == (
                 sum(
                     model.v_F_Piped[n, n_tilde, t]
-                    for n_tilde in model.s_N
-                    if model.p_NNA[n, n_tilde]
+                    for n_tilde in model.s_PipingOut[n]
+                    if n_tilde in model.s_N and model.p_NNA[n, n_tilde]
+                )
+                + sum(
+                    model.v_F_Piped[n, p, t]
+                    for p in model.s_PipingOut[n]
+                    if p in model.s_CP and model.p_NCA[n, p]
+                )
+                + sum(
+                    model.v_F_Piped[n, k, t]
+                    for k in model.s_PipingOut[n]
+                    if k in model.s_K and model.p_NKA[n, k]
+                )
+                + sum(
+                    model.v_F_Piped[n, r, t]
+                    for r in model.s_PipingOut[n]
+                    if r in model.s_R and model.p_NRA[n, r]
+                )
+                + sum(
+                    model.v_F_Piped[n, s, t]
+                    for s in model.s_PipingOut[n]
+                    if s in model.s_S and model.p_NSA[n, s]
+                )
+                + sum(
+                    model.v_F_Piped[n, o, t]
+                    for o in model.s_PipingOut[n]
+                    if o in model.s_O and model.p_NOA[n, o]
                 )
-                + sum(model.v_F_Piped[n, p, t] for p in model.s_CP if model.p_NCA[n, p])
-                + sum(model.v_F_Piped[n, k, t] for k in model.s_K if model.p_NKA[n, k])
-                + sum(model.v_F_Piped[n, r, t] for r in model.s_R if model.p_NRA[n, r])
-                + sum(model.v_F_Piped[n, s, t] for s in model.s_S if model.p_NSA[n, s])
-                + sum(model.v_F_Piped[n, o, t] for o in model.s_O if model.p_NOA[n, o])
             ),
             doc="The sum of discretized outflows at node n equals the total outflow for node n",
         )
@@ -1463,15 +1581,19 @@ def water_quality_discrete(model, df_parameters, df_sets):
             ]
             <= (
                 sum(
-                    model.p_sigma_Pipeline[n, o] for n in model.s_N if model.p_NOA[n, o]
+                    model.p_sigma_Pipeline[n, o]
+                    for n in model.s_PipingIn[o]
+                    if n in model.s_N and model.p_NOA[n, o]
                 )
                 + sum(
-                    model.p_sigma_Pipeline[s, o] for s in model.s_S if model.p_SOA[s, o]
+                    model.p_sigma_Pipeline[s, o]
+                    for s in model.s_PipingIn[o]
+                    if s in model.s_S and model.p_SOA[s, o]
                 )
                 + sum(
                     (model.p_delta_Truck * model.p_max_number_of_trucks)
-                    for p in model.s_PP
-                    if model.p_POT[p, o]
+                    for p in model.s_TruckingIn[o]
+                    if p in model.s_PP and model.p_POT[p, o]
                 )
             )
             * model.v_DQ[o, t, qc, q],
@@ -1509,40 +1631,40 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for n in model.s_N
-            if model.p_NKA[n, k]
+            for n in model.s_PipingIn[k]
+            if n in model.s_N and model.p_NKA[n, k]
         ) + sum(
             model.v_F_Piped[s, k, t] * model.p_xi[s, qc]
-            for s in model.s_S
-            if model.p_SKA[s, k]
+            for s in model.s_PipingIn[k]
+            if s in model.s_S and model.p_SKA[s, k]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[r, k, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for r in model.s_R
-            if model.p_RKA[r, k]
+            for r in model.s_PipingIn[k]
+            if r in model.s_R and model.p_RKA[r, k]
         ) + sum(
             model.v_F_Trucked[s, k, t] * model.p_xi[s, qc]
-            for s in model.s_S
-            if model.p_SKT[s, k]
+            for s in model.s_TruckingIn[k]
+            if s in model.s_S and model.p_SKT[s, k]
         ) + sum(
             model.v_F_Trucked[p, k, t] * b.p_nu_pad[p, qc]
-            for p in model.s_PP
-            if model.p_PKT[p, k]
+            for p in model.s_TruckingIn[k]
+            if p in model.s_PP and model.p_PKT[p, k]
         ) + sum(
             model.v_F_Trucked[p, k, t] * b.p_nu_pad[p, qc]
-            for p in model.s_CP
-            if model.p_CKT[p, k]
+            for p in model.s_TruckingIn[k]
+            if p in model.s_CP and model.p_CKT[p, k]
         ) + sum(
             sum(
                 model.v_F_DiscreteTrucked[r, k, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for r in model.s_R
-            if model.p_RKT[r, k]
+            for r in model.s_TruckingIn[k]
+            if r in model.s_R and model.p_RKT[r, k]
         ) <= sum(
             model.v_F_DiscreteDisposalDestination[k, t, qc, q]
             * model.p_discrete_quality[qc, q]
@@ -1567,16 +1689,16 @@ def water_quality_discrete(model, df_parameters, df_sets):
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for n in model.s_N
-                if model.p_NSA[n, s]
+                for n in model.s_PipingIn[s]
+                if n in model.s_N and model.p_NSA[n, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * b.p_nu_pad[p, qc]
-                for p in model.s_PP
-                if model.p_PST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_PP and model.p_PST[p, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * b.p_nu_pad[p, qc]
-                for p in model.s_CP
-                if model.p_CST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_CP and model.p_CST[p, s]
             ) <= sum(
                 model.v_F_DiscreteFlowOutStorage[s, t, qc, q]
                 * model.p_discrete_quality[qc, q]
@@ -1593,16 +1715,16 @@ def water_quality_discrete(model, df_parameters, df_sets):
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for n in model.s_N
-                if model.p_NSA[n, s]
+                for n in model.s_PipingIn[s]
+                if n in model.s_N and model.p_NSA[n, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * b.p_nu_pad[p, qc]
-                for p in model.s_PP
-                if model.p_PST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_PP and model.p_PST[p, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * b.p_nu_pad[p, qc]
-                for p in model.s_CP
-                if model.p_CST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_CP and model.p_CST[p, s]
             ) <= sum(
                 model.v_F_DiscreteFlowOutStorage[s, t, qc, q]
                 * model.p_discrete_quality[qc, q]
@@ -1627,8 +1749,8 @@ def water_quality_discrete(model, df_parameters, df_sets):
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for n in model.s_N
-                if model.p_NRA[n, r]
+                for n in model.s_PipingIn[r]
+                if n in model.s_N and model.p_NRA[n, r]
             )
             + sum(
                 sum(
@@ -1636,18 +1758,18 @@ def water_quality_discrete(model, df_parameters, df_sets):
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for s in model.s_S
-                if model.p_SRA[s, r]
+                for s in model.s_PipingIn[r]
+                if s in model.s_S and model.p_SRA[s, r]
             )
             + sum(
                 model.v_F_Trucked[p, r, t] * b.p_nu_pad[p, qc]
-                for p in model.s_PP
-                if model.p_PRT[p, r]
+                for p in model.s_TruckingIn[r]
+                if p in model.s_PP and model.p_PRT[p, r]
             )
             + sum(
                 model.v_F_Trucked[p, r, t] * b.p_nu_pad[p, qc]
-                for p in model.s_CP
-                if model.p_CRT[p, r]
+                for p in model.s_TruckingIn[r]
+                if p in model.s_CP and model.p_CRT[p, r]
             )
         ) <= sum(
             model.v_F_DiscreteFlowTreatment[r, t, qc, q]
@@ -1668,28 +1790,28 @@ def water_quality_discrete(model, df_parameters, df_sets):
     def NetworkNodeWaterQualityRule(b, n, qc, t):
         return sum(
             model.v_F_Piped[p, n, t] * b.p_nu_pad[p, qc]
-            for p in model.s_PP
-            if model.p_PNA[p, n]
+            for p in model.s_PipingIn[n]
+            if p in model.s_PP and model.p_PNA[p, n]
         ) + sum(
             model.v_F_Piped[p, n, t] * b.p_nu_pad[p, qc]
-            for p in model.s_CP
-            if model.p_CNA[p, n]
+            for p in model.s_PipingIn[n]
+            if p in model.s_CP and model.p_CNA[p, n]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[s, n, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for s in model.s_S
-            if model.p_SNA[s, n]
+            for s in model.s_PipingIn[n]
+            if s in model.s_S and model.p_SNA[s, n]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[n_tilde, n, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for n_tilde in model.s_N
-            if model.p_NNA[n_tilde, n]
+            for n_tilde in model.s_PipingIn[n]
+            if n_tilde in model.s_N and model.p_NNA[n_tilde, n]
         ) <= sum(
             model.v_F_DiscreteFlowOutNode[n, t, qc, q] * model.p_discrete_quality[qc, q]
             for q in model.s_Q
@@ -1712,20 +1834,20 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for n in model.s_N
-            if model.p_NOA[n, o]
+            for n in model.s_PipingIn[o]
+            if n in model.s_N and model.p_NOA[n, o]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[s, o, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for s in model.s_S
-            if model.p_SOA[s, o]
+            for s in model.s_PipingIn[o]
+            if s in model.s_S and model.p_SOA[s, o]
         ) + sum(
             model.v_F_Trucked[p, o, t] * b.p_nu_pad[p, qc]
-            for p in model.s_PP
-            if model.p_POT[p, o]
+            for p in model.s_TruckingIn[o]
+            if p in model.s_PP and model.p_POT[p, o]
         ) <= sum(
             model.v_F_DiscreteBeneficialReuseDestination[o, t, qc, q]
             * model.p_discrete_quality[qc, q]
@@ -13,11 +13,18 @@
 # Title: STRATEGIC Produced Water Optimization Model
 
 # Import
+import contextlib
+import io
+from collections import deque
 import math
 from cmath import nan
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import os
+import pandas as pd
 import re
+import time
+import warnings
 
 
 from pyomo.environ import (
@@ -40,22 +47,36 @@ from pyomo.environ import (
     TransformationFactory,
     value,
     SolverFactory,
+    inequality,
+    UnitInterval,
 )
+from pyomo.common.collections import ComponentMap, ComponentSet
 from pyomo.common.fileutils import this_file_dir
+from pyomo.core.expr.visitor import replace_expressions
+from pyomo.repn import generate_standard_repn
 
 from pyomo.core.base.constraint import simple_constraint_rule
 
 from pyomo.common.config import ConfigBlock, ConfigValue, In, Bool
 
-from pareto.utilities.solvers import get_solver, set_timeout
+from pareto.utilities.solvers import get_solver, is_persistent, set_timeout
 from pyomo.opt import TerminationCondition
 from pathlib import Path
 
 from pareto.utilities.process_data import (
+    aggregate_time_periods,
     check_required_data,
     model_infeasibility_detection,
+    presolve_network,
 )
 from pareto.utilities.units_support import units_setup
+from pareto.utilities.model_modifications import (
+    bound_variables,
+    deactivate_fixed_constraints,
+    fix_variables,
+    restore_variables,
+    unfix_variables,
+)
 from pareto.utilities.build_utils import (
     build_sets,
     build_common_params,
@@ -183,6 +204,34 @@ CONFIG.declare(
     ),
 )
 
+
+def _discrete_quality_levels(levels):
+    """
+    Domain of the discrete_quality_levels configuration option: an integer of at
+    least 2, the lowest and highest qualities
+    """
+    if int(levels) != levels or levels < 2:
+        raise ValueError(
+            f"The number of discrete quality levels must be an integer of at least 2, "
+            f"not {levels}"
+        )
+    return int(levels)
+
+
+CONFIG.declare(
+    "discrete_quality_levels",
+    ConfigValue(
+        default=6,
+        domain=_discrete_quality_levels,
+        description="Number of discrete water quality levels",
+        doc="""Number of discrete quality levels of each water quality component with discrete water quality,
+        evenly spaced between the lowest and highest pad and storage qualities. Fewer levels give a coarser but
+        smaller model, e.g. to start the adaptive refinement of refine_discrete_water_quality() from.
+        ***default*** - 6
+        **Valid Values:** - an integer of at least 2""",
+    ),
+)
+
 CONFIG.declare(
     "removal_efficiency_method",
     ConfigValue(
@@ -229,6 +278,36 @@ CONFIG.declare(
     ),
 )
 
+CONFIG.declare(
+    "sparse_arcs",
+    ConfigValue(
+        default=False,
+        domain=Bool,
+        description="Sparse arc indexing",
+        doc="""Selection to index arc variables over the valid arcs only
+        ***default*** - False
+        **Valid Values:** - {
+        **True** - Index piping/trucking cost, flow capacity and flow direction variables (and their constraints) over the valid piping and trucking arcs, so model size scales with the number of arcs,
+        **False** - Index these variables over all pairs of locations
+        }""",
+    ),
+)
+
+CONFIG.declare(
+    "network_presolve",
+    ConfigValue(
+        default=False,
+        domain=Bool,
+        description="Network presolve",
+        doc="""Selection to remove the arcs and locations that cannot carry flow before building the model
+        ***default*** - False
+        **Valid Values:** - {
+        **True** - Remove the piping and trucking arcs that no water can flow through from a supply to a sink, and the production pads, external water sources and network nodes left without arcs (see presolve_network()),
+        **False** - Build the model for all arcs and locations of the input data
+        }""",
+    ),
+)
+
 
 def _build_midstream_module(model):
     import pandas as pd
@@ -499,9 +578,9 @@ def _build_midstream_module(model):
     )
 
     def MidReceiptFlowRule(model, m, t):
-        return sum(
-            model.v_F_Piped[l, m, t] for l in model.s_L if (l, m) in model.s_LLA
-        ) + sum(model.v_F_Trucked[l, m, t] for l in model.s_L if (l, m) in model.s_LLT)
+        return sum(model.v_F_Piped[l, m, t] for l in model.s_PipingIn[m]) + sum(
+            model.v_F_Trucked[l, m, t] for l in model.s_TruckingIn[m]
+        )
 
     model.e_F_MidReceipt = Expression(
         model.s_MidstreamReceipt,
@@ -861,6 +940,12 @@ def create_model(df_sets, df_parameters, default={}):
         df_sets, df_parameters, model.config
     )
 
+    # Remove the arcs and locations that cannot carry flow
+    if model.config.network_presolve:
+        model.df_sets, model.df_parameters, model.presolve_removed = presolve_network(
+            model.df_sets, model.df_parameters
+        )
+
     # Setup units for model
     units_setup(model)
 
@@ -901,13 +986,7 @@ def create_model(df_sets, df_parameters, default={}):
 
     model.p_beta_TotalProd = Param(
         default=0,
-        initialize=sum(
-            sum(
-                model.p_beta_Production[p, t] + model.p_beta_Flowback[p, t]
-                for p in model.s_P
-            )
-            for t in model.s_T
-        ),
+        initialize=value(_total_produced_water(model)),
         units=model.model_units["volume"],
         doc="Combined water supply forecast (flowback & production) over the planning horizon [volume]",
         mutable=True,
@@ -955,7 +1034,7 @@ def create_model(df_sets, df_parameters, default={}):
                     from_units=model.user_units["volume_time"],
                     to_units=model.model_units["volume_time"],
                 )
-                for key, value in df_parameters["NodeCapacities"].items()
+                for key, value in model.df_parameters["NodeCapacities"].items()
             },
             units=model.model_units["volume_time"],
             doc="Capacity per network node [volume/time]",
@@ -1683,8 +1762,7 @@ def create_model(df_sets, df_parameters, default={}):
                         / model.p_delta_Truck
                         * model.p_tau_Trucking[l, l_tilde]
                         * model.p_eta_TruckingEmissionsCoefficient[a]
-                        for l in model.s_L
-                        if (l, l_tilde) in model.s_LLT
+                        for l in model.s_TruckingIn[l_tilde]
                     )
                     for l_tilde in model.s_L
                 )
@@ -1705,8 +1783,7 @@ def create_model(df_sets, df_parameters, default={}):
                         model.v_F_Piped[l, l_tilde, t]
                         * model.p_lambda_Pipeline[l, l_tilde]
                         * model.p_eta_PipelineOperationsEmissionsCoefficient[a]
-                        for l in model.s_L
-                        if (l, l_tilde) in model.s_LLA
+                        for l in model.s_PipingIn[l_tilde]
                     )
                     for l_tilde in model.s_L
                 )
@@ -1727,8 +1804,7 @@ def create_model(df_sets, df_parameters, default={}):
                 sum(model.vb_y_Pipeline[l, l_tilde, d] for d in model.s_D)
                 * model.p_lambda_Pipeline[l, l_tilde]
                 * model.p_eta_PipelineInstallationEmissionsCoefficient[a]
-                for l in model.s_L
-                if (l, l_tilde) in model.s_LLA
+                for l in model.s_PipingIn[l_tilde]
             )
             for l_tilde in model.s_L
         )
@@ -2177,16 +2253,8 @@ def create_model(df_sets, df_parameters, default={}):
         def scalingTreatment(model, r, t):
             if model.p_chi_DesalinationSites[r]:
                 return model.v_T_Treatment_scaled[r, t] == conversion_factor * (
-                    sum(
-                        model.v_F_Piped[l, r, t]
-                        for l in model.s_L
-                        if (l, r) in model.s_LLA
-                    )
-                    + sum(
-                        model.v_F_Trucked[l, r, t]
-                        for l in model.s_L
-                        if (l, r) in model.s_LLT
-                    )
+                    sum(model.v_F_Piped[l, r, t] for l in model.s_PipingIn[r])
+                    + sum(model.v_F_Trucked[l, r, t] for l in model.s_TruckingIn[r])
                 )
             else:
                 return Constraint.Skip
@@ -2330,11 +2398,7 @@ def create_model(df_sets, df_parameters, default={}):
                 return Constraint.Skip
             if value(model.p_sigma_NetworkNode[n]) > 0:
                 constraint = (
-                    sum(
-                        model.v_F_Piped[l, n, t]
-                        for l in model.s_L
-                        if (l, n) in model.s_LLA
-                    )
+                    sum(model.v_F_Piped[l, n, t] for l in model.s_PipingIn[n])
                     <= model.p_sigma_NetworkNode[n]
                 )
             else:
@@ -2389,10 +2453,8 @@ def create_model(df_sets, df_parameters, default={}):
 
     def TreatmentFeedBalanceRule(model, r, t):
         constraint = (
-            sum(model.v_F_Piped[l, r, t] for l in model.s_L if (l, r) in model.s_LLA)
-            + sum(
-                model.v_F_Trucked[l, r, t] for l in model.s_L if (l, r) in model.s_LLT
-            )
+            sum(model.v_F_Piped[l, r, t] for l in model.s_PipingIn[r])
+            + sum(model.v_F_Trucked[l, r, t] for l in model.s_TruckingIn[r])
             == model.v_F_TreatmentFeed[r, t]
         )
         return process_constraint(constraint)
@@ -2534,14 +2596,12 @@ def create_model(df_sets, df_parameters, default={}):
         if r in treatment_sites_with_treated_stream_modeled:
             constraint = model.v_F_TreatedWater[r, t] == sum(
                 model.v_F_Piped[r, l, t]
-                for l in model.s_L
-                if (r, l) in model.s_LLA
-                and model.df_parameters["LLA"][r, l] == TreatmentStreams.treated_stream
+                for l in model.s_PipingOut[r]
+                if model.df_parameters["LLA"][r, l] == TreatmentStreams.treated_stream
             ) + sum(
                 model.v_F_Trucked[r, l, t]
-                for l in model.s_L
-                if (r, l) in model.s_LLT
-                and model.df_parameters["LLT"][r, l] == TreatmentStreams.treated_stream
+                for l in model.s_TruckingOut[r]
+                if model.df_parameters["LLT"][r, l] == TreatmentStreams.treated_stream
             )
             return process_constraint(constraint)
         else:
@@ -2568,14 +2628,12 @@ def create_model(df_sets, df_parameters, default={}):
         if r in treatment_sites_with_residual_stream_modeled:
             constraint = model.v_F_ResidualWater[r, t] == sum(
                 model.v_F_Piped[r, l, t]
-                for l in model.s_L
-                if (r, l) in model.s_LLA
-                and model.df_parameters["LLA"][r, l] == TreatmentStreams.residual_stream
+                for l in model.s_PipingOut[r]
+                if model.df_parameters["LLA"][r, l] == TreatmentStreams.residual_stream
             ) + sum(
                 model.v_F_Trucked[r, l, t]
-                for l in model.s_L
-                if (r, l) in model.s_LLT
-                and model.df_parameters["LLT"][r, l] == TreatmentStreams.residual_stream
+                for l in model.s_TruckingOut[r]
+                if model.df_parameters["LLT"][r, l] == TreatmentStreams.residual_stream
             )
             return process_constraint(constraint)
         else:
@@ -2663,14 +2721,8 @@ def create_model(df_sets, df_parameters, default={}):
         constraint = (
             model.v_C_Treatment[r, t]
             >= (
-                sum(
-                    model.v_F_Piped[l, r, t] for l in model.s_L if (l, r) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[l, r, t]
-                    for l in model.s_L
-                    if (l, r) in model.s_LLT
-                )
+                sum(model.v_F_Piped[l, r, t] for l in model.s_PipingIn[r])
+                + sum(model.v_F_Trucked[l, r, t] for l in model.s_TruckingIn[r])
                 - model.p_M_Flow
                 * (1 - sum(model.vb_y_Treatment[r, wt, j] for j in model.s_J))
             )
@@ -2690,14 +2742,8 @@ def create_model(df_sets, df_parameters, default={}):
         constraint = (
             model.v_C_Treatment[r, t]
             <= (
-                sum(
-                    model.v_F_Piped[l, r, t] for l in model.s_L if (l, r) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[l, r, t]
-                    for l in model.s_L
-                    if (l, r) in model.s_LLT
-                )
+                sum(model.v_F_Piped[l, r, t] for l in model.s_PipingIn[r])
+                + sum(model.v_F_Trucked[l, r, t] for l in model.s_TruckingIn[r])
                 + model.p_M_Flow
                 * (1 - sum(model.vb_y_Treatment[r, wt, j] for j in model.s_J))
             )
@@ -2719,13 +2765,13 @@ def create_model(df_sets, df_parameters, default={}):
                 sum(
                     sum(
                         model.v_F_Piped[l, p, t]
-                        for l in (model.s_L - model.s_F)
-                        if (l, p) in model.s_LLA
+                        for l in model.s_PipingIn[p]
+                        if l not in model.s_F
                     )
                     + sum(
                         model.v_F_Trucked[l, p, t]
-                        for l in (model.s_L - model.s_F)
-                        if (l, p) in model.s_LLT
+                        for l in model.s_TruckingIn[p]
+                        if l not in model.s_F
                     )
                     for p in model.s_CP
                 )
@@ -2741,14 +2787,8 @@ def create_model(df_sets, df_parameters, default={}):
     def BeneficialReuseCostRule(model, o, t):
         constraint = model.v_C_BeneficialReuse[o, t] == (
             (
-                sum(
-                    model.v_F_Piped[l, o, t] for l in model.s_L if (l, o) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[l, o, t]
-                    for l in model.s_L
-                    if (l, o) in model.s_LLT
-                )
+                sum(model.v_F_Piped[l, o, t] for l in model.s_PipingIn[o])
+                + sum(model.v_F_Trucked[l, o, t] for l in model.s_TruckingIn[o])
             )
             * model.p_pi_BeneficialReuse[o]
         )
@@ -2775,14 +2815,8 @@ def create_model(df_sets, df_parameters, default={}):
     def BeneficialReuseCreditRule(model, o, t):
         constraint = model.v_R_BeneficialReuse[o, t] == (
             (
-                sum(
-                    model.v_F_Piped[l, o, t] for l in model.s_L if (l, o) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[l, o, t]
-                    for l in model.s_L
-                    if (l, o) in model.s_LLT
-                )
+                sum(model.v_F_Piped[l, o, t] for l in model.s_PipingIn[o])
+                + sum(model.v_F_Trucked[l, o, t] for l in model.s_TruckingIn[o])
             )
             * model.p_rho_BeneficialReuse[o]
         )
@@ -2812,8 +2846,7 @@ def create_model(df_sets, df_parameters, default={}):
                 sum(
                     sum(
                         model.v_F_Trucked[l, l_tilde, t]
-                        for l in model.s_L
-                        if (l, l_tilde) in model.s_LLT
+                        for l in model.s_TruckingIn[l_tilde]
                     )
                     for l_tilde in model.s_L
                 )
@@ -3036,8 +3069,8 @@ def create_model(df_sets, df_parameters, default={}):
                 s, t
             ] == model.p_omega_EvaporationRate * sum(
                 sum(model.vb_y_Treatment[r, "CB-EV", j] for j in model.s_J)
-                for r in model.s_R
-                if model.p_RSA[r, s]
+                for r in model.s_PipingIn[s]
+                if r in model.s_R and model.p_RSA[r, s]
             )
         return process_constraint(constraint)
 
@@ -3049,15 +3082,11 @@ def create_model(df_sets, df_parameters, default={}):
     )
 
     def LogicConstraintPipelineRule(model, l, l_tilde):
-        if (l, l_tilde) in model.s_LLA:
-            constraint = sum(model.vb_y_Pipeline[l, l_tilde, d] for d in model.s_D) <= 1
-            return process_constraint(constraint)
-        else:
-            return Constraint.Skip
+        constraint = sum(model.vb_y_Pipeline[l, l_tilde, d] for d in model.s_D) <= 1
+        return process_constraint(constraint)
 
     model.LogicConstraintPipeline = Constraint(
-        model.s_L,
-        model.s_L,
+        model.s_LLA,
         rule=LogicConstraintPipelineRule,
         doc="Logic constraint pipelines",
     )
@@ -3066,16 +3095,24 @@ def create_model(df_sets, df_parameters, default={}):
         constraint = model.v_F_CompletionsDestination[p, t] == (
             sum(
                 model.v_F_Piped[l, p, t]
-                for l in (model.s_L - model.s_F)
-                if (l, p) in model.s_LLA
+                for l in model.s_PipingIn[p]
+                if l not in model.s_F
+            )
+            + sum(
+                model.v_F_Sourced[f, p, t]
+                for f in model.s_PipingIn[p]
+                if f in model.s_F and model.p_FCA[f, p]
             )
-            + sum(model.v_F_Sourced[f, p, t] for f in model.s_F if model.p_FCA[f, p])
             + sum(
                 model.v_F_Trucked[l, p, t]
-                for l in (model.s_L - model.s_F)
-                if (l, p) in model.s_LLT
+                for l in model.s_TruckingIn[p]
+                if l not in model.s_F
+            )
+            + sum(
+                model.v_F_Trucked[f, p, t]
+                for f in model.s_TruckingIn[p]
+                if f in model.s_F and model.p_FCT[f, p]
             )
-            + sum(model.v_F_Trucked[f, p, t] for f in model.s_F if model.p_FCT[f, p])
             - model.v_F_PadStorageIn[p, t]
             + model.v_F_PadStorageOut[p, t]
         )
@@ -3171,6 +3208,105 @@ def set_objective(model, obj):
         raise Exception("Objective not supported")
 
 
+# Input tabs supported by update_parameters(): name of the Param built from the
+# tab and the type of units of its values. These Params only appear as coefficients
+# and bounds in the constraints and objectives, and no rule branches on their
+# values, so updating them gives the same model as rebuilding it. The only value
+# derived from them when building the model, p_beta_TotalProd, is recalculated by
+# update_parameters(). Tabs that build time decisions depend on, e.g., the
+# capacity increments that select which expansion options exist, are not supported.
+_mutable_parameter_tabs = {
+    "CompletionsDemand": ("p_gamma_Completions", "volume_time"),
+    "PadRates": ("p_beta_Production", "volume_time"),
+    "FlowbackRates": ("p_beta_Flowback", "volume_time"),
+    "ExtWaterSourcingAvailability": ("p_sigma_ExternalWater", "volume_time"),
+    "DisposalOperationalCost": ("p_pi_Disposal", "currency_volume"),
+    "ReuseOperationalCost": ("p_pi_Reuse", "currency_volume"),
+    "TreatmentOperationalCost": ("p_pi_Treatment", "currency_volume"),
+    "ExternalSourcingCost": ("p_pi_Sourcing", "currency_volume"),
+    "TruckingHourlyCost": ("p_pi_Trucking", "currency"),
+}
+
+
+# Input tabs supported by update_parameters() that presolve_network() uses
+_presolve_parameter_tabs = [
+    "CompletionsDemand",
+    "PadRates",
+    "FlowbackRates",
+    "ExtWaterSourcingAvailability",
+]
+
+
+def _total_produced_water(model):
+    return sum(
+        sum(
+            model.p_beta_Production[p, t] + model.p_beta_Flowback[p, t]
+            for p in model.s_P
+        )
+        for t in model.s_T
+    )
+
+
+def update_parameters(model, overrides):
+    """
+    Update input data of a model in place, so that the model can be re-solved without
+    calling create_model() again. overrides maps
+    input tab names to {index: value} dictionaries in user units, i.e., in the same
+    format as the df_parameters returned by get_data(), for example:
+
+    update_parameters(model, {"CompletionsDemand": {("CP01", "T01"): 1200}})
+
+    Supported input tabs: CompletionsDemand, PadRates, FlowbackRates,
+    ExtWaterSourcingAvailability, DisposalOperationalCost, ReuseOperationalCost,
+    TreatmentOperationalCost, ExternalSourcingCost, TruckingHourlyCost. The model
+    does not use the values of these tabs at build time, so the updated model is the
+    same as a model created from the updated data. The exception is the network
+    presolve, which removes arcs based on the supplies and demands: with the
+    network_presolve option, only the operational cost tabs can be updated.
+
+    Pyomo declares all Params with units mutable, so any model can be updated. To
+    also keep the model loaded in the solver across re-solves, pass the same
+    persistent solver object (e.g., get_solver("appsi_highs")) in the solve_model()
+    options: only the updated parameter values are then sent to the solver.
+    """
+    unsupported = set(overrides) - set(_mutable_parameter_tabs)
+    if unsupported:
+        raise Exception(
+            f"Parameters cannot be updated for input tabs: {sorted(unsupported)}. "
+            f"Supported input tabs: {list(_mutable_parameter_tabs)}"
+        )
+    if model.config.network_presolve:
+        presolved = set(overrides) & set(_presolve_parameter_tabs)
+        if presolved:
+            raise Exception(
+                f"Parameters cannot be updated for input tabs: {sorted(presolved)}, "
+                "as the network presolve removed arcs based on their values"
+            )
+
+    for tab, tab_overrides in overrides.items():
+        param_name, units = _mutable_parameter_tabs[tab]
+        param = getattr(model, param_name)
+        param.store_values(
+            {
+                key: pyunits.convert_value(
+                    val,
+                    from_units=model.user_units[units],
+                    to_units=model.model_units[units],
+                )
+                for key, val in tab_overrides.items()
+            }
+        )
+        # Keep the input data in sync for reporting, without modifying the
+        # dictionary the model was created from
+        model.df_parameters = {
+            **model.df_parameters,
+            tab: {**model.df_parameters[tab], **tab_overrides},
+        }
+
+    if "PadRates" in overrides or "FlowbackRates" in overrides:
+        model.p_beta_TotalProd.set_value(value(_total_produced_water(model)))
+
+
 def pipeline_hydraulics(model):
     """
     The hydraulics module asssists in computing pressures at each node
@@ -3923,7 +4059,8 @@ def pipeline_hydraulics(model):
 
 def _hazen_williams_head(mat_factor, length, diameter, flow):
     """
-    Computes Hazen-Williams (HW) head in a pipeline
+    Computes Hazen-Williams (HW) head in a pipeline. The arguments can also be NumPy
+    arrays to compute the head of several pipelines and time periods at once.
 
     Input Args
     ----------
@@ -4110,8 +4247,8 @@ def water_quality(model):
         constraint = (
             sum(
                 b.parent_block().v_F_Piped[n, k, t] * b.v_Q[n, qc, t]
-                for n in b.parent_block().s_N
-                if b.parent_block().p_NKA[n, k]
+                for n in b.parent_block().s_PipingIn[k]
+                if n in b.parent_block().s_N and b.parent_block().p_NKA[n, k]
             )
             + sum(
                 b.parent_block().v_F_Piped[s, k, t] * b.v_Q[s, qc, t]
@@ -4158,8 +4295,8 @@ def water_quality(model):
                 s, qc
             ] + sum(
                 b.parent_block().v_F_Piped[n, s, t] * b.v_Q[n, qc, t]
-                for n in b.parent_block().s_N
-                if b.parent_block().p_NSA[n, s]
+                for n in b.parent_block().s_PipingIn[s]
+                if n in b.parent_block().s_N and b.parent_block().p_NSA[n, s]
             ) + sum(
                 b.parent_block().v_F_Piped[r, s, t]
                 * b.v_Q[r + treated_water_label, qc, t]
@@ -4179,8 +4316,8 @@ def water_quality(model):
                 b.parent_block().v_L_Storage[s, t]
                 + sum(
                     b.parent_block().v_F_Piped[s, n, t]
-                    for n in b.parent_block().s_N
-                    if b.parent_block().p_SNA[s, n]
+                    for n in b.parent_block().s_PipingOut[s]
+                    if n in b.parent_block().s_N and b.parent_block().p_SNA[s, n]
                 )
                 + sum(
                     b.parent_block().v_F_Piped[s, p, t]
@@ -4219,8 +4356,8 @@ def water_quality(model):
                 s, b.parent_block().s_T.prev(t)
             ] * b.v_Q[s, qc, b.parent_block().s_T.prev(t)] + sum(
                 b.parent_block().v_F_Piped[n, s, t] * b.v_Q[n, qc, t]
-                for n in b.parent_block().s_N
-                if b.parent_block().p_NSA[n, s]
+                for n in b.parent_block().s_PipingIn[s]
+                if n in b.parent_block().s_N and b.parent_block().p_NSA[n, s]
             ) + sum(
                 b.parent_block().v_F_Piped[r, s, t]
                 * b.v_Q[r + treated_water_label, qc, t]
@@ -4240,8 +4377,8 @@ def water_quality(model):
                 b.parent_block().v_L_Storage[s, t]
                 + sum(
                     b.parent_block().v_F_Piped[s, n, t]
-                    for n in b.parent_block().s_N
-                    if b.parent_block().p_SNA[s, n]
+                    for n in b.parent_block().s_PipingOut[s]
+                    if n in b.parent_block().s_N and b.parent_block().p_SNA[s, n]
                 )
                 + sum(
                     b.parent_block().v_F_Piped[s, p, t]
@@ -4291,8 +4428,8 @@ def water_quality(model):
         constraint = (
             sum(
                 b.parent_block().v_F_Piped[n, r, t] * b.v_Q[n, qc, t]
-                for n in b.parent_block().s_N
-                if b.parent_block().p_NRA[n, r]
+                for n in b.parent_block().s_PipingIn[r]
+                if n in b.parent_block().s_N and b.parent_block().p_NRA[n, r]
             )
             + sum(
                 b.parent_block().v_F_Piped[s, r, t] * b.v_Q[s, qc, t]
@@ -4550,8 +4687,8 @@ def water_quality(model):
             if b.parent_block().p_SNA[s, n]
         ) + sum(
             b.parent_block().v_F_Piped[n_tilde, n, t] * b.v_Q[n_tilde, qc, t]
-            for n_tilde in b.parent_block().s_N
-            if b.parent_block().p_NNA[n_tilde, n]
+            for n_tilde in b.parent_block().s_PipingIn[n]
+            if n_tilde in b.parent_block().s_N and b.parent_block().p_NNA[n_tilde, n]
         ) + sum(
             b.parent_block().v_F_Piped[r, n, t] * b.v_Q[r, qc, t]
             for r in b.parent_block().s_R
@@ -4561,8 +4698,9 @@ def water_quality(model):
         ] * (
             sum(
                 b.parent_block().v_F_Piped[n, n_tilde, t]
-                for n_tilde in b.parent_block().s_N
-                if b.parent_block().p_NNA[n, n_tilde]
+                for n_tilde in b.parent_block().s_PipingOut[n]
+                if n_tilde in b.parent_block().s_N
+                and b.parent_block().p_NNA[n, n_tilde]
             )
             + sum(
                 b.parent_block().v_F_Piped[n, p, t]
@@ -4606,8 +4744,8 @@ def water_quality(model):
         constraint = (
             sum(
                 b.parent_block().v_F_Piped[n, o, t] * b.v_Q[n, qc, t]
-                for n in b.parent_block().s_N
-                if b.parent_block().p_NOA[n, o]
+                for n in b.parent_block().s_PipingIn[o]
+                if n in b.parent_block().s_N and b.parent_block().p_NOA[n, o]
             )
             + sum(
                 b.parent_block().v_F_Piped[s, o, t] * b.v_Q[s, qc, t]
@@ -4644,8 +4782,8 @@ def water_quality(model):
     def CompletionsPadIntermediateWaterQuality(b, p, qc, t):
         constraint = sum(
             b.parent_block().v_F_Piped[n, p, t] * b.v_Q[n, qc, t]
-            for n in b.parent_block().s_N
-            if b.parent_block().p_NCA[n, p]
+            for n in b.parent_block().s_PipingIn[p]
+            if n in b.parent_block().s_N and b.parent_block().p_NCA[n, p]
         ) + sum(
             b.parent_block().v_F_Piped[p_tilde, p, t] * b.v_Q[p_tilde, qc, t]
             for p_tilde in b.parent_block().s_PP
@@ -4921,7 +5059,9 @@ def water_quality_discrete(model, df_parameters, df_sets):
     # region discretization
 
     # Create list of discretized qualities
-    discrete_quality_list = discrete_water_quality_list(6)
+    discrete_quality_list = discrete_water_quality_list(
+        model.config.discrete_quality_levels
+    )
 
     # Create set with the list of discretized qualities
     model.s_Q = Set(initialize=discrete_quality_list, doc="Discrete water qualities")
@@ -5148,42 +5288,42 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 + sum(
                     model.p_sigma_Pipeline[s, n]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for n in model.s_N
-                    if model.p_SNA[s, n]
+                    for n in model.s_PipingOut[s]
+                    if n in model.s_N and model.p_SNA[s, n]
                 )
                 + sum(
                     model.p_sigma_Pipeline[s, p]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for p in model.s_CP
-                    if model.p_SCA[s, p]
+                    for p in model.s_PipingOut[s]
+                    if p in model.s_CP and model.p_SCA[s, p]
                 )
                 + sum(
                     model.p_sigma_Pipeline[s, k]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for k in model.s_K
-                    if model.p_SKA[s, k]
+                    for k in model.s_PipingOut[s]
+                    if k in model.s_K and model.p_SKA[s, k]
                 )
                 + sum(
                     model.p_sigma_Pipeline[s, r]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for r in model.s_R
-                    if model.p_SRA[s, r]
+                    for r in model.s_PipingOut[s]
+                    if r in model.s_R and model.p_SRA[s, r]
                 )
                 + sum(
                     model.p_sigma_Pipeline[s, o]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for o in model.s_O
-                    if model.p_SOA[s, o]
+                    for o in model.s_PipingOut[s]
+                    if o in model.s_O and model.p_SOA[s, o]
                 )
                 + sum(
                     (model.p_delta_Truck * model.p_max_number_of_trucks)
-                    for p in model.s_CP
-                    if model.p_SCT[s, p]
+                    for p in model.s_TruckingOut[s]
+                    if p in model.s_CP and model.p_SCT[s, p]
                 )
                 + sum(
                     (model.p_delta_Truck * model.p_max_number_of_trucks)
-                    for k in model.s_K
-                    if model.p_SKT[s, k]
+                    for k in model.s_TruckingOut[s]
+                    if k in model.s_K and model.p_SKT[s, k]
                 )
             )
             * model.v_DQ[s, t, qc, q],
@@ -5199,16 +5339,40 @@ def water_quality_discrete(model, df_parameters, df_sets):
             )
             == (
                 model.v_L_Storage[s, t]
-                + sum(model.v_F_Piped[s, n, t] for n in model.s_N if model.p_SNA[s, n])
-                + sum(model.v_F_Piped[s, p, t] for p in model.s_CP if model.p_SCA[s, p])
-                + sum(model.v_F_Piped[s, k, t] for k in model.s_K if model.p_SKA[s, k])
-                + sum(model.v_F_Piped[s, r, t] for r in model.s_R if model.p_SRA[s, r])
-                + sum(model.v_F_Piped[s, o, t] for o in model.s_O if model.p_SOA[s, o])
                 + sum(
-                    model.v_F_Trucked[s, p, t] for p in model.s_CP if model.p_SCT[s, p]
+                    model.v_F_Piped[s, n, t]
+                    for n in model.s_PipingOut[s]
+                    if n in model.s_N and model.p_SNA[s, n]
+                )
+                + sum(
+                    model.v_F_Piped[s, p, t]
+                    for p in model.s_PipingOut[s]
+                    if p in model.s_CP and model.p_SCA[s, p]
+                )
+                + sum(
+                    model.v_F_Piped[s, k, t]
+                    for k in model.s_PipingOut[s]
+                    if k in model.s_K and model.p_SKA[s, k]
+                )
+                + sum(
+                    model.v_F_Piped[s, r, t]
+                    for r in model.s_PipingOut[s]
+                    if r in model.s_R and model.p_SRA[s, r]
+                )
+                + sum(
+                    model.v_F_Piped[s, o, t]
+                    for o in model.s_PipingOut[s]
+                    if o in model.s_O and model.p_SOA[s, o]
+                )
+                + sum(
+                    model.v_F_Trucked[s, p, t]
+                    for p in model.s_TruckingOut[s]
+                    if p in model.s_CP and model.p_SCT[s, p]
                 )
                 + sum(
-                    model.v_F_Trucked[s, k, t] for k in model.s_K if model.p_SKT[s, k]
+                    model.v_F_Trucked[s, k, t]
+                    for k in model.s_TruckingOut[s]
+                    if k in model.s_K and model.p_SKT[s, k]
                 )
                 + model.v_F_StorageEvaporationStream[s, t]
             ),
@@ -5308,38 +5472,38 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 sum(
                     model.p_sigma_Pipeline[n, n_tilde]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for n_tilde in model.s_N
-                    if model.p_NNA[n, n_tilde]
+                    for n_tilde in model.s_PipingOut[n]
+                    if n_tilde in model.s_N and model.p_NNA[n, n_tilde]
                 )
                 + sum(
                     model.p_sigma_Pipeline[n, p]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for p in model.s_CP
-                    if model.p_NCA[n, p]
+                    for p in model.s_PipingOut[n]
+                    if p in model.s_CP and model.p_NCA[n, p]
                 )
                 + sum(
                     model.p_sigma_Pipeline[n, k]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for k in model.s_K
-                    if model.p_NKA[n, k]
+                    for k in model.s_PipingOut[n]
+                    if k in model.s_K and model.p_NKA[n, k]
                 )
                 + sum(
                     model.p_sigma_Pipeline[n, r]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for r in model.s_R
-                    if model.p_NRA[n, r]
+                    for r in model.s_PipingOut[n]
+                    if r in model.s_R and model.p_NRA[n, r]
                 )
                 + sum(
                     model.p_sigma_Pipeline[n, s]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for s in model.s_S
-                    if model.p_NSA[n, s]
+                    for s in model.s_PipingOut[n]
+                    if s in model.s_S and model.p_NSA[n, s]
                 )
                 + sum(
                     model.p_sigma_Pipeline[n, o]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for o in model.s_O
-                    if model.p_NOA[n, o]
+                    for o in model.s_PipingOut[n]
+                    if o in model.s_O and model.p_NOA[n, o]
                 )
             )
             * model.v_DQ[n, t, qc, q],
@@ -5356,14 +5520,34 @@ def water_quality_discrete(model, df_parameters, df_sets):
             == (
                 sum(
                     model.v_F_Piped[n, n_tilde, t]
-                    for n_tilde in model.s_N
-                    if model.p_NNA[n, n_tilde]
+                    for n_tilde in model.s_PipingOut[n]
+                    if n_tilde in model.s_N and model.p_NNA[n, n_tilde]
+                )
+                + sum(
+                    model.v_F_Piped[n, p, t]
+                    for p in model.s_PipingOut[n]
+                    if p in model.s_CP and model.p_NCA[n, p]
+                )
+                + sum(
+                    model.v_F_Piped[n, k, t]
+                    for k in model.s_PipingOut[n]
+                    if k in model.s_K and model.p_NKA[n, k]
+                )
+                + sum(
+                    model.v_F_Piped[n, r, t]
+                    for r in model.s_PipingOut[n]
+                    if r in model.s_R and model.p_NRA[n, r]
+                )
+                + sum(
+                    model.v_F_Piped[n, s, t]
+                    for s in model.s_PipingOut[n]
+                    if s in model.s_S and model.p_NSA[n, s]
+                )
+                + sum(
+                    model.v_F_Piped[n, o, t]
+                    for o in model.s_PipingOut[n]
+                    if o in model.s_O and model.p_NOA[n, o]
                 )
-                + sum(model.v_F_Piped[n, p, t] for p in model.s_CP if model.p_NCA[n, p])
-                + sum(model.v_F_Piped[n, k, t] for k in model.s_K if model.p_NKA[n, k])
-                + sum(model.v_F_Piped[n, r, t] for r in model.s_R if model.p_NRA[n, r])
-                + sum(model.v_F_Piped[n, s, t] for s in model.s_S if model.p_NSA[n, s])
-                + sum(model.v_F_Piped[n, o, t] for o in model.s_O if model.p_NOA[n, o])
             ),
             doc="The sum of discretized outflows at node n equals the total outflow for node n",
         )
@@ -5389,19 +5573,19 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 sum(
                     model.p_sigma_Pipeline[n, o]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for n in model.s_N
-                    if model.p_NOA[n, o]
+                    for n in model.s_PipingIn[o]
+                    if n in model.s_N and model.p_NOA[n, o]
                 )
                 + sum(
                     model.p_sigma_Pipeline[s, o]
                     + get_max_value_for_parameter(model.p_delta_Pipeline)
-                    for s in model.s_S
-                    if model.p_SOA[s, o]
+                    for s in model.s_PipingIn[o]
+                    if s in model.s_S and model.p_SOA[s, o]
                 )
                 + sum(
                     (model.p_delta_Truck * model.p_max_number_of_trucks)
-                    for p in model.s_PP
-                    if model.p_POT[p, o]
+                    for p in model.s_TruckingIn[o]
+                    if p in model.s_PP and model.p_POT[p, o]
                 )
             )
             * model.v_DQ[o, t, qc, q],
@@ -5648,32 +5832,32 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for n in model.s_N
-            if model.p_NKA[n, k]
+            for n in model.s_PipingIn[k]
+            if n in model.s_N and model.p_NKA[n, k]
         ) + sum(
             model.v_F_Piped[s, k, t] * model.p_xi[s, qc]
-            for s in model.s_S
-            if model.p_SKA[s, k]
+            for s in model.s_PipingIn[k]
+            if s in model.s_S and model.p_SKA[s, k]
         ) + sum(
             model.v_F_Trucked[s, k, t] * model.p_xi[s, qc]
-            for s in model.s_S
-            if model.p_SKT[s, k]
+            for s in model.s_TruckingIn[k]
+            if s in model.s_S and model.p_SKT[s, k]
         ) + sum(
             model.v_F_Trucked[p, k, t] * b.p_nu_pad[p, qc]
-            for p in model.s_PP
-            if model.p_PKT[p, k]
+            for p in model.s_TruckingIn[k]
+            if p in model.s_PP and model.p_PKT[p, k]
         ) + sum(
             model.v_F_Trucked[p, k, t] * b.p_nu_pad[p, qc]
-            for p in model.s_CP
-            if model.p_CKT[p, k]
+            for p in model.s_TruckingIn[k]
+            if p in model.s_CP and model.p_CKT[p, k]
         ) + sum(
             sum(
                 model.v_F_DiscreteTrucked[r, k, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for r in model.s_R
-            if model.p_RKT[r, k]
+            for r in model.s_TruckingIn[k]
+            if r in model.s_R and model.p_RKT[r, k]
         ) <= sum(
             model.v_F_DiscreteDisposalDestination[k, t, qc, q]
             * model.p_discrete_quality[qc, q]
@@ -5698,24 +5882,24 @@ def water_quality_discrete(model, df_parameters, df_sets):
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for n in model.s_N
-                if model.p_NSA[n, s]
+                for n in model.s_PipingIn[s]
+                if n in model.s_N and model.p_NSA[n, s]
             ) + sum(
                 sum(
                     model.v_F_DiscretePiped[r, s, t, qc, q]
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for r in model.s_R
-                if model.p_RSA[r, s]
+                for r in model.s_PipingIn[s]
+                if r in model.s_R and model.p_RSA[r, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * b.p_nu_pad[p, qc]
-                for p in model.s_PP
-                if model.p_PST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_PP and model.p_PST[p, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * b.p_nu_pad[p, qc]
-                for p in model.s_CP
-                if model.p_CST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_CP and model.p_CST[p, s]
             ) <= sum(
                 model.v_F_DiscreteFlowOutStorage[s, t, qc, q]
                 * model.p_discrete_quality[qc, q]
@@ -5732,24 +5916,24 @@ def water_quality_discrete(model, df_parameters, df_sets):
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for n in model.s_N
-                if model.p_NSA[n, s]
+                for n in model.s_PipingIn[s]
+                if n in model.s_N and model.p_NSA[n, s]
             ) + sum(
                 sum(
                     model.v_F_DiscretePiped[r, s, t, qc, q]
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for r in model.s_R
-                if model.p_RSA[r, s]
+                for r in model.s_PipingIn[s]
+                if r in model.s_R and model.p_RSA[r, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * b.p_nu_pad[p, qc]
-                for p in model.s_PP
-                if model.p_PST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_PP and model.p_PST[p, s]
             ) + sum(
                 model.v_F_Trucked[p, s, t] * b.p_nu_pad[p, qc]
-                for p in model.s_CP
-                if model.p_CST[p, s]
+                for p in model.s_TruckingIn[s]
+                if p in model.s_CP and model.p_CST[p, s]
             ) <= sum(
                 model.v_F_DiscreteFlowOutStorage[s, t, qc, q]
                 * model.p_discrete_quality[qc, q]
@@ -5774,8 +5958,8 @@ def water_quality_discrete(model, df_parameters, df_sets):
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for n in model.s_N
-                if model.p_NRA[n, r]
+                for n in model.s_PipingIn[r]
+                if n in model.s_N and model.p_NRA[n, r]
             )
             + sum(
                 sum(
@@ -5783,18 +5967,18 @@ def water_quality_discrete(model, df_parameters, df_sets):
                     * model.p_discrete_quality[qc, q]
                     for q in model.s_Q
                 )
-                for s in model.s_S
-                if model.p_SRA[s, r]
+                for s in model.s_PipingIn[r]
+                if s in model.s_S and model.p_SRA[s, r]
             )
             + sum(
                 model.v_F_Trucked[p, r, t] * b.p_nu_pad[p, qc]
-                for p in model.s_PP
-                if model.p_PRT[p, r]
+                for p in model.s_TruckingIn[r]
+                if p in model.s_PP and model.p_PRT[p, r]
             )
             + sum(
                 model.v_F_Trucked[p, r, t] * b.p_nu_pad[p, qc]
-                for p in model.s_CP
-                if model.p_CRT[p, r]
+                for p in model.s_TruckingIn[r]
+                if p in model.s_CP and model.p_CRT[p, r]
             )
         ) <= sum(
             model.v_F_DiscreteFlowTreatment[r, t, qc, q]
@@ -5815,28 +5999,28 @@ def water_quality_discrete(model, df_parameters, df_sets):
     def NetworkNodeWaterQualityRule(b, n, qc, t):
         return sum(
             model.v_F_Piped[p, n, t] * b.p_nu_pad[p, qc]
-            for p in model.s_PP
-            if model.p_PNA[p, n]
+            for p in model.s_PipingIn[n]
+            if p in model.s_PP and model.p_PNA[p, n]
         ) + sum(
             model.v_F_Piped[p, n, t] * b.p_nu_pad[p, qc]
-            for p in model.s_CP
-            if model.p_CNA[p, n]
+            for p in model.s_PipingIn[n]
+            if p in model.s_CP and model.p_CNA[p, n]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[s, n, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for s in model.s_S
-            if model.p_SNA[s, n]
+            for s in model.s_PipingIn[n]
+            if s in model.s_S and model.p_SNA[s, n]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[n_tilde, n, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for n_tilde in model.s_N
-            if model.p_NNA[n_tilde, n]
+            for n_tilde in model.s_PipingIn[n]
+            if n_tilde in model.s_N and model.p_NNA[n_tilde, n]
         ) <= sum(
             model.v_F_DiscreteFlowOutNode[n, t, qc, q] * model.p_discrete_quality[qc, q]
             for q in model.s_Q
@@ -5859,20 +6043,20 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for n in model.s_N
-            if model.p_NOA[n, o]
+            for n in model.s_PipingIn[o]
+            if n in model.s_N and model.p_NOA[n, o]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[s, o, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for s in model.s_S
-            if model.p_SOA[s, o]
+            for s in model.s_PipingIn[o]
+            if s in model.s_S and model.p_SOA[s, o]
         ) + sum(
             model.v_F_Trucked[p, o, t] * b.p_nu_pad[p, qc]
-            for p in model.s_PP
-            if model.p_POT[p, o]
+            for p in model.s_TruckingIn[o]
+            if p in model.s_PP and model.p_POT[p, o]
         ) <= sum(
             model.v_F_DiscreteBRDestination[o, t, qc, q]
             * model.p_discrete_quality[qc, q]
@@ -5904,56 +6088,56 @@ def water_quality_discrete(model, df_parameters, df_sets):
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for n in model.s_N
-            if model.p_NCA[n, p]
+            for n in model.s_PipingIn[p]
+            if n in model.s_N and model.p_NCA[n, p]
         ) + sum(
             model.v_F_Piped[p_tilde, p, t] * b.p_nu_pad[p, qc]
-            for p_tilde in model.s_PP
-            if model.p_PCA[p_tilde, p]
+            for p_tilde in model.s_PipingIn[p]
+            if p_tilde in model.s_PP and model.p_PCA[p_tilde, p]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[s, p, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for s in model.s_S
-            if model.p_SCA[s, p]
+            for s in model.s_PipingIn[p]
+            if s in model.s_S and model.p_SCA[s, p]
         ) + sum(
             model.v_F_Piped[p_tilde, p, t] * b.p_nu_pad[p, qc]
-            for p_tilde in model.s_CP
-            if model.p_CCA[p_tilde, p]
+            for p_tilde in model.s_PipingIn[p]
+            if p_tilde in model.s_CP and model.p_CCA[p_tilde, p]
         ) + sum(
             sum(
                 model.v_F_DiscretePiped[r, p, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for r in model.s_R
-            if model.p_RCA[r, p]
+            for r in model.s_PipingIn[p]
+            if r in model.s_R and model.p_RCA[r, p]
         ) + sum(
             model.v_F_Sourced[f, p, t] * b.p_nu_externalwater[f, qc]
-            for f in model.s_F
-            if model.p_FCA[f, p]
+            for f in model.s_PipingIn[p]
+            if f in model.s_F and model.p_FCA[f, p]
         ) + sum(
             model.v_F_Trucked[p_tilde, p, t] * b.p_nu_pad[p, qc]
-            for p_tilde in model.s_PP
-            if model.p_PCT[p_tilde, p]
+            for p_tilde in model.s_TruckingIn[p]
+            if p_tilde in model.s_PP and model.p_PCT[p_tilde, p]
         ) + sum(
             model.v_F_Trucked[p_tilde, p, t] * b.p_nu_pad[p, qc]
-            for p_tilde in model.s_CP
-            if model.p_CCT[p_tilde, p]
+            for p_tilde in model.s_TruckingIn[p]
+            if p_tilde in model.s_CP and model.p_CCT[p_tilde, p]
         ) + sum(
             sum(
                 model.v_F_DiscreteTrucked[s, p, t, qc, q]
                 * model.p_discrete_quality[qc, q]
                 for q in model.s_Q
             )
-            for s in model.s_S
-            if model.p_SCT[s, p]
+            for s in model.s_TruckingIn[p]
+            if s in model.s_S and model.p_SCT[s, p]
         ) + sum(
             model.v_F_Trucked[f, p, t] * b.p_nu_externalwater[f, qc]
-            for f in model.s_F
-            if model.p_FCT[f, p]
+            for f in model.s_TruckingIn[p]
+            if f in model.s_F and model.p_FCT[f, p]
         ) <= sum(
             model.v_F_DiscreteFlowCPIntermediate[p, t, qc, q]
             * model.p_discrete_quality[qc, q]
@@ -6089,13 +6273,29 @@ def water_quality_discrete(model, df_parameters, df_sets):
     return model
 
 
-def postprocess_water_quality_calculation(model, opt):
+def postprocess_water_quality_calculation(model, opt=None):
     # Add water quality formulation to input solved model
     water_quality_model = water_quality(model)
 
+    # With the flows fixed, the water quality is calculated directly from the mass
+    # balances, the solver is only needed if they do not determine it
+    if solve_water_quality_linear_system(water_quality_model):
+        return water_quality_model
+    if opt is None:
+        raise Exception(
+            "The water quality is not determined by the mass balances and no solver "
+            "was given to calculate it"
+        )
+    print(
+        "The water quality is not determined by the mass balances, calculating it "
+        "with the solver"
+    )
+
     # Calculate water quality. The following conditional is used to avoid errors when
     # using Gurobi solver
-    if opt.options["solver"] == "CPLEX":
+    if is_persistent(opt):
+        opt.solve(water_quality_model.quality, tee=True)
+    elif opt.options["solver"] == "CPLEX":
         opt.solve(
             water_quality_model.quality,
             tee=True,
@@ -6109,8 +6309,327 @@ def postprocess_water_quality_calculation(model, opt):
     return water_quality_model
 
 
-def scale_model(model, scaling_factor=1000000):
-    model.scaling_factor = Suffix(direction=Suffix.EXPORT)
+# Mass balance constraints of the block added by water_quality(), which are linear
+# equalities in v_Q once the flows are fixed
+_water_quality_balances = [
+    "DisposalWaterQuality",
+    "StorageSiteWaterQuality",
+    "TreatmentFeedWaterQuality",
+    "TreatmentWaterQuality",
+    "NetworkWaterQuality",
+    "BeneficialReuseWaterQuality",
+    "CompletionsPadIntermediateWaterQuality",
+    "CompletionsPadWaterQuality",
+    "CompletionsPadStorageWaterQuality",
+]
+
+# Removal efficiency inequalities of the block added by water_quality(), with the
+# same indices, which together form an equality for a selected treatment technology
+_water_quality_removal_pairs = [
+    ("TreatmentWaterQualityLHS", "TreatmentWaterQualityRHS"),
+]
+
+
+def _water_quality_row(con):
+    """
+    Return the coefficients of the v_Q variables ({variable: coefficient}) and the
+    constant of a water quality constraint as the terms of row == 0 for equalities
+    and of row <= 0 for inequalities. Raises an exception if the constraint is not
+    linear in v_Q or is a ranged inequality.
+    """
+    repn = generate_standard_repn(con.body, compute_values=True)
+    if not repn.is_linear() or (con.has_lb() and con.has_ub() and not con.equality):
+        raise Exception(
+            f"Water quality constraint {con.name} is not a linear equality or "
+            "inequality in the water quality with the flows fixed"
+        )
+    row = ComponentMap()
+    for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+        row[var] = row.get(var, 0) + coef
+    if con.has_ub():
+        return row, repn.constant - value(con.upper)
+    for var in row:
+        row[var] = -row[var]
+    return row, value(con.lower) - repn.constant
+
+
+def _is_opposite_row(row_1, row_2, tolerance):
+    """
+    Return True if row_1 <= 0 and row_2 <= 0 together are the equality row_1 == 0
+    """
+    coefs_1, constant_1 = row_1
+    coefs_2, constant_2 = row_2
+    if any(var not in coefs_1 for var in coefs_2):
+        return False
+    return all(
+        abs(coef + coefs_2.get(var, 0)) <= tolerance * max(1, abs(coef))
+        for var, coef in coefs_1.items()
+    ) and abs(constant_1 + constant_2) <= tolerance * max(1, abs(constant_1))
+
+
+def _quality_period_key(component, model):
+    """
+    Return a function that gives the (water quality component, time period) of an
+    index of component, from the positions of s_QC and s_T in its index set
+    """
+    subsets = list(component.index_set().subsets())
+    positions = [
+        next(n for n, subset in enumerate(subsets) if subset is model_set)
+        for model_set in (model.s_QC, model.s_T)
+    ]
+    return lambda index: tuple(index[n] for n in positions)
+
+
+def solve_water_quality_linear_system(model, tolerance=1e-9):
+    """
+    Calculate the water quality v_Q of the block added by water_quality() without an
+    optimization solver. With the flows of the strategic model fixed, the water
+    quality mass balances are linear in v_Q. For each water quality component and
+    time period, in order since storage carries the water quality over to the next
+    time period, they are assembled into a sparse linear system that is solved with
+    SciPy. The removal efficiency constraints of a treatment technology form an
+    equality if the technology is selected and are relaxed otherwise.
+
+    The water quality is set to zero at locations without flow. Returns True if the
+    water quality is calculated, or False if a linear system is not square, is
+    singular or gives negative concentrations, in which case v_Q is left unchanged.
+    Raises an exception if the block has constraints other than the mass balances
+    and the removal efficiency constraints.
+    """
+    # SciPy is only needed here, it is imported on first use to keep importing this
+    # module fast
+    from scipy import sparse
+    from scipy.sparse.linalg import MatrixRankWarning, spsolve
+
+    b = model.quality
+    known = {"ObjectiveFunction"}
+    rows = {}
+    for name in _water_quality_balances:
+        component = b.component(name)
+        if component is None:
+            continue
+        known.add(name)
+        period_key = _quality_period_key(component, model)
+        for index, con in component.items():
+            if not con.active:
+                continue
+            if not con.equality:
+                raise Exception(
+                    f"Water quality mass balance {con.name} is not an equality"
+                )
+            rows.setdefault(period_key(index), []).append(_water_quality_row(con))
+    # The removal efficiency constraints do not depend on the flows, they only add
+    # to the system if the treatment site has flow
+    removal_rows = {}
+    for lhs_name, rhs_name in _water_quality_removal_pairs:
+        lhs, rhs = b.component(lhs_name), b.component(rhs_name)
+        if lhs is None or rhs is None:
+            continue
+        known.update([lhs_name, rhs_name])
+        period_key = _quality_period_key(lhs, model)
+        for index, lhs_con in lhs.items():
+            if not lhs_con.active or index not in rhs or not rhs[index].active:
+                continue
+            pair = (_water_quality_row(lhs_con), _water_quality_row(rhs[index]))
+            if _is_opposite_row(pair[0], pair[1], tolerance):
+                removal_rows.setdefault(period_key(index), []).append(pair[0])
+    unknown = [
+        con.name
+        for con in b.component_data_objects(Constraint, active=True)
+        if con.parent_component().local_name not in known
+    ]
+    if unknown:
+        raise Exception(
+            "The water quality block has constraints that are not part of the mass "
+            f"balances: {', '.join(unknown)}"
+        )
+
+    solution = ComponentMap()
+    for qc in model.s_QC:
+        for t in model.s_T:
+            # The water quality of the previous time periods is in solution already
+            # and moves to the right-hand side
+            columns = ComponentMap()
+            unknowns = []
+            row_indices = []
+            column_indices = []
+            coefficients = []
+            rhs = []
+            period_rows = rows.get((qc, t), [])
+            columns_with_flow = ComponentSet(
+                var
+                for coefs, _ in period_rows
+                for var, coef in coefs.items()
+                if abs(coef) > tolerance and var not in solution
+            )
+            period_rows = period_rows + [
+                (coefs, constant)
+                for coefs, constant in removal_rows.get((qc, t), [])
+                if any(var in columns_with_flow for var in coefs)
+            ]
+            for coefs, constant in period_rows:
+                row_rhs = -constant
+                row_columns = {}
+                for var, coef in coefs.items():
+                    if var in solution:
+                        row_rhs -= coef * solution[var]
+                        continue
+                    unknowns.append(var)
+                    if abs(coef) > tolerance:
+                        column = columns.setdefault(var, len(columns))
+                        row_columns[column] = row_columns.get(column, 0) + coef
+                if not row_columns:
+                    # Rows without flow must hold for any water quality
+                    if abs(row_rhs) > tolerance * max(1, abs(constant)):
+                        return False
+                    continue
+                for column, coef in row_columns.items():
+                    row_indices.append(len(rhs))
+                    column_indices.append(column)
+                    coefficients.append(coef)
+                rhs.append(row_rhs)
+            # The mass balances do not determine the water quality exactly
+            if len(rhs) != len(columns):
+                return False
+            if columns:
+                matrix = sparse.csc_matrix(
+                    (coefficients, (row_indices, column_indices)),
+                    shape=(len(rhs), len(columns)),
+                )
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error", MatrixRankWarning)
+                    try:
+                        values = np.atleast_1d(spsolve(matrix, np.array(rhs)))
+                    except MatrixRankWarning:
+                        return False
+                if not np.all(np.isfinite(values)) or np.any(
+                    values < -tolerance * max(1, np.max(np.abs(values)))
+                ):
+                    return False
+                for var, column in columns.items():
+                    solution[var] = max(values[column], 0)
+            # The water quality is zero at locations without flow
+            for var in unknowns:
+                if var not in solution:
+                    solution[var] = 0
+
+    for var in b.v_Q.values():
+        var.set_value(solution.get(var, 0))
+    b.v_X.set_value(
+        sum(
+            b.v_Q[p, qc, t].value
+            for p in model.s_P
+            for qc in model.s_QC
+            for t in model.s_T
+        )
+    )
+    return True
+
+
+def set_automatic_scaling_factors(model, iterations=4):
+    """
+    Pick the scaling factors of the model from its data instead of a single scaling
+    factor. The linear coefficients of all active constraints (including the blocks
+    of the model, e.g., subsurface risk) are collected by family, i.e., by Var and
+    Constraint component. Each continuous variable family and each constraint family
+    then gets a power of 10 scaling factor, chosen by alternately centering the
+    coefficients of each family around 1 in log scale. Integer and binary variables
+    are not scaled. The factors are stored in the scaling_factor suffix of the model
+    used by scale_model() and scaled_in_place().
+
+    Returns a dictionary with the smallest and largest absolute coefficients
+    (coefficient_range_before and coefficient_range_after), which are also printed.
+    """
+    _reset_scaling_suffix(model)
+
+    var_families = ComponentMap()
+    con_families = ComponentMap()
+    con_index = []
+    var_index = []
+    log_coefs = []
+    for con in model.component_data_objects(Constraint, active=True, descend_into=True):
+        repn = generate_standard_repn(con.body, quadratic=False)
+        row = con_families.setdefault(con.parent_component(), len(con_families))
+        for var in repn.nonlinear_vars:
+            var_families.setdefault(var.parent_component(), len(var_families))
+        for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+            column = var_families.setdefault(var.parent_component(), len(var_families))
+            if coef != 0:
+                con_index.append(row)
+                var_index.append(column)
+                log_coefs.append(math.log10(abs(coef)))
+    con_index = np.array(con_index, dtype=int)
+    var_index = np.array(var_index, dtype=int)
+    log_coefs = np.array(log_coefs, dtype=float)
+
+    # Scaling factors in log10 scale: a coefficient a becomes a * 10**(R - S) for
+    # constraint family factor 10**R and variable family factor 10**S
+    R = np.zeros(len(con_families))
+    S = np.zeros(len(var_families))
+    continuous = np.array(
+        [
+            all(var.is_continuous() for var in family.values())
+            for family in var_families
+        ],
+        dtype=bool,
+    )
+
+    def _group_center(index, size, values):
+        # Middle of the smallest and largest value of each group, in log scale
+        low = np.full(size, np.inf)
+        high = np.full(size, -np.inf)
+        np.minimum.at(low, index, values)
+        np.maximum.at(high, index, values)
+        return np.where(np.isfinite(low), (low + high) / 2, 0)
+
+    for _ in range(iterations):
+        S = np.where(
+            continuous, _group_center(var_index, len(S), log_coefs + R[con_index]), 0
+        )
+        R = -_group_center(con_index, len(R), log_coefs - S[var_index])
+    R = np.round(R)
+    S = np.round(S)
+
+    for family, i in var_families.items():
+        model.scaling_factor[family] = 10 ** S[i]
+    for family, i in con_families.items():
+        model.scaling_factor[family] = 10 ** R[i]
+
+    scaled_log_coefs = log_coefs + R[con_index] - S[var_index]
+    report = {
+        "coefficient_range_before": (
+            (10 ** log_coefs.min(), 10 ** log_coefs.max()) if log_coefs.size else ()
+        ),
+        "coefficient_range_after": (
+            (10 ** scaled_log_coefs.min(), 10 ** scaled_log_coefs.max())
+            if log_coefs.size
+            else ()
+        ),
+    }
+    if log_coefs.size:
+        print(
+            "Automatic scaling - constraint coefficient range: "
+            "[{:.1e}, {:.1e}] before scaling, [{:.1e}, {:.1e}] after scaling".format(
+                *report["coefficient_range_before"], *report["coefficient_range_after"]
+            )
+        )
+    return report
+
+
+def _reset_scaling_suffix(model):
+    if hasattr(model, "scaling_factor"):
+        # Replace the scaling factors of a previous solve
+        model.scaling_factor.clear()
+    else:
+        model.scaling_factor = Suffix(direction=Suffix.EXPORT)
+
+
+def _set_scaling_factors(model, scaling_factor):
+    if scaling_factor == "auto":
+        set_automatic_scaling_factors(model)
+        return
+
+    _reset_scaling_suffix(model)
 
     # Scaling variables
     model.scaling_factor[model.v_Z] = 1 / scaling_factor
@@ -6425,11 +6944,112 @@ def scale_model(model, scaling_factor=1000000):
         model.scaling_factor[model.MidCostCalc] = 1 / scaling_factor
         model.scaling_factor[model.MidTotalCostCalc] = 1 / scaling_factor
 
+
+def scale_model(model, scaling_factor=1000000):
+    _set_scaling_factors(model, scaling_factor)
+
     scaled_model = TransformationFactory("core.scale_model").create_using(model)
 
     return scaled_model
 
 
+def _get_scaling_factor(model, component):
+    # Scaling factors are set either for single components or for whole indexed
+    # components, as in the core.scale_model transformation
+    if component in model.scaling_factor:
+        return model.scaling_factor[component]
+    return model.scaling_factor.get(component.parent_component(), 1)
+
+
+@contextlib.contextmanager
+def scaled_in_place(model, scaling_factor=1000000):
+    """
+    Context manager that scales the model itself, without creating a scaled copy of
+    it, with the same scaling factors and substitutions as scale_model(). Inside the
+    with block, the variables of the model hold scaled values and bounds and the
+    constraints, named expressions and objectives are written in terms of the scaled
+    variables. On exit, the original expressions, bounds and fixed status are restored
+    and the variable values (e.g., the solution) are converted back to the original
+    space:
+
+    with scaled_in_place(model):
+        opt.solve(model)
+    """
+    _set_scaling_factors(model, scaling_factor)
+
+    var_scaling = ComponentMap()
+    substitution_map = {}
+    saved_vars = []
+    for var in model.component_data_objects(Var, descend_into=True):
+        saved_vars.append((var, var.lower, var.upper, var.fixed))
+        factor = _get_scaling_factor(model, var)
+        if factor == 1:
+            continue
+        var_scaling[var] = factor
+        substitution_map[id(var)] = var / factor
+
+    # The scaling is applied here, so writers must not apply it again
+    model.scaling_factor.deactivate()
+    saved_expressions = []
+    try:
+        # Rewrite the model in terms of the scaled variables. Named expressions are
+        # rewritten once and keep being referenced by the constraints and objectives
+        for expr in model.component_data_objects(Expression, descend_into=True):
+            saved_expressions.append((expr, expr.expr))
+            expr.set_value(
+                replace_expressions(
+                    expr.expr, substitution_map, descend_into_named_expressions=False
+                )
+            )
+        for obj in model.component_data_objects(Objective, descend_into=True):
+            saved_expressions.append((obj, obj.expr))
+            obj.set_value(
+                replace_expressions(
+                    obj.expr, substitution_map, descend_into_named_expressions=False
+                )
+            )
+        for con in model.component_data_objects(
+            Constraint, active=True, descend_into=True
+        ):
+            saved_expressions.append((con, con.expr))
+            factor = _get_scaling_factor(model, con)
+            body = factor * replace_expressions(
+                con.body, substitution_map, descend_into_named_expressions=False
+            )
+            if con.equality:
+                con.set_value(body == factor * con.upper)
+            elif con.lower is None:
+                con.set_value(body <= factor * con.upper)
+            elif con.upper is None:
+                con.set_value(factor * con.lower <= body)
+            else:
+                con.set_value(inequality(factor * con.lower, body, factor * con.upper))
+        for var, factor in var_scaling.items():
+            if var.lb is not None:
+                var.setlb(var.lb * factor)
+            if var.ub is not None:
+                var.setub(var.ub * factor)
+            if var.value is not None:
+                var.set_value(var.value * factor, skip_validation=True)
+
+        yield model
+
+    finally:
+        for component, expr in saved_expressions:
+            component.set_value(expr)
+        for var, lower, upper, fixed in saved_vars:
+            factor = var_scaling.get(var, 1)
+            if factor != 1 and var.value is not None:
+                var.set_value(var.value / factor, skip_validation=True)
+            var.setlb(lower)
+            var.setub(upper)
+            if fixed:
+                var.fix()
+            else:
+                var.unfix()
+        model.scaling_factor.activate()
+
+
 def _preprocess_data(model):
     """
     This module pre-processess data to fit the optimization format.
@@ -6528,13 +7148,11 @@ def infrastructure_timing(model):
                 if (
                     sum(
                         model.v_F_Piped[l, treatment_site, t].value
-                        for l in model.s_L
-                        if (l, treatment_site) in model.s_LLA
+                        for l in model.s_PipingIn[treatment_site]
                     )
                     + sum(
                         model.v_F_Trucked[l, treatment_site, t].value
-                        for l in model.s_L
-                        if (l, treatment_site) in model.s_LLT
+                        for l in model.s_TruckingIn[treatment_site]
                     )
                     > model.p_sigma_Treatment[treatment_site, i[1]].value
                 ):
@@ -6841,35 +7459,99 @@ def subsurface_risk(model):
     return model
 
 
-def solve_discrete_water_quality(model, opt, scaled):
-    # Discrete water quality method consists of 3 steps:
-    # Step 1 - generate a feasible initial solution
-    # Step 1a -- fix discrete water quality variables
-    # Step 1b -- solve model, obtain optimal flows without considering quality
-    # Step 1c -- fix or bound all non quality variables
-    # Step 1d -- free discrete water quality variables
-    # Step 1e -- solve model again for a feasible initial solution for discrete water quality
-    # Step 2 - solve full discrete water quality
-    # Step 2a -- free or remove bounds for all non quality variables
-    # Step 2b -- call solver to solve whole model using previous solve as initial solution
-    # Step 3 - Return solution
-
-    # Step 1 - generate a feasible initial solution
+# Termination conditions of a solve that found a solution
+_feasible_termination_conditions = (
+    TerminationCondition.optimal,
+    TerminationCondition.locallyOptimal,
+    TerminationCondition.feasible,
+)
+
+
+def _solve(model, opt, warmstart, dual_reductions=True):
+    """
+    Call opt.solve() on the model with the options of the solver interface: the GAMS
+    option file for CPLEX and, with dual_reductions=False, DualReductions turned off
+    for the other non-persistent solvers. Persistent solvers only receive the changes
+    made since their last solve. warmstart is only passed when it is set, as the
+    solver interfaces that do not support warm starts handle or reject the keyword
+    differently.
+    """
+    kwargs = {}
+    if warmstart:
+        kwargs["warmstart"] = True
+    if is_persistent(opt):
+        pass
+    elif opt.options["solver"] == "CPLEX":
+        kwargs["add_options"] = ["gams_model.optfile=1;"]
+    elif not dual_reductions:
+        opt.options["DualReductions"] = 0
+    return opt.solve(model, tee=True, **kwargs)
+
+
+def solve_discrete_water_quality(
+    model, opt, scaled, gap=0, warmstart=False, relative_bound=0.01
+):
+    # Discrete water quality method consists of 3 stages:
+    # Stage 1 - relaxed discrete water quality
+    # Stage 1a -- relax discrete water quality variables to [0, 1]
+    # Stage 1b -- solve model for the flows and a bound on the objective
+    # Stage 2 - discrete water quality for the stage 1 flows
+    # Stage 2a -- restore binary discrete water quality variables
+    # Stage 2b -- fix all non quality variables and deactivate the constraints
+    #             without free variables, i.e., the flow network
+    # Stage 2c -- solve the water quality subproblem for a feasible solution. If it
+    #             is infeasible, fix the non quality binary variables, bound the
+    #             other non quality variables to within relative_bound of their
+    #             stage 1 values and solve again
+    # Stage 2d -- return the stage 2 solution if it is within the gap of the
+    #             stage 1 bound
+    # Stage 3 - solve full discrete water quality
+    # Stage 3a -- free the variables fixed or bounded and activate the constraints
+    #             deactivated in stage 2
+    # Stage 3b -- call solver to solve whole model using the stage 2 solution as
+    #             initial solution
+    # With warmstart, the current variable values are a solution to start from and
+    # only stage 3 is solved
+    # The time spent in each stage is returned in results.solver.stage_times
+    stage_times = {}
+
+    if warmstart:
+        start = time.perf_counter()
+        print("\n")
+        print("*" * 50)
+        print(" " * 15, "Solving discrete water quality model")
+        print("*" * 50)
+        results = _solve(model, opt, warmstart=True)
+        stage_times["full_model"] = time.perf_counter() - start
+        results.solver.stage_times = stage_times
+        return results
+
+    # Stage 1 - relaxed discrete water quality
+    start = time.perf_counter()
     v_DQ = model.scaled_v_DQ if scaled else model.v_DQ
-    # Step 1a - fix discrete water quality variables
-    v_DQ.fix()
-    # Step 1b - solve model, obtain optimal flows without considering quality
-    if opt.options["solver"] == "CPLEX":
-        opt.solve(
-            model,
-            tee=True,
-            add_options=["gams_model.optfile=1;"],
-        )
+    # Stage 1a - relax discrete water quality variables to [0, 1]
+    v_DQ.domain = UnitInterval
+    # Stage 1b - solve model for the flows and a bound on the objective
+    results = _solve(model, opt, warmstart=False)
+    stage_times["relaxed_quality"] = time.perf_counter() - start
+    if results.solver.termination_condition == TerminationCondition.infeasible:
+        v_DQ.domain = Binary
+        results.solver.stage_times = stage_times
+        return results
+    objective = next(model.component_data_objects(Objective, active=True))
+    if objective.sense == minimize:
+        bound = results.problem.lower_bound
     else:
-        opt.solve(model, tee=True)
-    # Step 1c - fix or bound all non quality variables
+        bound = results.problem.upper_bound
+
+    # Stage 2 - discrete water quality for the stage 1 flows
+    start = time.perf_counter()
+    # Stage 2a - restore binary discrete water quality variables
+    v_DQ.domain = Binary
+    # Stage 2b - fix all non quality variables and deactivate the flow network
     prefix = "scaled_" if scaled else ""
     discrete_variables_names = {
+        prefix + "v_DQ",
         prefix + "v_F_DiscretePiped",
         prefix + "v_F_DiscreteTrucked",
         prefix + "v_F_DiscreteDisposalDestination",
@@ -6887,122 +7569,176 @@ def solve_discrete_water_quality(model, opt, scaled):
         prefix + "v_Q_CompletionPad",
         prefix + "v_ObjectiveWithQuality",
     }
-    for var in model.component_objects(Var):
-        if var.name in discrete_variables_names:
-            continue
-        for index in var:
-            index_var = var if index is None else var[index]
-            value = index_var.value
-            # Fix binary variables to their value and bound the continuous variables
-            if index_var.domain is Binary:
-                index_var.fix(round(value))
-            else:
-                index_var.setlb(0.99 * value)
-                index_var.setub(1.01 * value)
-    # Step 1d - free discrete water quality variables
-    v_DQ.free()
+    fixed_variables = fix_variables(model, exception_list=discrete_variables_names)
+    bounded_variables = []
+    deactivated_constraints = deactivate_fixed_constraints(model)
 
-    # Step 1e - solve model again for a feasible initial solution for discrete water quality
+    # Stage 2c - solve the water quality subproblem for a feasible solution
     print("\n")
     print("*" * 50)
-    print(" " * 15, "Solving non-discrete water quality model")
+    print(" " * 15, "Solving discrete water quality subproblem")
     print("*" * 50)
-    if opt.options["solver"] == "CPLEX":
-        opt.solve(
+    results = _solve(model, opt, warmstart=False)
+    if results.solver.termination_condition not in _feasible_termination_conditions:
+        # The stage 1 flows admit no discrete water quality, let the flows move
+        # within relative_bound of their stage 1 values
+        print(
+            "Discrete water quality subproblem has no solution for the relaxed flows, "
+            "solving it with the flows bounded around them"
+        )
+        unfix_variables(fixed_variables)
+        fixed_variables = []
+        for con in deactivated_constraints:
+            con.activate()
+        bounded_variables = bound_variables(
             model,
-            tee=True,
-            add_options=["gams_model.optfile=1;"],
-        )
-    else:
-        opt.solve(model, tee=True, warmstart=True)
-
-    # Step 2 - solve full discrete water quality
-    # Step 2a - free or remove bounds for all non quality variables
-    for var in model.component_objects(Var):
-        if var.name in discrete_variables_names:
-            continue
-        for index in var:
-            index_var = var if index is None else var[index]
-            value = index_var.value
-            # unfix binary variables and unbound the continuous variables
-
-            if index_var.domain is Binary:
-                index_var.free()
-            else:
-                index_var.setlb(0)
-                index_var.setub(None)
-
-    # Step 2b - call solver to solve whole model using previous solve as initial solution
+            exception_list=discrete_variables_names,
+            relative_bound=relative_bound,
+        )
+        deactivated_constraints = deactivate_fixed_constraints(model)
+        results = _solve(model, opt, warmstart=False)
+    stage_times["quality_subproblem"] = time.perf_counter() - start
+
+    # Stage 2d - return the stage 2 solution if it is within the gap of the stage 1
+    # bound, as solving the whole model cannot improve it by more than the gap
+    feasible = results.solver.termination_condition in _feasible_termination_conditions
+    if feasible and bound is not None and math.isfinite(bound):
+        incumbent = value(objective)
+        if abs(incumbent - bound) <= max(gap, 1e-6) * max(abs(incumbent), 1):
+            print(
+                "Discrete water quality subproblem solution is within the gap of the "
+                "relaxed bound, skipping the full model solve"
+            )
+            unfix_variables(fixed_variables)
+            restore_variables(bounded_variables)
+            for con in deactivated_constraints:
+                con.activate()
+            results.solver.stage_times = stage_times
+            return results
+
+    # Stage 3 - solve full discrete water quality
+    start = time.perf_counter()
+    # Stage 3a - free the variables and activate the constraints of stage 2
+    unfix_variables(fixed_variables)
+    restore_variables(bounded_variables)
+    for con in deactivated_constraints:
+        con.activate()
+
+    # Stage 3b - call solver to solve whole model using the stage 2 solution as
+    # initial solution
     print("\n")
     print("*" * 50)
     print(" " * 15, "Solving discrete water quality model")
     print("*" * 50)
-    if opt.options["solver"] == "CPLEX":
-        results = opt.solve(
-            model,
-            tee=True,
-            warmstart=True,
-            add_options=["gams_model.optfile=1;"],
-        )
-    else:
-        results = opt.solve(model, tee=True, warmstart=True)
+    results = _solve(model, opt, warmstart=feasible)
+    stage_times["full_model"] = time.perf_counter() - start
 
-    # Step 3 - Return solution
+    results.solver.stage_times = stage_times
     return results
 
 
-def calc_new_pres(model_h, ps, l1, l2, t):
-    D_eff = value(model_h.hydraulics.p_Initial_Pipeline_Diameter[l1, l2]) + sum(
-        value(model_h.vb_y_Pipeline[l1, l2, d])
-        * value(model_h.df_parameters["PipelineDiameterValues"][d])
-        for d in model_h.s_D
+def _pressure_propagation_order(arcs, sources):
+    """
+    Return the positions of the arcs that first reach each location in a breadth
+    first search of the network from the sources. Following these arcs in order,
+    the pressure at the start of each arc is known when it is reached.
+    """
+    adjacency = {}
+    for position, (l1, l2) in enumerate(arcs):
+        adjacency.setdefault(l1, []).append((position, l2))
+    visited = set(sources)
+    queue = deque(sources)
+    order = []
+    while queue:
+        l1 = queue.popleft()
+        for position, l2 in adjacency.get(l1, []):
+            if l2 not in visited:
+                visited.add(l2)
+                order.append(position)
+                queue.append(l2)
+    return order
+
+
+def propagate_pressures(model):
+    """
+    Propagate the pressures at the production pads through the pipeline network of
+    a model solved with the linearized hydraulics and check them. Along each
+    pipeline, the pressure changes as in the pressure constraints of the hydraulics
+    block, with the elevation, the Hazen-Williams friction loss v_HW_loss and the
+    pump and valve heads of the solution.
+
+    Returns a DataFrame with the pressure [model units] at each location reached
+    from a production pad (rows) for each time period (columns), and a DataFrame
+    listing the nodes and time periods where the pressure is above the maximum
+    allowable operating pressure ("maximum") or negative ("minimum").
+    """
+    mh = model.hydraulics
+    arcs = list(model.s_LLA)
+    periods = list(model.s_T)
+
+    def _arc_values(var):
+        return np.array(
+            [[var[arc, t].value or 0 for t in periods] for arc in arcs], dtype=float
+        ).reshape(len(arcs), len(periods))
+
+    elevation = np.array(
+        [
+            value(model.p_zeta_Elevation[l1]) - value(model.p_zeta_Elevation[l2])
+            for l1, l2 in arcs
+        ]
     )
-    if value(model_h.v_F_Piped[(l1, l2), t]) > 0.01:
-        if D_eff > 0.1:
-            HW_loss = (
-                10.704
-                * (
-                    (
-                        value(
-                            pyunits.convert(
-                                model_h.v_F_Piped[l1, l2, t],
-                                to_units=pyunits.m**3 / pyunits.s,
-                            )
-                        )
-                        / value(model_h.hydraulics.p_iota_HW_material_factor_pipeline)
-                    )
-                    ** 1.85
-                )
-                * value(
-                    pyunits.convert(
-                        model_h.p_lambda_Pipeline[l1, l2], to_units=pyunits.m
-                    )
-                )
-            ) / ((D_eff * 0.0254) ** 4.87)
-        else:
-            HW_loss = 0
-    else:
-        HW_loss = 0
-    P2 = ps
-    (
-        +value(model_h.p_zeta_Elevation[l1]) * value(model_h.hydraulics.p_rhog)
-        - value(model_h.p_zeta_Elevation[l2]) * value(model_h.hydraulics.p_rhog)
-        - value(model_h.hydraulics.v_HW_loss[l1, l2, t])
-        * value(model_h.hydraulics.p_rhog)
-        + value(model_h.hydraulics.v_PumpHead[l1, l2, t])
-        * value(model_h.hydraulics.p_rhog)
-        - value(model_h.hydraulics.v_ValveHead[l1, l2, t])
-        * value(model_h.hydraulics.p_rhog)
+    pressure_change = value(mh.p_rhog) * (
+        elevation[:, None]
+        - _arc_values(mh.v_HW_loss)
+        + _arc_values(mh.v_PumpHead)
+        - _arc_values(mh.v_ValveHead)
+    )
+
+    pressures = {
+        p: np.array([value(mh.v_Pressure[p, t]) for t in periods]) for p in model.s_PP
+    }
+    for position in _pressure_propagation_order(arcs, list(model.s_PP)):
+        l1, l2 = arcs[position]
+        pressures[l2] = pressures[l1] + pressure_change[position]
+    pressures = pd.DataFrame.from_dict(pressures, orient="index", columns=periods)
+    pressures.index.name = "location"
+
+    nodes = pressures[pressures.index.isin(list(model.s_N))]
+    violations = pd.concat(
+        [
+            nodes[nodes > value(mh.p_xi_Max_AOP)]
+            .stack()
+            .to_frame("pressure")
+            .assign(violation="maximum"),
+            nodes[nodes < 0].stack().to_frame("pressure").assign(violation="minimum"),
+        ]
     )
+    violations.index.names = ["location", "time"]
+    return pressures, violations.reset_index()
 
-    return P2
+
+# Solvers that solve_model() tries to load in order if no solver is given
+_default_solvers = ("gurobi_direct", "gurobi", "gams:CPLEX", "cbc")
+
+
+def _load_solver(solver):
+    """
+    Return the solver object for the solver option of solve_model()
+    """
+    if type(solver) is tuple:
+        return get_solver(*solver)
+    elif type(solver) is str:
+        return get_solver(solver)
+    else:
+        # Reuse a solver object, e.g., a persistent solver from a previous solve
+        return solver
 
 
 def solve_model(model, options=None):
     """
     Solve the optimization model. options is a dictionary with the following options:
 
-    `solver`: Either a string with solver name or a tuple of strings with several solvers to try and load in order. PARETO currently supports Gurobi (commercial), CPLEX (commercial) and CBC (free) solvers, but it might be possible to use other MILP solvers as well. Default = ("gurobi_direct", "gurobi", "gams:CPLEX", "cbc")
+    `solver`: Either a string with solver name, a tuple of strings with several solvers to try and load in order, or a solver object returned by `get_solver()`. PARETO currently supports Gurobi (commercial), CPLEX (commercial) and CBC (free) solvers, but it might be possible to use other MILP solvers as well. Pyomo persistent solver interfaces ("appsi_gurobi", "appsi_cplex", "appsi_highs") are also supported: they keep the model loaded between solves and only push the changes made to it, e.g., the variables fixed in the discrete water quality solves or an objective selected with `set_objective()`. Pass the same persistent solver object to several `solve_model()` calls to reuse the loaded model across calls. Default = ("gurobi_direct", "gurobi", "gams:CPLEX", "cbc")
 
     `running_time`: Maximum solver running time in seconds. Default = 60
 
@@ -7012,7 +7748,11 @@ def solve_model(model, options=None):
 
     `scale_model`: `True` to apply scaling to the model, `False` to not apply scaling. Default = `False`
 
-    `scaling_factor`: Scaling factor to apply to the model (only relevant if `scale_model` is `True`). Default = 1000000
+    `scaling_factor`: Scaling factor to apply to the model (only relevant if `scale_model` is `True`), or "auto" to pick the scaling factors of each variable and constraint family from the model data (see `set_automatic_scaling_factors()`). Default = 1000000
+
+    `scale_in_place`: `True` to scale the model itself for the duration of the solve, `False` to solve a scaled copy of the model (only relevant if `scale_model` is `True`). Both give the same scaled problem, but scaling in place avoids the memory and time needed to copy large models. Default = `False`
+
+    `warmstart`: `True` to start the solver from the current variable values, e.g., the solution of a previous solve or values loaded with `initialize_from_solution()`. The values are passed to MIP solvers as a warm start, and the discrete water quality solve starts from them instead of going through the relaxed and the water quality subproblem stages (see `solve_discrete_water_quality()`). Default = `False`
 
     `gurobi_numeric_focus`: The `NumericFocus` parameter to pass to the Gurobi solver. This parameter can be 1, 2, or 3, and per Gurobi, "settings 1-3 increasingly shift the focus towards more care in numerical computations, which can impact performance." This option is ignored if a solver other than Gurobi is used. Default = 1
 
@@ -7026,14 +7766,11 @@ def solve_model(model, options=None):
     deactivate_slacks = True  # yes/no to deactivate slack variables
     use_scaling = False  # yes/no to scale the model
     scaling_factor = 1000000  # scaling factor to apply to the model (only relevant if scaling is turned on)
+    scale_in_place = False  # yes/no to scale the model itself instead of a copy
+    warmstart = False  # yes/no to start the solver from the current values
     gurobi_numeric_focus = 1
     only_subsurface_block = False  # yes/no to only solve the subsurface risk block
-    solver = (
-        "gurobi_direct",
-        "gurobi",
-        "gams:CPLEX",
-        "cbc",
-    )  # solvers to try and load in order
+    solver = _default_solvers  # solvers to try and load in order
 
     # raise an exception if options is neither None nor a user-provided dictionary
     if options is not None and not isinstance(options, dict):
@@ -7054,6 +7791,10 @@ def solve_model(model, options=None):
             use_scaling = options["scale_model"]
         if "scaling_factor" in options.keys():
             scaling_factor = options["scaling_factor"]
+        if "scale_in_place" in options.keys():
+            scale_in_place = options["scale_in_place"]
+        if "warmstart" in options.keys():
+            warmstart = options["warmstart"]
         if "solver" in options.keys():
             solver = options["solver"]
         if "gurobi_numeric_focus" in options.keys():
@@ -7062,11 +7803,11 @@ def solve_model(model, options=None):
             only_subsurface_block = options["only_subsurface_block"]
 
     # Load solver
-    opt = get_solver(*solver) if type(solver) is tuple else get_solver(solver)
+    opt = _load_solver(solver)
 
     # The below code is not the best way to check for solver but this works.
     # Checks for CPLEX using gams.
-    if opt.options["solver"] == "CPLEX":
+    if not is_persistent(opt) and opt.options["solver"] == "CPLEX":
         with open(f"{opt.options['solver']}.opt", "w") as f:
             f.write(
                 f"$onecho > {opt.options['solver']}.opt\n optcr={gap}\n running_time={running_time} $offecho"
@@ -7076,7 +7817,12 @@ def solve_model(model, options=None):
     set_timeout(opt, timeout_s=running_time)
 
     # Set solver gap
-    if opt.type in ("gurobi_direct", "gurobi"):
+    if is_persistent(opt):
+        # Apply persistent solver options
+        opt.config.mip_gap = gap
+        if hasattr(opt, "gurobi_options"):
+            opt.gurobi_options["NumericFocus"] = gurobi_numeric_focus
+    elif opt.type in ("gurobi_direct", "gurobi"):
         # Apply Gurobi specific options
         opt.options["mipgap"] = gap
         opt.options["NumericFocus"] = gurobi_numeric_focus
@@ -7110,7 +7856,8 @@ def solve_model(model, options=None):
                 if factor in ("orphan", "inactive") and model.subsurface.deep[site]:
                     model.subsurface.vb_y_dist[site, factor].fix(1)
 
-        # Solve just the subsurface risk block
+        # Solve just the subsurface risk block. Note that a persistent solver loads
+        # the block and then the whole model again for the next solve
         model.subsurface.objective.activate()
         results_subsurface = opt.solve(model.subsurface, tee=True)
         model.subsurface.objective.deactivate()
@@ -7131,7 +7878,41 @@ def solve_model(model, options=None):
                 "Subsurface risk block has not been created. Proceeding with solving network model."
             )
 
-    if use_scaling:
+    if use_scaling and scale_in_place:
+        # Step 1: scale the model itself instead of a copy of it
+        print("\n")
+        print("*" * 50)
+        print(" " * 15, "Solving scaled model")
+        print("*" * 50)
+        with scaled_in_place(model, scaling_factor=scaling_factor):
+            # Step 2: check model to be solved
+            #       option 2.1 - full space model,
+            #       option 2.2 - post process water quality,
+            #       option 2.3 - discrete water quality,
+            if model.config.water_quality is WaterQuality.discrete:
+                # option 2.3:
+                results = solve_discrete_water_quality(
+                    model, opt, scaled=False, gap=gap, warmstart=warmstart
+                )
+            else:
+                # options 2.1 and 2.2:
+                results = _solve(
+                    model,
+                    opt,
+                    warmstart,
+                    dual_reductions=(
+                        model.config.water_quality is WaterQuality.post_process
+                    ),
+                )
+
+        # Step 3: leaving the with block restored the model and converted the results
+        # back to the original space, post-process water quality if necessary
+        if (
+            model.config.water_quality is WaterQuality.post_process
+            and results.solver.termination_condition != TerminationCondition.infeasible
+        ):
+            model = postprocess_water_quality_calculation(model, opt)
+    elif use_scaling:
         # Step 1: scale model
         scaled_model = scale_model(model, scaling_factor=scaling_factor)
         # Step 2: solve scaled mathematical model
@@ -7145,17 +7926,12 @@ def solve_model(model, options=None):
         #       option 3.3 - discrete water quality,
         if model.config.water_quality is WaterQuality.discrete:
             # option 3.3:
-            results = solve_discrete_water_quality(scaled_model, opt, scaled=True)
+            results = solve_discrete_water_quality(
+                scaled_model, opt, scaled=True, gap=gap, warmstart=warmstart
+            )
         elif model.config.water_quality is WaterQuality.post_process:
             # option 3.2:
-            if opt.options["solver"] == "CPLEX":
-                results = opt.solve(
-                    scaled_model,
-                    tee=True,
-                    add_options=["gams_model.optfile=1;"],
-                )
-            else:
-                results = opt.solve(scaled_model, tee=True)
+            results = _solve(scaled_model, opt, warmstart)
             if results.solver.termination_condition != TerminationCondition.infeasible:
                 TransformationFactory("core.scale_model").propagate_solution(
                     scaled_model, model
@@ -7163,15 +7939,7 @@ def solve_model(model, options=None):
                 model = postprocess_water_quality_calculation(model, opt)
         else:
             # option 3.1:
-            if opt.options["solver"] == "CPLEX":
-                results = opt.solve(
-                    scaled_model,
-                    tee=True,
-                    add_options=["gams_model.optfile=1;"],
-                )
-            else:
-                opt.options["DualReductions"] = 0
-                results = opt.solve(scaled_model, tee=True)
+            results = _solve(scaled_model, opt, warmstart, dual_reductions=False)
 
         # Step 4: propagate scaled model results to original model
         if results.solver.termination_condition != TerminationCondition.infeasible:
@@ -7191,30 +7959,17 @@ def solve_model(model, options=None):
         #       option 2.3 - discrete water quality,
         if model.config.water_quality is WaterQuality.discrete:
             # option 2.3:
-            results = solve_discrete_water_quality(model, opt, scaled=False)
+            results = solve_discrete_water_quality(
+                model, opt, scaled=False, gap=gap, warmstart=warmstart
+            )
         elif model.config.water_quality is WaterQuality.post_process:
             # option 2.2:
-            if opt.options["solver"] == "CPLEX":
-                results = opt.solve(
-                    model,
-                    tee=True,
-                    add_options=["gams_model.optfile=1;"],
-                )
-            else:
-                results = opt.solve(model, tee=True)
+            results = _solve(model, opt, warmstart)
             if results.solver.termination_condition != TerminationCondition.infeasible:
                 model = postprocess_water_quality_calculation(model, opt)
         else:
             # option 2.1:
-            if opt.options["solver"] == "CPLEX":
-                results = opt.solve(
-                    model,
-                    tee=True,
-                    add_options=["gams_model.optfile=1;"],
-                )
-            else:
-                opt.options["DualReductions"] = 0
-                results = opt.solve(model, tee=True)
+            results = _solve(model, opt, warmstart, dual_reductions=False)
 
     if results.solver.termination_condition == TerminationCondition.infeasible:
         print(
@@ -7254,7 +8009,9 @@ def solve_model(model, options=None):
             mh = model_h.hydraulics
             # Calculate hydraulics. The following condition is used to avoid attribute error when
             # using gurobi_direct on hydraulics sub-block
-            if opt.options["solver"] == "CPLEX":
+            if is_persistent(opt):
+                results_2 = opt.solve(mh, tee=True)
+            elif opt.options["solver"] == "CPLEX":
                 results_2 = opt.solve(
                     mh, tee=True, add_options=["gams_model.optfile=1;"]
                 )
@@ -7323,7 +8080,9 @@ def solve_model(model, options=None):
             # Adding temporary variable bounds until the bounding method is implemented for the following Vars
             model_h.v_F_Piped.setub(1050)
             model_h.hydraulics.v_Pressure.setub(3.5e6)
-            if opt.options["solver"] == "CPLEX":
+            if is_persistent(opt):
+                results_2 = opt.solve(model_h, tee=True)
+            elif opt.options["solver"] == "CPLEX":
                 results_2 = opt.solve(
                     model_h,
                     tee=True,
@@ -7334,42 +8093,16 @@ def solve_model(model, options=None):
                 results_2 = opt.solve(model_h, tee=True, keepfiles=True)
 
             # Check the feasibility of the results with regards to max pressure and node pressures
-
-            # Navigate over all the times
-            flagV = 0
-            flagU = 0
-            for t in model.s_T:
-                Press_dict = {}
-                for p in model.s_PP:
-                    Press_dict[p] = value(model_h.hydraulics.v_Pressure[p, t])
-                    while True:
-                        pres_dict_keys = list(Press_dict.keys())
-                        for l1, l2 in model.s_LLA:
-                            if l1 in Press_dict.keys():
-                                ps = Press_dict[l1]
-                                this_p = calc_new_pres(model_h, ps, l1, l2, t)
-                                Press_dict[l2] = this_p
-                                if (
-                                    this_p > value(model_h.hydraulics.p_xi_Max_AOP)
-                                    and l2 in model.s_N
-                                ):
-                                    flagV = 1
-                                    print(l2, "->", l2 in model.s_N)
-                                    print(
-                                        "\n\nThe Pressure is ",
-                                        this_p,
-                                        " and max is ",
-                                        value(model_h.hydraulics.p_xi_Max_AOP),
-                                    )
-                                if this_p < 0 and l2 in model.s_N:
-                                    flagU = 1
-                        pres_dict_keys2 = list(Press_dict.keys())
-                        if pres_dict_keys == pres_dict_keys2:
-                            break
-
-            if flagV:
+            # The DataFrames are kept on the hydraulics block rather than on the
+            # results, which can only hold values that the results writer handles
+            pressures, violations = propagate_pressures(model_h)
+            model_h.hydraulics.pressures = pressures
+            model_h.hydraulics.pressure_violations = violations
+            if len(violations):
+                print(violations.to_string(index=False))
+            if (violations["violation"] == "maximum").any():
                 print("Violation of maximum pressure")
-            elif flagU:
+            elif (violations["violation"] == "minimum").any():
                 print("Violation of minimum pressure")
             else:
                 print("All pressures satisfied ")
@@ -7379,3 +8112,826 @@ def solve_model(model, options=None):
 
         results_2.write()
     return results
+
+
+# Key performance indicators reported by run_scenarios(): column name and the
+# name of the model component holding the value (in model units)
+_scenario_kpis = {
+    "total_cost": "v_Z",
+    "total_sourced": "v_F_TotalSourced",
+    "total_disposed": "v_F_TotalDisposed",
+    "total_reused": "v_F_TotalReused",
+    "total_trucked": "v_F_TotalTrucked",
+    "total_beneficial_reuse": "v_F_TotalBeneficialReuse",
+    "total_emissions": "e_TotalEmissions",
+}
+
+
+_failed_termination_conditions = (
+    TerminationCondition.infeasible,
+    TerminationCondition.infeasibleOrUnbounded,
+    TerminationCondition.unbounded,
+)
+
+
+def _run_scenario(name, df_sets, df_parameters, scenario, default, options):
+    """
+    Build and solve one scenario for run_scenarios() and return its summary. Any
+    exception is caught and reported in the summary so that a failing scenario does
+    not stop the remaining ones.
+    """
+    start = time.perf_counter()
+    summary = {"scenario": name, "status": "ok"}
+    try:
+        # create_model() adds entries to the top level of the input dictionaries,
+        # so each scenario works on its own copy
+        df_sets = dict(df_sets)
+        df_parameters = dict(df_parameters)
+        for param_name, overrides in scenario.get("parameters", {}).items():
+            df_parameters[param_name] = {
+                **df_parameters.get(param_name, {}),
+                **overrides,
+            }
+        config = {**default, **scenario.get("config", {})}
+        scenario_options = {**(options or {}), **scenario.get("options", {})}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = create_model(df_sets, df_parameters, default=config)
+            results = solve_model(model, options=scenario_options)
+
+        termination = results.solver.termination_condition
+        summary["termination_condition"] = str(termination)
+        if termination in _failed_termination_conditions:
+            summary["status"] = "infeasible"
+        else:
+            objective = next(model.component_data_objects(Objective, active=True))
+            summary["objective"] = value(objective, exception=False)
+            for column, component in _scenario_kpis.items():
+                if hasattr(model, component):
+                    summary[column] = value(getattr(model, component), exception=False)
+    except Exception as e:
+        summary["status"] = "error"
+        summary["error"] = f"{type(e).__name__}: {e}"
+    summary["run_time"] = time.perf_counter() - start
+    return summary
+
+
+def run_scenarios(
+    df_sets, df_parameters, scenarios, default={}, options=None, processes=None
+):
+    """
+    Build and solve several variants of a strategic case study, in parallel across a
+    pool of processes, and collect a summary of each run in a single data frame.
+
+    df_sets and df_parameters are the base case study data as returned by get_data().
+    default and options are the base create_model() configuration and solve_model()
+    options shared by all scenarios. scenarios is a dictionary mapping scenario names
+    to scenario definitions (a list can be given instead, in which case the scenarios
+    are named by their position). Each scenario definition is a dictionary with the
+    following optional entries:
+
+    `config`: create_model() configuration options that override default
+
+    `parameters`: dictionary mapping parameter tab names (e.g. "CompletionsDemand") to
+    {index: value} entries that override the base data
+
+    `options`: solve_model() options that override options, e.g. {"running_time": 600}
+    to set the solver time limit of this scenario
+
+    processes is the number of worker processes; the default is the number of CPUs.
+    With processes=1, scenarios are solved one after another in the current process.
+
+    Returns a pandas DataFrame with one row per scenario, indexed by scenario name, with
+    columns: status ("ok", "infeasible" or "error"), termination_condition, objective
+    (value of the active objective), KPIs (total_cost, total_sourced, total_disposed,
+    total_reused, total_trucked, total_beneficial_reuse, total_emissions; in model
+    units), run_time in seconds, and the error message of failed scenarios. A scenario
+    that fails or is infeasible does not affect the other scenarios.
+    """
+    if not isinstance(scenarios, dict):
+        scenarios = dict(enumerate(scenarios))
+
+    jobs = [
+        (name, df_sets, df_parameters, scenario, default, options)
+        for name, scenario in scenarios.items()
+    ]
+    if processes == 1:
+        summaries = [_run_scenario(*job) for job in jobs]
+    else:
+        summaries = []
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(_run_scenario, *job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    # The worker process itself failed, e.g. it ran out of memory
+                    summaries.append(
+                        {
+                            "scenario": job[0],
+                            "status": "error",
+                            "error": f"{type(e).__name__}: {e}",
+                        }
+                    )
+
+    columns = [
+        "status",
+        "termination_condition",
+        "objective",
+        *_scenario_kpis,
+        "run_time",
+        "error",
+    ]
+    return pd.DataFrame(summaries).set_index("scenario").reindex(columns=columns)
+
+
+# Secondary objectives supported by pareto_front(): name of the objective variable or
+# expression, and whether the objective is maximized
+_pareto_front_objectives = {
+    Objectives.reuse: ("v_Z_Reuse", True),
+    Objectives.subsurface_risk: ("v_Z_SubsurfaceRisk", False),
+    Objectives.environmental: ("e_TotalEmissions", False),
+}
+
+
+def _solution_snapshot(model):
+    """
+    Return the values of all variables of a model as a dictionary mapping variable
+    names to {index: value} dictionaries
+    """
+    return {
+        var.name: var.extract_values()
+        for var in model.component_objects(Var, descend_into=True)
+    }
+
+
+def _add_epsilon_constraint(model, secondary_objective):
+    """
+    Add the constraint bounding the secondary objective of a Pareto front by the
+    mutable parameter p_epsilon_ParetoFront
+    """
+    component, maximized = _pareto_front_objectives[secondary_objective]
+    secondary = getattr(model, component)
+    model.p_epsilon_ParetoFront = Param(
+        default=0,
+        mutable=True,
+        units=pyunits.get_units(secondary),
+        doc="Bound on the secondary objective of the Pareto front",
+    )
+    if maximized:
+        expr = secondary >= model.p_epsilon_ParetoFront
+    else:
+        expr = secondary <= model.p_epsilon_ParetoFront
+    model.ParetoFrontEpsilon = Constraint(
+        expr=expr, doc="Epsilon constraint on the secondary objective"
+    )
+    return secondary
+
+
+def _disable_post_process_water_quality(model):
+    """
+    Turn off the post-process water quality calculation of a Pareto front model, as
+    it fixes all the variables of the model it is calculated on. Returns True if
+    water quality is to be post-processed for each point instead.
+    """
+    if model.config.water_quality is WaterQuality.post_process:
+        model.config.water_quality = WaterQuality.false
+        return True
+    return False
+
+
+def _post_processed_snapshot(model, solver):
+    """
+    Return the solution snapshot of a Pareto front point with its post-processed
+    water quality. The water quality is calculated from the mass balances on the
+    model itself, after which the variables are freed, their values restored and the
+    water quality block removed, so that the model is left as it was for the next
+    point. Only if the mass balances do not determine the water quality is it
+    calculated with the solver, on a copy of the model. A persistent solver keeps the
+    model loaded for the next point, so a new instance of it is used for the copy.
+    """
+    free_variables = [
+        (var, var.value)
+        for var in model.component_data_objects(Var, descend_into=True)
+        if not var.fixed
+    ]
+    df_sets = dict(model.df_sets)
+    try:
+        water_quality(model)
+        solved = solve_water_quality_linear_system(model)
+        if solved:
+            snapshot = _solution_snapshot(model)
+    finally:
+        if model.component("quality") is not None:
+            model.del_component(model.quality)
+        for var, var_value in free_variables:
+            var.unfix()
+            var.set_value(var_value, skip_validation=True)
+        model.df_sets.clear()
+        model.df_sets.update(df_sets)
+    if solved:
+        return snapshot
+
+    opt = _load_solver(solver)
+    if is_persistent(opt):
+        opt = type(opt)()
+    return _solution_snapshot(postprocess_water_quality_calculation(model.clone(), opt))
+
+
+def _solve_pareto_front_points(
+    model, secondary_objective, points, options, warmstart, post_process
+):
+    """
+    Minimize cost for each (point, epsilon) in points, one after another on the same
+    model so that each solve is warm started from the solution of the previous point
+    (the first one only if warmstart is True). With post_process, the water quality
+    of each point is part of its snapshot (see _post_processed_snapshot()). Returns
+    the summary rows and the solution snapshots of the points.
+    """
+    secondary = getattr(model, _pareto_front_objectives[secondary_objective][0])
+    options = dict(options or {})
+    rows = []
+    snapshots = {}
+    for point, epsilon in points:
+        start = time.perf_counter()
+        row = {"point": point, "epsilon": epsilon, "status": "ok"}
+        try:
+            model.p_epsilon_ParetoFront.set_value(epsilon)
+            results = solve_model(
+                model, options={**options, "warmstart": warmstart or bool(rows)}
+            )
+            termination = results.solver.termination_condition
+            row["termination_condition"] = str(termination)
+            if termination in _failed_termination_conditions:
+                row["status"] = "infeasible"
+            else:
+                row["cost"] = value(model.v_Z, exception=False)
+                row[secondary_objective.name] = value(secondary, exception=False)
+                for column, component in _scenario_kpis.items():
+                    if hasattr(model, component):
+                        row[column] = value(getattr(model, component), exception=False)
+                if post_process:
+                    snapshots[point] = _post_processed_snapshot(
+                        model, options.get("solver", _default_solvers)
+                    )
+                else:
+                    snapshots[point] = _solution_snapshot(model)
+        except Exception as e:
+            row["status"] = "error"
+            row["error"] = f"{type(e).__name__}: {e}"
+        row["run_time"] = time.perf_counter() - start
+        rows.append(row)
+    return rows, snapshots
+
+
+def _solve_pareto_front_chunk(
+    df_sets, df_parameters, secondary_objective, config, options, points
+):
+    """
+    Build the model in a worker process of pareto_front() and solve a contiguous
+    chunk of the Pareto front points
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = create_model(dict(df_sets), dict(df_parameters), default=config)
+        post_process = _disable_post_process_water_quality(model)
+        _add_epsilon_constraint(model, secondary_objective)
+        return _solve_pareto_front_points(
+            model,
+            secondary_objective,
+            points,
+            options,
+            warmstart=False,
+            post_process=post_process,
+        )
+
+
+def pareto_front(
+    df_sets,
+    df_parameters,
+    secondary_objective,
+    n_points=10,
+    default={},
+    options=None,
+    processes=1,
+):
+    """
+    Generate the Pareto front between cost and a secondary objective with the epsilon
+    constraint method.
+
+    df_sets and df_parameters are the case study data as returned by get_data(),
+    default is the create_model() configuration (the objective is set to cost) and
+    options are the solve_model() options used for every solve. secondary_objective is
+    Objectives.subsurface_risk, Objectives.reuse or Objectives.environmental (the
+    subsurface risk objective requires the subsurface_risk configuration option).
+
+    The model is first solved for the optimum of the secondary objective and for
+    minimum cost, which gives the range of the secondary objective on the front. Then
+    cost is minimized for n_points values of epsilon evenly spaced over this range,
+    starting from the minimum cost solution, with the secondary objective bounded by
+    epsilon (from above for minimized objectives, from below for reuse). Points are
+    solved one after another on the same model, and each solve is warm started (the
+    warmstart option of solve_model() is set) from the solution of its neighbour;
+    passing a persistent solver object in options also keeps the model loaded in the
+    solver across points. With post-process water quality (the default), the water
+    quality of each point is calculated from the mass balances and is part of its
+    solution snapshot; the model is only copied for points where the mass balances
+    do not determine it and the solver is needed.
+
+    processes is the number of worker processes. With processes > 1, the points are
+    split into contiguous chunks solved in parallel, each by a worker process with its
+    own model (solver objects in options must then be picklable, i.e., give solver
+    names instead of persistent solver objects). The first point of each chunk then
+    starts without a warm start.
+
+    Returns a pandas DataFrame with one row per point, indexed by point number, with
+    columns: epsilon, status ("ok", "infeasible" or "error"), termination_condition,
+    cost, the secondary objective (named after the Objectives member, e.g.
+    "subsurface_risk"), the KPIs reported by run_scenarios(), run_time in seconds and
+    the error message of failed points, and a dictionary mapping point numbers to
+    solution snapshots ({variable name: {index: value}}) of the solved points. All
+    values are in model units.
+    """
+    if secondary_objective not in _pareto_front_objectives:
+        raise Exception(
+            f"Pareto front not supported for objective {secondary_objective}. "
+            f"Supported objectives: {list(_pareto_front_objectives)}"
+        )
+
+    config = {**default, "objective": Objectives.cost}
+    model = create_model(dict(df_sets), dict(df_parameters), default=config)
+    post_process = _disable_post_process_water_quality(model)
+    secondary = _add_epsilon_constraint(model, secondary_objective)
+
+    # Range of the secondary objective on the front: from its optimum to its value at
+    # the minimum cost solution. The minimum cost solve comes last so that the first
+    # point starts from the minimum cost solution.
+    model.ParetoFrontEpsilon.deactivate()
+    range_ends = []
+    for objective in (secondary_objective, Objectives.cost):
+        set_objective(model, objective)
+        results = solve_model(model, options=options)
+        if results.solver.termination_condition in _failed_termination_conditions:
+            raise Exception(
+                f"Pareto front cannot be generated: the model is "
+                f"{results.solver.termination_condition} when optimizing {objective}"
+            )
+        range_ends.append(value(secondary))
+    model.ParetoFrontEpsilon.activate()
+
+    points = list(enumerate(np.linspace(range_ends[1], range_ends[0], n_points)))
+    if processes == 1:
+        rows, snapshots = _solve_pareto_front_points(
+            model,
+            secondary_objective,
+            points,
+            options,
+            warmstart=True,
+            post_process=post_process,
+        )
+    else:
+        chunk_size = -(-len(points) // processes)
+        chunks = [points[i : i + chunk_size] for i in range(0, len(points), chunk_size)]
+        rows = []
+        snapshots = {}
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(
+                    _solve_pareto_front_chunk,
+                    df_sets,
+                    df_parameters,
+                    secondary_objective,
+                    config,
+                    options,
+                    chunk,
+                )
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    chunk_rows, chunk_snapshots = future.result()
+                except Exception as e:
+                    # The worker process itself failed, e.g. it ran out of memory
+                    chunk_rows = [
+                        {
+                            "point": point,
+                            "epsilon": epsilon,
+                            "status": "error",
+                            "error": f"{type(e).__name__}: {e}",
+                        }
+                        for point, epsilon in chunk
+                    ]
+                    chunk_snapshots = {}
+                rows.extend(chunk_rows)
+                snapshots.update(chunk_snapshots)
+
+    columns = [
+        "epsilon",
+        "status",
+        "termination_condition",
+        "cost",
+        secondary_objective.name,
+        *[column for column in _scenario_kpis if column != "total_cost"],
+        "run_time",
+        "error",
+    ]
+    front = pd.DataFrame(rows).set_index("point").reindex(columns=columns)
+    return front, snapshots
+
+
+def _discrete_quality_bin_widths(model, tolerance=1e-6):
+    """
+    Return, for each water quality component, a dictionary mapping the discrete
+    quality levels used by the solution of the model to the width of their bin, i.e.,
+    the distance to the next lower level. A level is used if a discrete flow or
+    storage level at this level is larger than tolerance. The lowest level is the
+    lowest pad or storage quality, so its bin has zero width.
+    """
+    used = set()
+    for var in model.component_objects(Var, descend_into=False):
+        if var.local_name.startswith(("v_F_Discrete", "v_L_Discrete")):
+            for index, var_data in var.items():
+                if var_data.value is not None and var_data.value > tolerance:
+                    # The last two indices of discrete variables are (qc, q)
+                    used.add(index[-2:])
+
+    widths = {}
+    for qc in model.s_QC:
+        levels = {q: value(model.p_discrete_quality[qc, q]) for q in model.s_Q}
+        ordered = sorted(model.s_Q, key=levels.get)
+        widths[qc] = {ordered[0]: 0} if (qc, ordered[0]) in used else {}
+        for lower, q in zip(ordered, ordered[1:]):
+            if (qc, q) in used:
+                widths[qc][q] = levels[q] - levels[lower]
+    return widths
+
+
+def _refine_discrete_quality_levels(model, widths, tolerance):
+    """
+    Move the unused discrete quality levels of each component to the midpoints of
+    the used bins wider than tolerance, widest bins first. The lowest and highest
+    levels are never moved. Returns True if any level was moved.
+    """
+    refined = False
+    for qc in model.s_QC:
+        levels = {q: value(model.p_discrete_quality[qc, q]) for q in model.s_Q}
+        ordered = sorted(model.s_Q, key=levels.get)
+        unused = [q for q in ordered[1:-1] if q not in widths[qc]]
+        wide_bins = sorted(
+            ((width, q) for q, width in widths[qc].items() if width > tolerance),
+            reverse=True,
+        )
+        for (width, q), free in zip(wide_bins, unused):
+            model.p_discrete_quality[qc, free] = levels[q] - width / 2
+            refined = True
+    return refined
+
+
+def refine_discrete_water_quality(model, tolerance, options=None, max_iterations=5):
+    """
+    Solve a model with discrete water quality on an adaptively refined grid of
+    discrete quality levels.
+
+    The model is first solved on its initial grid of levels, evenly spaced between
+    the lowest and highest pad and storage qualities of each component. Then, for
+    each component, the levels that carry no discrete flow or storage in the solution
+    are moved to the midpoints of the widest used bins (the interval between a used
+    level and the next lower level, i.e., the largest overestimate of the
+    concentration of a location at this level), and the model is solved again
+    starting from the previous solution, which stays feasible as no used level moves.
+    This is repeated until no used bin is wider than tolerance (in user
+    concentration units), no level is left to move, or max_iterations solves have
+    been done. The number of levels, hence of discrete variables, stays that of the
+    initial grid (the discrete_quality_levels configuration option, so a run can
+    start from a coarse grid), while the resolution follows the qualities the
+    solution actually uses. A warning is printed if the refinement stops before the
+    tolerance is met, e.g. because every level is used; the model then needs more
+    levels.
+
+    options are the solve_model() options used for every solve. The warmstart option
+    is set for the solves after the first one.
+
+    Returns the solver results of the last solve and a pandas DataFrame with one row
+    per solve, indexed by iteration, with columns: termination_condition, objective,
+    and for each water quality component, the width of its widest used bin in user
+    concentration units.
+    """
+    if model.config.water_quality is not WaterQuality.discrete:
+        raise Exception(
+            "Adaptive refinement requires the discrete water quality model "
+            "(water_quality configuration option WaterQuality.discrete)"
+        )
+    user_tolerance = tolerance
+    tolerance = pyunits.convert_value(
+        tolerance,
+        from_units=model.user_units["concentration"],
+        to_units=model.model_units["concentration"],
+    )
+
+    options = dict(options or {})
+    rows = []
+    for iteration in range(max_iterations):
+        results = solve_model(model, options=options)
+        termination = results.solver.termination_condition
+        row = {"iteration": iteration, "termination_condition": str(termination)}
+        if termination in _failed_termination_conditions:
+            rows.append(row)
+            break
+        objective = next(model.component_data_objects(Objective, active=True))
+        row["objective"] = value(objective)
+        widths = _discrete_quality_bin_widths(model)
+        for qc in model.s_QC:
+            row[qc] = pyunits.convert_value(
+                max(widths[qc].values(), default=0),
+                from_units=model.model_units["concentration"],
+                to_units=model.user_units["concentration"],
+            )
+        rows.append(row)
+        if iteration == max_iterations - 1 or not _refine_discrete_quality_levels(
+            model, widths, tolerance
+        ):
+            break
+        options["warmstart"] = True
+
+    coarse = [qc for qc in model.s_QC if rows[-1].get(qc, 0) > user_tolerance]
+    if coarse:
+        print(
+            f"WARNING: The discrete water quality tolerance is not met for {coarse} "
+            f"after {len(rows)} solves. Increase max_iterations, or the "
+            f"discrete_quality_levels configuration option "
+            f"({model.config.discrete_quality_levels}) if every level is used."
+        )
+
+    columns = ["termination_condition", "objective", *model.s_QC]
+    history = pd.DataFrame(rows).set_index("iteration").reindex(columns=columns)
+    return results, history
+
+
+def solve_aggregated_model(
+    df_sets, df_parameters, block_size, default={}, options=None, disaggregate=True
+):
+    """
+    Solve the strategic model with its time periods aggregated into blocks of
+    block_size consecutive periods (see aggregate_time_periods()), e.g., to screen
+    infrastructure build-out over long horizons.
+
+    With disaggregate, the build-out decisions of the aggregated solution (the
+    binary variables that are not indexed by time period, e.g., vb_y_Pipeline,
+    vb_y_Storage, vb_y_Disposal and vb_y_Treatment) are then fixed in the model for
+    the full horizon, which is solved for the operations over all time periods.
+
+    default is the create_model() configuration and options are the solve_model()
+    options used for both solves.
+
+    Returns the aggregated model, the full horizon model (None without disaggregate
+    or if the aggregated model has no solution) and the solver results of the last
+    solve.
+    """
+    aggregated_sets, aggregated_parameters, _ = aggregate_time_periods(
+        df_sets, df_parameters, block_size
+    )
+    aggregated_model = create_model(
+        aggregated_sets, aggregated_parameters, default=default
+    )
+    results = solve_model(aggregated_model, options=options)
+    if (
+        not disaggregate
+        or results.solver.termination_condition in _failed_termination_conditions
+    ):
+        return aggregated_model, None, results
+
+    model = create_model(dict(df_sets), dict(df_parameters), default=default)
+    for var in aggregated_model.component_objects(Var, descend_into=True):
+        if not var.is_indexed() or any(
+            s is aggregated_model.s_T for s in var.index_set().subsets()
+        ):
+            continue
+        full_var = model.find_component(var.name)
+        if full_var is None:
+            continue
+        for index, var_data in var.items():
+            if var_data.is_binary() and var_data.value is not None:
+                full_var[index].fix(round(var_data.value))
+    results = solve_model(model, options=options)
+    return aggregated_model, model, results
+
+
+def _time_period_position(index, positions):
+    """
+    Return the position in s_T of the time period in a component index, or None if
+    the index has no time period
+    """
+    if not isinstance(index, tuple):
+        index = (index,)
+    for i in index:
+        if i in positions:
+            return positions[i]
+    return None
+
+
+def _restrict_to_window(model, positions, end):
+    """
+    Fix the free time-indexed variables after the window ending at position end to
+    zero and deactivate the constraints of these time periods and the constraints in
+    which all variables are fixed. Returns the fixed variables and the deactivated
+    constraints, so that the window can be lifted again.
+    """
+    fixed_variables = []
+    for var in model.component_data_objects(Var, descend_into=True):
+        position = _time_period_position(var.index(), positions)
+        if not var.fixed and position is not None and position >= end:
+            var.fix(0)
+            fixed_variables.append(var)
+    deactivated = []
+    for con in model.component_data_objects(Constraint, active=True, descend_into=True):
+        position = _time_period_position(con.index(), positions)
+        if position is not None and position >= end:
+            con.deactivate()
+            deactivated.append(con)
+    deactivated += deactivate_fixed_constraints(model)
+    return fixed_variables, deactivated
+
+
+def _commit_time_periods(model, positions, start, end):
+    """
+    Fix the free variables of the time periods at positions start to end - 1 to
+    their values, with integer and binary variables rounded to the nearest integer
+    """
+    for var in model.component_data_objects(Var, descend_into=True):
+        position = _time_period_position(var.index(), positions)
+        if var.fixed or position is None or not start <= position < end:
+            continue
+        if var.value is None:
+            var.fix(0)
+        elif var.is_integer():
+            var.fix(round(var.value))
+        else:
+            var.fix()
+
+
+def _commit_build_out(model):
+    """
+    Fix the build-out binary variables that select a nonzero capacity (e.g., a
+    pipeline diameter or a disposal capacity increment) to one, and the capacity of
+    the built infrastructure to its value, so that later solves keep the build-out
+    """
+    binary_epsilon = 0.1
+    build_out = [
+        (
+            model.vb_y_Pipeline,
+            lambda i: model.p_delta_Pipeline[i[2]],
+            model.v_F_Capacity,
+            lambda i: (i[0], i[1]),
+        ),
+        (
+            model.vb_y_Storage,
+            lambda i: model.p_delta_Storage[i[1]],
+            model.v_X_Capacity,
+            lambda i: i[0],
+        ),
+        (
+            model.vb_y_Disposal,
+            lambda i: model.p_delta_Disposal[i],
+            model.v_D_Capacity,
+            lambda i: i[0],
+        ),
+        (
+            model.vb_y_Treatment,
+            lambda i: model.p_delta_Treatment[i[1], i[2]],
+            model.v_T_Capacity,
+            lambda i: i[0],
+        ),
+    ]
+    for binaries, delta, capacity, site in build_out:
+        for index, var in binaries.items():
+            if (
+                var.value is None
+                or var.value < 1 - binary_epsilon
+                or value(delta(index)) <= 0
+            ):
+                continue
+            var.fix(1)
+            if site(index) in capacity and capacity[site(index)].value is not None:
+                capacity[site(index)].fix()
+
+
+def solve_rolling_horizon(model, window, overlap=0, options=None):
+    """
+    Solve the strategic model over overlapping windows of window time periods, as an
+    alternative to solve_model() for long horizons.
+
+    Each window is solved with solve_model() with the time periods after the window
+    left out. The decisions of its first window - overlap time periods (of all time
+    periods for the last window) are then committed, i.e., fixed, so that the
+    storage levels (v_L_Storage, v_L_PadStorage) at the end of the committed time
+    periods are the initial conditions of the next window. The infrastructure built
+    in a window is committed as well: its build-out binary variables (vb_y_Pipeline,
+    vb_y_Storage, vb_y_Disposal and vb_y_Treatment) and capacities (v_F_Capacity,
+    v_X_Capacity, v_D_Capacity and v_T_Capacity) are fixed, so that later windows
+    can only add infrastructure where none was built. The last window thus gives
+    the objective of the full horizon. Post-process water quality is only
+    calculated after the last window.
+
+    Returns the solver results of the last solved window and a DataFrame with one
+    row per window, indexed by window, with columns: first_period, last_period,
+    termination_condition, objective and run_time. The solve stops at the first
+    window without a solution.
+    """
+    if not isinstance(window, int) or window < 1:
+        raise Exception("window must be a positive integer")
+    if not isinstance(overlap, int) or not 0 <= overlap < window:
+        raise Exception("overlap must be a non-negative integer smaller than window")
+
+    periods = list(model.s_T)
+    positions = {t: n for n, t in enumerate(periods)}
+    water_quality = model.config.water_quality
+    rows = []
+    start = 0
+    while True:
+        end = min(start + window, len(periods))
+        last_window = end == len(periods)
+        row = {
+            "window": len(rows) + 1,
+            "first_period": periods[start],
+            "last_period": periods[end - 1],
+        }
+        fixed_variables, deactivated = _restrict_to_window(model, positions, end)
+        run_start = time.perf_counter()
+        # Post-process water quality only once, for the full horizon
+        if water_quality is WaterQuality.post_process and not last_window:
+            model.config.water_quality = WaterQuality.false
+        try:
+            results = solve_model(model, options=options)
+        finally:
+            model.config.water_quality = water_quality
+        row["run_time"] = time.perf_counter() - run_start
+        unfix_variables(fixed_variables)
+        for con in deactivated:
+            con.activate()
+
+        termination = results.solver.termination_condition
+        row["termination_condition"] = str(termination)
+        if termination not in _failed_termination_conditions:
+            objective = next(model.component_data_objects(Objective, active=True))
+            row["objective"] = value(objective, exception=False)
+        rows.append(row)
+        if last_window or termination in _failed_termination_conditions:
+            break
+
+        # Commit the time periods before the overlap with the next window and the
+        # infrastructure built so far
+        _commit_time_periods(model, positions, start, end - overlap)
+        _commit_build_out(model)
+        start = end - overlap
+
+    history = pd.DataFrame(
+        rows,
+        columns=[
+            "window",
+            "first_period",
+            "last_period",
+            "termination_condition",
+            "objective",
+            "run_time",
+        ],
+    ).set_index("window")
+    return results, history
+
+
+def compare_rolling_horizon(
+    df_sets, df_parameters, window, overlap=0, default={}, options=None
+):
+    """
+    Solve the strategic model once with solve_model() and once with
+    solve_rolling_horizon(), to compare the objective and run time of the rolling
+    horizon solve against the monolithic solve.
+
+    default is the create_model() configuration and options are the solve_model()
+    options used for both solves.
+
+    Returns a DataFrame indexed by "monolithic" and "rolling_horizon", with columns:
+    termination_condition, objective and run_time, followed by the monolithic and
+    the rolling horizon models.
+    """
+    rows = {}
+    models = []
+    for method in ["monolithic", "rolling_horizon"]:
+        model = create_model(dict(df_sets), dict(df_parameters), default=default)
+        start = time.perf_counter()
+        if method == "monolithic":
+            results = solve_model(model, options=options)
+        else:
+            results, _ = solve_rolling_horizon(model, window, overlap, options)
+        row = {"run_time": time.perf_counter() - start}
+        termination = results.solver.termination_condition
+        row["termination_condition"] = str(termination)
+        if termination not in _failed_termination_conditions:
+            objective = next(model.component_data_objects(Objective, active=True))
+            row["objective"] = value(objective, exception=False)
+        rows[method] = row
+        models.append(model)
+
+    comparison = pd.DataFrame.from_dict(rows, orient="index")
+    comparison = comparison.reindex(
+        columns=["termination_condition", "objective", "run_time"]
+    )
+    return comparison, models[0], models[1]
@@ -70,9 +70,11 @@ class TestCMqcpModel:
         status = opt.solve(model, tee=False)
         pyo.assert_optimal_termination(status)
 
-    def test_report_generation(self):
+    def test_report_generation(self, tmp_path):
         model = self.build_cm_qcp_model()
-        report_results_to_excel(model, "cm_testfile.xlsx", split_var={"s_A": 3})
+        report_results_to_excel(
+            model, str(tmp_path / "cm_testfile.xlsx"), split_var={"s_A": 3}
+        )
 
 
 class TestAddFeatures:
@@ -11,9 +11,24 @@
 # publicly and display publicly, and to permit others to do so.
 #####################################################################################################
 from importlib import resources
+import time
+
+import numpy as np
+import pandas as pd
 import pytest
 
-from pareto.utilities.get_data import get_data
+import pareto.utilities.get_data as get_data_module
+from pareto.utilities.get_data import (
+    get_data,
+    get_valid_input_set_tab_names,
+    get_valid_input_parameter_tab_names,
+    export_input_tables,
+    _sheets_to_dfs,
+    _clean_parameter_df,
+    _table_to_param,
+    _set_sheet_kwargs,
+    _parameter_sheet_kwargs,
+)
 
 
 @pytest.mark.parametrize(
@@ -36,3 +51,169 @@ def test_case_studies(file_name: str):
         # changing to raises=True will cause the test to fail on data loading failures
         data = get_data(fpath, model_type=model_type, raises=False)
     assert data is not None
+
+
+@pytest.mark.unit
+def test_sheets_parsed_once_match_read_excel():
+    with resources.path(
+        "pareto.case_studies", "strategic_toy_case_study.xlsx"
+    ) as fpath:
+        set_tabs = get_valid_input_set_tab_names("strategic")
+        parameter_tabs = get_valid_input_parameter_tab_names("strategic")
+        with pytest.warns(UserWarning):
+            [sets, parameters] = _sheets_to_dfs(
+                fpath, set_tabs, parameter_tabs, raises=False
+            )
+
+        workbook = pd.ExcelFile(fpath)
+        assert set(sets) == set(workbook.sheet_names) & set(set_tabs)
+        assert set(parameters) == set(workbook.sheet_names) & set(parameter_tabs)
+        for name, df in sets.items():
+            expected = pd.read_excel(
+                workbook, sheet_name=name, **_set_sheet_kwargs
+            ).squeeze("columns")
+            pd.testing.assert_series_equal(df, expected)
+        for name, df in parameters.items():
+            try:
+                expected = pd.read_excel(
+                    workbook, sheet_name=name, **_parameter_sheet_kwargs
+                ).squeeze("columns")
+            except ValueError:
+                # Tabs holding only a description row fall back to an empty frame
+                expected = pd.DataFrame()
+            pd.testing.assert_frame_equal(df, expected)
+
+
+def _assert_same_data(data, expected_data):
+    [df_sets, df_parameters] = data
+    [expected_sets, expected_parameters] = expected_data
+    assert df_sets.keys() == expected_sets.keys()
+    for name, expected_set in expected_sets.items():
+        assert list(df_sets[name]) == list(expected_set)
+    assert df_parameters.keys() == expected_parameters.keys()
+    for name, expected_param in expected_parameters.items():
+        assert df_parameters[name].keys() == expected_param.keys()
+        for idx, val in expected_param.items():
+            assert df_parameters[name][idx] == val or (
+                pd.isna(val) and pd.isna(df_parameters[name][idx])
+            )
+
+
+@pytest.mark.unit
+def test_get_data_cache(tmp_path, monkeypatch):
+    with resources.path(
+        "pareto.case_studies", "strategic_toy_case_study.xlsx"
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath, cache_dir=tmp_path)
+        assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+        # A cache hit must not read the workbook again
+        def fail(*args, **kwargs):
+            raise AssertionError("workbook was parsed despite a valid cache file")
+
+        monkeypatch.setattr(get_data_module, "_read_data", fail)
+        cached_data = get_data(fpath, cache_dir=tmp_path)
+        _assert_same_data(cached_data, [df_sets, df_parameters])
+
+        # Changing an argument that affects the processed data invalidates the cache
+        monkeypatch.undo()
+        get_data(fpath, cache_dir=tmp_path, sum_repeated_indexes=True)
+        assert len(list(tmp_path.glob("*.pkl"))) == 2
+
+        # File-like objects are read without the cache
+        with open(fpath, "rb") as f:
+            file_data = get_data(f, cache_dir=tmp_path)
+        _assert_same_data(file_data, [df_sets, df_parameters])
+        assert len(list(tmp_path.glob("*.pkl"))) == 2
+
+
+@pytest.mark.unit
+def test_clean_parameter_df():
+    df = pd.DataFrame(
+        {
+            "Nodes": ["N01", " N02\n", "", "N03"],
+            "T01": [1, "PROPRIETARY DATA", "", 2.5],
+            "T02": [3, 4, "", "5\\t"],
+            "Unnamed: 3": ["", "", "", "x"],
+        }
+    )
+    [df, proprietary_data] = _clean_parameter_df(df)
+    assert proprietary_data
+    assert list(df.columns) == ["Nodes", "T01", "T02"]
+    assert df["Nodes"].tolist() == ["N01", "N02", "N03"]
+    assert df["T01"].tolist() == [1, "", 2.5]
+    assert df["T02"].tolist() == [3, 4, "5"]
+
+    [_, proprietary_data] = _clean_parameter_df(pd.DataFrame({"T01": [1.0, 2.0]}))
+    assert not proprietary_data
+
+
+@pytest.mark.unit
+def test_table_to_param():
+    df = pd.DataFrame(
+        {"T01": [1, np.nan, 3], "T02": [4.5, 5, np.nan]},
+        index=pd.MultiIndex.from_tuples([("A", "X"), ("B", "Y"), ("C", "Z")]),
+    )
+    assert _table_to_param(df) == df.stack().to_dict()
+    df = df.reset_index(level=1, drop=True)
+    assert _table_to_param(df) == df.stack().to_dict()
+
+
+@pytest.mark.integration
+def test_clean_large_matrix_tab():
+    """
+    Cleaning and conversion benchmark on a generated 2000x2000 distance matrix tab,
+    a third of which is empty. Run with `pytest -s` to see the timings.
+    """
+    size = 2000
+    rng = np.random.default_rng(0)
+    nodes = [f"N{i:04d}" for i in range(size)]
+    values = rng.random((size, size)).round(3).astype(object)
+    values[rng.random((size, size)) < 1 / 3] = ""
+    df = pd.DataFrame(values, columns=nodes)
+    df.insert(0, "Nodes", nodes)
+
+    start = time.perf_counter()
+    [df, _] = _clean_parameter_df(df)
+    df = df.set_index("Nodes").replace("", np.nan)
+    clean_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    param = _table_to_param(df)
+    convert_time = time.perf_counter() - start
+    print(
+        f"2000x2000 matrix tab: cleaning {clean_time:.2f} s, "
+        f"conversion {convert_time:.2f} s"
+    )
+
+    assert len(param) == df.notna().to_numpy().sum()
+    assert all(isinstance(val, float) for val in list(param.values())[:100])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_get_data_from_table_directory(tmp_path, file_format):
+    if file_format == "parquet":
+        pytest.importorskip("pyarrow")
+    with resources.path(
+        "pareto.case_studies", "strategic_toy_case_study.xlsx"
+    ) as fpath:
+        output_files = export_input_tables(fpath, tmp_path, file_format=file_format)
+        assert all(f.suffix == f".{file_format}" for f in output_files)
+        assert "CompletionsDemand" in [f.stem for f in output_files]
+
+        expected_data = get_data(fpath)
+        data = get_data(tmp_path)
+    _assert_same_data(data, expected_data)
+
+
+@pytest.mark.unit
+def test_get_data_csv_text_indices(tmp_path):
+    # Set elements and indices that look like numbers are kept as text, only the
+    # parameter values are converted to numbers
+    (tmp_path / "ProductionPads.csv").write_text("ProductionPads\n0012\n1e3\n")
+    (tmp_path / "PadRates.csv").write_text("ProductionPads,T01\n0012,5\nPP01,\n")
+    [df_sets, df_parameters] = get_data(tmp_path)
+    assert df_sets["ProductionPads"].tolist() == ["0012", "1e3"]
+    assert df_parameters["PadRates"] == {("0012", "T01"): 5}
+    assert isinstance(df_parameters["PadRates"]["0012", "T01"], int)
@@ -10,5 +10,66 @@
 # the Software to reproduce, distribute copies to the public, prepare derivative works, and perform
 # publicly and display publicly, and to permit others to do so.
 #####################################################################################################
+import subprocess
+import sys
+
+import pytest
+
+
 def test_import_main_package():
     import pareto
+
+
+# Optional dependencies that are slow to import and only needed by some functions.
+# They are imported when these functions are called.
+LAZY_DEPENDENCIES = (
+    "idaes",
+    "keras",
+    "matplotlib",
+    "networkx",
+    "plotly",
+    "scipy",
+    "tensorflow",
+    "watertap",
+)
+
+
+def _import_times(module):
+    """
+    Import a module in a new Python process with -X importtime and return the
+    cumulative import time [us] of each module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:"):
+            _, cumulative, name = line[len("import time:") :].split("|")
+            # Skip the header line
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "module",
+    [
+        "pareto.utilities.get_data",
+        "pareto.utilities.results",
+        "pareto.utilities.solvers",
+        "pareto.strategic_water_management.strategic_produced_water_optimization",
+        "pareto.operational_water_management.operational_produced_water_optimization_model",
+    ],
+)
+def test_import_time(module, record_property):
+    times = _import_times(module)
+    # The import time is recorded in the test report to track it over time
+    record_property("import_time_us", times[module])
+    assert not [
+        name for name in times if name.split(".")[0] in LAZY_DEPENDENCIES
+    ], f"{module} imports optional dependencies at import time"
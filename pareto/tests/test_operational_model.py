@@ -203,7 +203,9 @@ def test_run_operational_model_ProdTank_individual(build_operational_model):
 
 
 @pytest.mark.component
-def test_operational_model_discrete_water_quality_build(build_operational_model):
+def test_operational_model_discrete_water_quality_build(
+    build_operational_model, tmp_path
+):
     m = build_operational_model(
         config_dict={
             "has_pipeline_constraints": True,
@@ -247,7 +249,7 @@ def test_operational_model_discrete_water_quality_build(build_operational_model)
     generate_report(
         m,
         is_print=PrintValues.essential,
-        fname="operational_results_test.xlsx",
+        fname=str(tmp_path / "operational_results_test.xlsx"),
     )
 
 
@@ -15,6 +15,13 @@ from pareto.utilities.get_data import get_data
 from importlib import resources
 import pytest
 
+
+@pytest.fixture(autouse=True)
+def _output_dir(tmp_path, monkeypatch):
+    # The plot functions write output_file relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
 headers_test = {}
 source = []
 destination = []
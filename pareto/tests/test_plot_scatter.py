@@ -16,6 +16,12 @@ from importlib import resources
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def _output_dir(tmp_path, monkeypatch):
+    # The plot functions write output_file relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
 @pytest.fixture(scope="module")
 def input_data_animated_1():
     set_list = []
@@ -14,7 +14,17 @@ import pyomo.environ as pyo
 
 import pytest
 
-from pareto.utilities.solvers import get_solver, SolverError
+from pareto.cli import main
+from pareto.utilities import solvers
+from pareto.utilities.solvers import (
+    check_solvers,
+    clear_solver_cache,
+    get_solver,
+    is_persistent,
+    set_timeout,
+    NoAvailableSolver,
+    SolverError,
+)
 from pareto.utilities.testing import does_not_raise, get_readable_param
 
 
@@ -119,3 +129,84 @@ class TestMultipleSolverChoices:
         with expectation:
             # using the name to compare since different solver objects for the same name are not considered equal
             assert get_solver(*names).name == self._VALID_NAME
+
+
+class TestPersistentSolver:
+    @pytest.fixture(scope="class")
+    def persistent_solver(self):
+        pytest.importorskip("highspy", reason="HiGHS is not installed")
+        return get_solver("appsi_highs")
+
+    def test_is_persistent(self, persistent_solver):
+        assert is_persistent(persistent_solver)
+        assert not is_persistent(get_solver("cbc"))
+
+    def test_set_timeout(self, persistent_solver):
+        set_timeout(persistent_solver, timeout_s=10)
+        assert persistent_solver.config.time_limit == 10
+        assert persistent_solver.highs_options["time_limit"] == 10
+
+    def test_changes_are_pushed_to_solver(self, persistent_solver):
+        m, x = milp()
+        persistent_solver.solve(m)
+        assert pytest.approx(x) == pyo.value(m.x)
+        # Changes made after the first solve are applied without rebuilding the
+        # solver model
+        m.x.setlb(3)
+        persistent_solver.solve(m)
+        assert pytest.approx(3) == pyo.value(m.x)
+        m.x.setlb(None)
+        m.obj.deactivate()
+        m.obj_max = pyo.Objective(expr=m.x + m.y, sense=pyo.maximize)
+        persistent_solver.solve(m)
+        assert pytest.approx(5) == pyo.value(m.x)
+
+
+class TestSolverCache:
+    def test_check_is_cached(self, monkeypatch):
+        # Do not fall back to the IDAES-EXT solvers, which would check again
+        monkeypatch.setattr(solvers, "_idaes_ext_solvers_enabled", True)
+        clear_solver_cache()
+        assert get_solver("cbc").name == "cbc"
+        assert solvers._solver_checks["cbc"][0]
+        # The result of the previous check is used until it is refreshed
+        monkeypatch.setitem(solvers._solver_checks, "cbc", (False, 0.0))
+        with pytest.raises(NoAvailableSolver):
+            get_solver("cbc")
+        assert get_solver("cbc", refresh=True).name == "cbc"
+
+    def test_idaes_ext_solvers_first(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("IDAES_DATA", str(tmp_path))
+        assert not solvers._idaes_ext_solvers_installed()
+        # A bin directory without executables, e.g. only with checksum files
+        (tmp_path / "bin").mkdir()
+        (tmp_path / "bin" / "sha256sum.txt").write_text("")
+        assert not solvers._idaes_ext_solvers_installed()
+        executable = tmp_path / "bin" / "cbc"
+        executable.write_text("")
+        executable.chmod(0o755)
+        assert solvers._idaes_ext_solvers_installed()
+        # IDAES is then enabled before looking for the solvers on the PATH
+        enabled = []
+        monkeypatch.setattr(solvers, "_idaes_ext_solvers_enabled", False)
+        monkeypatch.setattr(
+            solvers, "_enable_idaes_ext_solvers", lambda: enabled.append(True)
+        )
+        monkeypatch.setattr(solvers, "_first_available_solver", lambda *a, **k: None)
+        with pytest.raises(NoAvailableSolver):
+            get_solver("cbc")
+        assert enabled
+
+    def test_check_solvers(self):
+        checks = check_solvers(["cbc", "bogus"])
+        assert [check["solver"] for check in checks] == ["cbc", "bogus"]
+        assert [check["available"] for check in checks] == [True, False]
+        assert all(check["check_time"] >= 0 for check in checks)
+
+    def test_solvers_command(self, capsys):
+        assert main(["solvers", "cbc", "bogus"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[-2].split()[:2] == ["cbc", "yes"]
+        assert lines[-1].split()[:2] == ["bogus", "no"]
+        # The command fails if none of the solvers is available
+        assert main(["solvers", "bogus"]) == 1
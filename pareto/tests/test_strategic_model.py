@@ -16,20 +16,43 @@ Test strategic model
 
 # Import Pyomo libraries
 import pyomo.environ as pyo
+from pyomo.opt import SolverResults
 from pyomo.util.check_units import assert_units_consistent
 from pyomo.core.base import value
 from pyomo.environ import Constraint, Expression
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.repn import generate_standard_repn
 
 # Import IDAES solvers
-from pareto.utilities.solvers import get_solver
+from pareto.utilities.solvers import get_solver, is_persistent
 from pareto.strategic_water_management.strategic_produced_water_optimization import (
     create_model,
     solve_model,
     scale_model,
+    scaled_in_place,
+    set_automatic_scaling_factors,
     pipeline_hydraulics,
+    propagate_pressures,
     infrastructure_timing,
     set_objective,
     water_quality_discrete,
+    run_scenarios,
+    update_parameters,
+    pareto_front,
+    refine_discrete_water_quality,
+    solve_aggregated_model,
+    solve_rolling_horizon,
+    solve_water_quality_linear_system,
+    water_quality,
+    compare_rolling_horizon,
+    _restrict_to_window,
+    _commit_time_periods,
+    _commit_build_out,
+    _discrete_quality_bin_widths,
+    _refine_discrete_quality_levels,
+    _pressure_propagation_order,
+    _solve,
+    _post_processed_snapshot,
 )
 from pareto.utilities.enums import (
     WaterQuality,
@@ -53,15 +76,26 @@ from pareto.utilities.units_support import (
     flatten_list,
     PintUnitExtractionVisitor,
 )
+from pareto.utilities.process_data import aggregate_time_periods, presolve_network
+from pareto.utilities.model_modifications import unfix_variables
 from importlib import resources
 import pytest
+import math
+import time
+import pandas as pd
 from idaes.core.util.model_statistics import degrees_of_freedom
 from pareto.utilities.results import (
     generate_report,
+    initialize_from_solution,
+    save_solution,
+    load_solution,
+    diff_solutions,
     PrintValues,
     OutputUnits,
+    ReportFormat,
     is_feasible,
     nostdout,
+    _convert_values,
 )
 
 __author__ = "Pareto Team (Andres Calderon, M. Zamarripa)"
@@ -103,7 +137,7 @@ def test_basic_build_capex_distance_based_capacity_input(build_strategic_model):
     )
     assert degrees_of_freedom(m) == 27937
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -126,7 +160,7 @@ def test_basic_build_capex_distance_based_capacity_calculated(build_strategic_mo
     )
     assert degrees_of_freedom(m) == 27937
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -149,7 +183,7 @@ def test_basic_build_capex_capacity_based_capacity_input(build_strategic_model):
     )
     assert degrees_of_freedom(m) == 27937
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -172,7 +206,7 @@ def test_basic_build_capex_capacity_based_capacity_calculated(build_strategic_mo
     )
     assert degrees_of_freedom(m) == 27937
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -260,7 +294,7 @@ def test_strategic_model_build_units_scaled_units_consistency(
 
 # if solver cbc exists @solver
 @pytest.mark.component
-def test_run_strategic_model(build_strategic_model):
+def test_run_strategic_model(build_strategic_model, tmp_path):
     m = build_strategic_model(
         config_dict={
             "objective": Objectives.cost,
@@ -280,7 +314,7 @@ def test_run_strategic_model(build_strategic_model):
         results,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
@@ -525,6 +559,60 @@ def test_hydraulics_configurations(
         assert "Objective not supported" in str(excinfo.value)
 
 
+@pytest.mark.unit
+def test_pressure_propagation_order():
+    arcs = [("N01", "N02"), ("N02", "N01"), ("PP01", "N01"), ("N02", "K01")]
+    order = _pressure_propagation_order(arcs, ["PP01"])
+    # Each location is reached once, from a location with a known pressure
+    assert [arcs[position] for position in order] == [
+        ("PP01", "N01"),
+        ("N01", "N02"),
+        ("N02", "K01"),
+    ]
+    assert _pressure_propagation_order(arcs, ["K01"]) == []
+
+
+@pytest.mark.unit
+def test_hydraulics_propagate_pressures(build_workshop_strategic_model):
+    m = build_workshop_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.capacity_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "hydraulics": Hydraulics.co_optimize_linearized,
+            "water_quality": WaterQuality.false,
+        }
+    )
+    mh = pipeline_hydraulics(m)
+    mh.v_F_Piped["PP01", "N01", "T01"].value = 100
+    mh.hydraulics.v_HW_loss["PP01", "N01", "T01"].value = 20
+    mh.hydraulics.v_PumpHead["PP01", "N01", "T01"].value = 50
+
+    pressures, violations = propagate_pressures(mh)
+
+    # The pressure changes as in the pressure constraints of the hydraulics block
+    rhog = pyo.value(mh.hydraulics.p_rhog)
+    elevation_change = pyo.value(mh.p_zeta_Elevation["PP01"]) - pyo.value(
+        mh.p_zeta_Elevation["N01"]
+    )
+    assert pressures.loc["N01", "T01"] == pytest.approx(
+        pyo.value(mh.hydraulics.v_Pressure["PP01", "T01"])
+        + rhog * (elevation_change - 20 + 50)
+    )
+    # Without flow, the pressure only changes with the elevation
+    assert pressures.loc["N01", "T02"] == pytest.approx(
+        pyo.value(mh.hydraulics.v_Pressure["PP01", "T02"]) + rhog * elevation_change
+    )
+    assert list(violations.columns) == ["location", "time", "pressure", "violation"]
+    for _, row in violations.iterrows():
+        assert row["location"] in mh.s_N
+        assert pressures.loc[row["location"], row["time"]] == row["pressure"]
+        if row["violation"] == "maximum":
+            assert row["pressure"] > pyo.value(mh.hydraulics.p_xi_Max_AOP)
+        else:
+            assert row["pressure"] < 0
+
+
 # if solver cbc exists @solver
 @pytest.mark.component
 def test_run_hydraulics_co_optimize_linearized_reduced_strategic_model(
@@ -554,6 +642,11 @@ def test_run_hydraulics_co_optimize_linearized_reduced_strategic_model(
 
     assert results.solver.termination_condition == pyo.TerminationCondition.optimal
     assert results.solver.status == pyo.SolverStatus.ok
+    # The pressure check is stored on the model and the results can still be written
+    assert isinstance(m.hydraulics.pressures, pd.DataFrame)
+    assert isinstance(m.hydraulics.pressure_violations, pd.DataFrame)
+    with nostdout():
+        results.write()
 
 
 @pytest.mark.unit
@@ -571,7 +664,7 @@ def test_basic_reduced_build_capex_capacity_based_capacity_calculated(
     )
     assert degrees_of_freedom(m) == 12583
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -595,7 +688,7 @@ def test_basic_reduced_build_capex_capacity_based_capacity_input(
     )
     assert degrees_of_freedom(m) == 12583
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -619,7 +712,7 @@ def test_basic_reduced_build_capex_distance_based_capacity_input(
     )
     assert degrees_of_freedom(m) == 12583
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -628,6 +721,118 @@ def test_basic_reduced_build_capex_distance_based_capacity_input(
     assert isinstance(m.PipelineExpansionCapEx, pyo.Constraint)
 
 
+@pytest.mark.unit
+def test_basic_reduced_build_sparse_arcs(build_reduced_strategic_model):
+    """Make a model with sparse arc indexing and compare it to the dense model"""
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.false,
+    }
+    m_dense = build_reduced_strategic_model(config_dict=config_dict)
+    m = build_reduced_strategic_model(config_dict={**config_dict, "sparse_arcs": True})
+    assert degrees_of_freedom(m) == degrees_of_freedom(m_dense) == 12583
+    assert len(m.config) == 13
+    assert m.config.sparse_arcs
+    # Arc variables only exist for valid arcs
+    assert len(m.v_C_Piped) == len(m.s_LLA) * len(m.s_T)
+    assert len(m.vb_y_Flow) == len(m.s_LLA) * len(m.s_T)
+    assert len(m.v_C_Trucked) == len(m.s_LLT) * len(m.s_T)
+    assert len(m.v_F_Capacity) == len(m.s_LLA)
+    assert len(m.v_S_PipelineCapacity) == len(m.s_LLA)
+    assert len(m.v_C_Piped) < len(m_dense.v_C_Piped)
+    # Arc constraints are built for the same indexes as in the dense model
+    for name in [
+        "BidirectionalFlow1",
+        "BidirectionalFlow2",
+        "PipelineCapacityExpansion",
+        "PipelineCapacity",
+        "PipingCost",
+        "TruckingCost",
+    ]:
+        assert set(getattr(m, name).keys()) == set(getattr(m_dense, name).keys())
+
+
+@pytest.mark.unit
+def test_basic_reduced_build_arc_adjacency(build_reduced_strategic_model):
+    """Make sure the adjacency sets match the valid piping and trucking arcs"""
+    m = build_reduced_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.false,
+        }
+    )
+    for l in m.s_L:
+        assert list(m.s_PipingIn[l]) == [k for k in m.s_L if (k, l) in m.s_LLA]
+        assert list(m.s_PipingOut[l]) == [k for k in m.s_L if (l, k) in m.s_LLA]
+        assert list(m.s_TruckingIn[l]) == [k for k in m.s_L if (k, l) in m.s_LLT]
+        assert list(m.s_TruckingOut[l]) == [k for k in m.s_L if (l, k) in m.s_LLT]
+    assert sum(len(m.s_PipingIn[l]) for l in m.s_L) == len(m.s_LLA)
+    assert sum(len(m.s_TruckingOut[l]) for l in m.s_L) == len(m.s_LLT)
+
+
+@pytest.mark.integration
+def test_build_synthetic_500_node_network():
+    """
+    Build time benchmark: extend the small case study to 500 network nodes
+    connected by a bidirectional pipeline chain, and check that the balances built
+    from the adjacency sets match those of a scan of all locations. Run with
+    `pytest -s` to see the build time.
+    """
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_small_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    existing_nodes = list(df_sets["NetworkNodes"])
+    new_nodes = [f"SN{i:03d}" for i in range(1, 501 - len(existing_nodes))]
+    df_sets["NetworkNodes"] = pd.Series(existing_nodes + new_nodes)
+    chain = [existing_nodes[0]] + new_nodes
+    for n, n_tilde in zip(chain[:-1], chain[1:]):
+        df_parameters["NNA"][(n, n_tilde)] = 1
+        df_parameters["NNA"][(n_tilde, n)] = 1
+
+    start = time.perf_counter()
+    m = create_model(
+        df_sets,
+        df_parameters,
+        default={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "node_capacity": True,
+            "water_quality": WaterQuality.false,
+            "sparse_arcs": True,
+        },
+    )
+    build_time = time.perf_counter() - start
+    print(f"Synthetic 500-node network build time: {build_time:.1f} s")
+
+    assert len(m.s_N) == 500
+    assert list(m.s_PipingOut[new_nodes[-1]]) == [new_nodes[-2]]
+    assert sum(len(m.s_PipingIn[l]) for l in m.s_L) == len(m.s_LLA)
+    assert len(m.NetworkBalance) == len(m.s_N) * len(m.s_T)
+
+    # The balances are the same as when they were built by scanning all locations
+    # for valid arcs
+    def _linear_terms(expr):
+        repn = generate_standard_repn(expr, compute_values=True)
+        return [
+            (var.name, coef) for var, coef in zip(repn.linear_vars, repn.linear_coefs)
+        ], repn.constant
+
+    for t in [m.s_T.first(), m.s_T.last()]:
+        for n in [existing_nodes[0], new_nodes[0], new_nodes[-1]]:
+            scan = sum(m.v_F_Piped[l, n, t] for l in m.s_L if (l, n) in m.s_LLA) - sum(
+                m.v_F_Piped[n, l, t] for l in m.s_L if (n, l) in m.s_LLA
+            )
+            assert _linear_terms(m.NetworkBalance[n, t].body) == _linear_terms(scan)
+
+
 @pytest.mark.unit
 def test_basic_reduced_build_discrete_water_quality_input(
     build_reduced_strategic_model,
@@ -643,7 +848,7 @@ def test_basic_reduced_build_discrete_water_quality_input(
     )
     assert degrees_of_freedom(m) == 103063
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -737,6 +942,19 @@ def test_discrete_water_quality_configurations(
         assert "Objective not supported" in str(excinfo.value)
 
 
+@pytest.mark.unit
+def test_solve_persistent_warmstart(monkeypatch):
+    # Persistent solvers only load the current values as a MIP start with warmstart,
+    # and the keyword is only passed when it is set
+    opt = pyo.SolverFactory("appsi_highs")
+    calls = []
+    monkeypatch.setattr(opt, "solve", lambda model, **kwargs: calls.append(kwargs))
+    _solve(None, opt, warmstart=True)
+    _solve(None, opt, warmstart=False)
+    assert calls[0]["warmstart"] is True
+    assert "warmstart" not in calls[1]
+
+
 @pytest.mark.component
 def test_strategic_model_scaling(build_reduced_strategic_model):
     m = build_reduced_strategic_model(
@@ -806,6 +1024,168 @@ def test_strategic_model_scaling_with_surrogate(
     scale_model(m, scaling_factor=100000)
 
 
+@pytest.mark.component
+def test_strategic_model_scaled_in_place(build_reduced_strategic_model):
+    """
+    Scaling in place gives the same scaled constraints as the scaled copy of the
+    model, and the model is restored on exit
+    """
+    m = build_reduced_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.capacity_based,
+            "pipeline_capacity": PipelineCapacity.input,
+        }
+    )
+    for var in m.component_data_objects(pyo.Var):
+        var.set_value(1, skip_validation=True)
+    m.v_S_Production.fix(0)
+    piped = next(iter(m.v_F_Piped.values()))
+    slack = next(iter(m.v_S_Production.values()))
+    constraints = list(m.component_data_objects(pyo.Constraint, active=True))
+    expressions = [c.expr for c in constraints]
+
+    scaled_m = scale_model(m, scaling_factor=100000)
+    with scaled_in_place(m, scaling_factor=100000):
+        assert pyo.value(piped) == pytest.approx(1e-5)
+        assert slack.fixed
+        for c in constraints:
+            scaled_c = scaled_m.component("scaled_" + c.parent_component().local_name)[
+                c.index()
+            ]
+            assert pyo.value(c.body) == pytest.approx(pyo.value(scaled_c.body))
+            if c.has_ub():
+                assert pyo.value(c.upper) == pytest.approx(pyo.value(scaled_c.upper))
+        m.v_S_Production.unfix()
+        piped.setub(5)
+
+    assert all(c.expr is expr for c, expr in zip(constraints, expressions))
+    assert pyo.value(piped) == pytest.approx(1)
+    assert piped.ub is None
+    assert slack.fixed
+
+
+@pytest.mark.component
+def test_run_toy_strategic_model_scaled_in_place(build_toy_strategic_model):
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.false,
+    }
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": True,
+        "scaling_factor": 1000,
+        "running_time": 600,
+        "gap": 0,
+    }
+    m = build_toy_strategic_model(config_dict=config_dict)
+    solve_model(model=m, options=options)
+    m_in_place = build_toy_strategic_model(config_dict=config_dict)
+    results = solve_model(model=m_in_place, options={**options, "scale_in_place": True})
+
+    assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+    assert pytest.approx(pyo.value(m.v_Z), abs=1e-1) == pyo.value(m_in_place.v_Z)
+    with nostdout():
+        assert is_feasible(m_in_place)
+
+
+@pytest.mark.component
+def test_strategic_model_automatic_scaling(build_reduced_strategic_model):
+    m = build_reduced_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.capacity_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.discrete,
+            "subsurface_risk": SubsurfaceRisk.calculate_risk_metrics,
+        }
+    )
+    report = set_automatic_scaling_factors(m)
+
+    low_before, high_before = report["coefficient_range_before"]
+    low_after, high_after = report["coefficient_range_after"]
+    assert high_after / low_after < high_before / low_before
+    # Every active constraint, including the subsurface risk and discrete water
+    # quality constraints, and every variable in them has a scaling factor. The
+    # factors are set for whole Var and Constraint components
+    for c in m.component_data_objects(pyo.Constraint, active=True):
+        assert c.parent_component() in m.scaling_factor
+        for v in identify_variables(c.body, include_fixed=False):
+            assert v.parent_component() in m.scaling_factor
+            if not v.is_continuous():
+                assert m.scaling_factor[v.parent_component()] == 1
+    assert m.scaling_factor[m.subsurface.site_constraint] > 0
+
+    # The factors are used by scale_model()
+    scale_model(m, scaling_factor="auto")
+
+
+@pytest.mark.component
+def test_run_toy_strategic_model_automatic_scaling(build_toy_strategic_model):
+    m = build_toy_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.false,
+            "infrastructure_timing": InfrastructureTiming.true,
+        }
+    )
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": True,
+        "scaling_factor": "auto",
+        "scale_in_place": True,
+        "running_time": 600,
+        "gap": 0,
+    }
+    results = solve_model(model=m, options=options)
+
+    assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+    assert pytest.approx(6122.5178, abs=1e-1) == pyo.value(m.v_Z)
+
+
+@pytest.mark.integration
+def test_scaling_memory_benchmark(build_reduced_strategic_model):
+    """
+    Peak memory and time of scaling a copy of the model vs scaling it in place. Run
+    with `pytest -s` to see the measurements.
+    """
+    import tracemalloc
+
+    m = build_reduced_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.capacity_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.discrete,
+        }
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    scaled_m = scale_model(m)
+    copy_time = time.perf_counter() - start
+    copy_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del scaled_m
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with scaled_in_place(m):
+        in_place_time = time.perf_counter() - start
+        in_place_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(
+        f"Scaled copy: {copy_time:.1f} s, {copy_peak / 2**20:.0f} MiB; "
+        f"in place: {in_place_time:.1f} s, {in_place_peak / 2**20:.0f} MiB"
+    )
+    assert in_place_peak < copy_peak
+
+
 # if solver cbc exists @solver
 @pytest.mark.component
 def test_run_reduced_strategic_model(build_reduced_strategic_model):
@@ -836,9 +1216,38 @@ def test_run_reduced_strategic_model(build_reduced_strategic_model):
         assert is_feasible(m)
 
 
+@pytest.mark.component
+def test_run_reduced_strategic_model_sparse_arcs(build_reduced_strategic_model):
+    m = build_reduced_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.false,
+            "sparse_arcs": True,
+        }
+    )
+
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": False,
+        "scaling_factor": 1000,
+        "running_time": 60 * 5,
+        "gap": 0,
+    }
+    results = solve_model(model=m, options=options)
+
+    assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+    assert degrees_of_freedom(m) == 11292
+    # Same solution as the dense model
+    assert pytest.approx(96607.6609, abs=1e-1) == pyo.value(m.v_Z)
+    with nostdout():
+        assert is_feasible(m)
+
+
 @pytest.mark.component
 def test_water_quality_reduced_strategic_model_removal_concentration(
-    build_reduced_strategic_model,
+    build_reduced_strategic_model, tmp_path
 ):
     m = build_reduced_strategic_model(
         config_dict={
@@ -889,7 +1298,7 @@ def test_water_quality_reduced_strategic_model_removal_concentration(
         results,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
@@ -914,7 +1323,7 @@ def build_modified_reduced_strategic_model():
 
 @pytest.mark.component
 def test_water_quality_reduced_strategic_model_removal_load(
-    build_modified_reduced_strategic_model,
+    build_modified_reduced_strategic_model, tmp_path
 ):
     m = build_modified_reduced_strategic_model(
         config_dict={
@@ -967,12 +1376,12 @@ def test_water_quality_reduced_strategic_model_removal_load(
         results,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
 @pytest.mark.component
-def test_solver_option_reduced_strategic_model(build_reduced_strategic_model):
+def test_solver_option_reduced_strategic_model(build_reduced_strategic_model, tmp_path):
     m = build_reduced_strategic_model(
         config_dict={
             "objective": Objectives.cost,
@@ -1010,7 +1419,7 @@ def test_solver_option_reduced_strategic_model(build_reduced_strategic_model):
         results,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
@@ -1058,7 +1467,7 @@ def test_basic_toy_build(build_toy_strategic_model):
     )
     assert degrees_of_freedom(m) == 6295
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -1098,6 +1507,1142 @@ def test_run_toy_strategic_model(build_toy_strategic_model):
         assert is_feasible(m)
 
 
+@pytest.mark.component
+def test_run_toy_strategic_scenarios():
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    default = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.false,
+        "infrastructure_timing": InfrastructureTiming.true,
+    }
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": False,
+        "running_time": 600,
+        "gap": 0,
+    }
+    cheap_disposal = {
+        k: 0.5 * v for k, v in df_parameters["DisposalOperationalCost"].items()
+    }
+    scenarios = {
+        "base": {},
+        "cheap_disposal": {
+            "parameters": {"DisposalOperationalCost": cheap_disposal},
+            "options": {"running_time": 300},
+        },
+        "invalid": {"config": {"objective": "not an objective"}},
+    }
+    disposal_cost = dict(df_parameters["DisposalOperationalCost"])
+    summary = run_scenarios(
+        df_sets,
+        df_parameters,
+        scenarios,
+        default=default,
+        options=options,
+        processes=2,
+    )
+
+    assert list(summary.index) == ["base", "cheap_disposal", "invalid"]
+    assert summary.loc["base", "status"] == "ok"
+    assert summary.loc["base", "termination_condition"] == "optimal"
+    assert pytest.approx(6122.5178, abs=1e-1) == summary.loc["base", "objective"]
+    assert pytest.approx(6122.5178, abs=1e-1) == summary.loc["base", "total_cost"]
+    assert summary.loc["cheap_disposal", "status"] == "ok"
+    assert (
+        summary.loc["cheap_disposal", "objective"] <= summary.loc["base", "objective"]
+    )
+    # A failing scenario is reported without affecting the others
+    assert summary.loc["invalid", "status"] == "error"
+    assert "objective" in summary.loc["invalid", "error"]
+    # The base data is left untouched
+    assert "LLA" not in df_parameters
+
+    # Solving the scenarios one after another in this process gives the same summary
+    # and also leaves the base data untouched
+    serial_summary = run_scenarios(
+        df_sets,
+        df_parameters,
+        scenarios,
+        default=default,
+        options=options,
+        processes=1,
+    )
+    pd.testing.assert_frame_equal(
+        serial_summary.drop(columns="run_time"),
+        summary.drop(columns="run_time"),
+        check_exact=False,
+        atol=1e-1,
+    )
+    assert "LLA" not in df_parameters
+    assert df_parameters["DisposalOperationalCost"] == disposal_cost
+
+
+@pytest.mark.component
+def test_update_toy_strategic_parameters():
+    """
+    Updating the mutable parameters of a model and re-solving it gives the same
+    solution as rebuilding the model with the updated data
+    """
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.false,
+        "infrastructure_timing": InfrastructureTiming.true,
+    }
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": False,
+        "running_time": 600,
+        "gap": 0,
+    }
+    overrides = {
+        "DisposalOperationalCost": {
+            k: 0.5 * v for k, v in df_parameters["DisposalOperationalCost"].items()
+        },
+        "CompletionsDemand": {
+            k: 1.1 * v for k, v in df_parameters["CompletionsDemand"].items()
+        },
+    }
+
+    m = create_model(df_sets, df_parameters, default=config_dict)
+    assert len(m.config) == 13
+    assert m.p_pi_Disposal.mutable
+    solve_model(model=m, options=options)
+    assert pytest.approx(6122.5178, abs=1e-1) == pyo.value(m.v_Z)
+
+    update_parameters(m, overrides)
+    key = next(k for k, v in df_parameters["CompletionsDemand"].items() if v)
+    assert m.df_parameters["CompletionsDemand"][key] == pytest.approx(
+        overrides["CompletionsDemand"][key]
+    )
+    # The data the model was created from is left untouched
+    assert df_parameters["CompletionsDemand"][key] != pytest.approx(
+        overrides["CompletionsDemand"][key]
+    )
+    results = solve_model(model=m, options=options)
+    assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+
+    updated_parameters = {**df_parameters, **overrides}
+    rebuilt = create_model(df_sets, updated_parameters, default=config_dict)
+    solve_model(model=rebuilt, options=options)
+    assert pytest.approx(pyo.value(rebuilt.v_Z), abs=1e-1) == pyo.value(m.v_Z)
+
+    with pytest.raises(Exception, match="Parameters cannot be updated"):
+        update_parameters(m, {"PipelineDiameterValues": {}})
+
+    # The network presolve removes arcs based on the supplies and demands
+    presolved = create_model(
+        df_sets,
+        df_parameters,
+        default={**config_dict, "network_presolve": True},
+    )
+    with pytest.raises(Exception, match="network presolve"):
+        update_parameters(presolved, {"PadRates": df_parameters["PadRates"]})
+
+
+@pytest.mark.component
+def test_run_toy_strategic_model_persistent_solver():
+    """
+    Solve the toy case study twice with the same persistent solver object, updating
+    the disposal cost in between
+    """
+    pytest.importorskip("highspy", reason="HiGHS is not installed")
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.false,
+        "infrastructure_timing": InfrastructureTiming.true,
+    }
+    persistent_solver = get_solver("appsi_highs")
+    assert is_persistent(persistent_solver)
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": False,
+        "running_time": 600,
+        "gap": 0,
+        "solver": persistent_solver,
+    }
+
+    m = create_model(df_sets, df_parameters, default=config_dict)
+    results = solve_model(model=m, options=options)
+    assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+    assert pytest.approx(6122.5178, abs=1e-1) == pyo.value(m.v_Z)
+    assert persistent_solver.config.time_limit == 600
+
+    cheap_disposal = {
+        k: 0.5 * v for k, v in df_parameters["DisposalOperationalCost"].items()
+    }
+    update_parameters(m, {"DisposalOperationalCost": cheap_disposal})
+    results = solve_model(model=m, options=options)
+    assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+
+    rebuilt = create_model(
+        df_sets,
+        {**df_parameters, "DisposalOperationalCost": cheap_disposal},
+        default=config_dict,
+    )
+    solve_model(model=rebuilt, options={**options, "solver": "appsi_highs"})
+    assert pytest.approx(pyo.value(rebuilt.v_Z), abs=1e-1) == pyo.value(m.v_Z)
+
+
+@pytest.mark.integration
+def test_update_parameters_matches_rebuild():
+    """
+    What-if benchmark: 20 sequential changes of the disposal cost and of the
+    production rates, solved by updating the parameters of one model vs rebuilding
+    the model for each change. Both give the same results. Run with `pytest -s` to
+    see the timings.
+    """
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.false,
+    }
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": False,
+        "running_time": 60,
+        "gap": 0,
+    }
+    what_ifs = [
+        {
+            "DisposalOperationalCost": {
+                k: (0.5 + 0.1 * i) * v
+                for k, v in df_parameters["DisposalOperationalCost"].items()
+            }
+        }
+        for i in range(10)
+    ] + [
+        {
+            "PadRates": {
+                k: (0.8 + 0.02 * i) * v for k, v in df_parameters["PadRates"].items()
+            }
+        }
+        for i in range(10)
+    ]
+
+    start = time.perf_counter()
+    m = create_model(df_sets, df_parameters, default=config_dict)
+    updated = []
+    for overrides in what_ifs:
+        update_parameters(m, overrides)
+        results = solve_model(model=m, options=options)
+        assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+        updated.append((pyo.value(m.v_Z), pyo.value(m.p_beta_TotalProd)))
+    update_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rebuilt = []
+    updated_data = dict(df_parameters)
+    for overrides in what_ifs:
+        updated_data = {**updated_data, **overrides}
+        m_rebuilt = create_model(df_sets, updated_data, default=config_dict)
+        solve_model(model=m_rebuilt, options=options)
+        rebuilt.append(
+            (pyo.value(m_rebuilt.v_Z), pyo.value(m_rebuilt.p_beta_TotalProd))
+        )
+    rebuild_time = time.perf_counter() - start
+    print(
+        f"{len(what_ifs)} what-ifs: update + solve {update_time:.1f} s, "
+        f"rebuild + solve {rebuild_time:.1f} s"
+    )
+
+    for (cost, total_prod), (rebuilt_cost, rebuilt_total_prod) in zip(updated, rebuilt):
+        assert cost == pytest.approx(rebuilt_cost, abs=1e-1)
+        assert total_prod == pytest.approx(rebuilt_total_prod)
+
+
+@pytest.mark.component
+def test_toy_cost_vs_subsurface_risk_pareto_front():
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    default = {
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "node_capacity": True,
+        "water_quality": WaterQuality.false,
+        "subsurface_risk": SubsurfaceRisk.exclude_over_and_under_pressured_wells,
+    }
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": False,
+        "running_time": 200,
+        "gap": 0,
+    }
+    front, snapshots = pareto_front(
+        df_sets,
+        df_parameters,
+        Objectives.subsurface_risk,
+        n_points=4,
+        default=default,
+        options=options,
+    )
+
+    assert list(front.index) == [0, 1, 2, 3]
+    assert (front["status"] == "ok").all()
+    assert list(snapshots) == [0, 1, 2, 3]
+    assert snapshots[0]["v_Z"][None] == pytest.approx(front.loc[0, "cost"])
+    # Cost increases as the subsurface risk bound decreases
+    assert front["epsilon"].is_monotonic_decreasing
+    assert (front["cost"].diff().dropna() >= -1e-1).all()
+    assert (front["subsurface_risk"] <= front["epsilon"] + 1e-4).all()
+    # The base data is left untouched
+    assert "LLA" not in df_parameters
+
+    parallel_front, _ = pareto_front(
+        df_sets,
+        df_parameters,
+        Objectives.subsurface_risk,
+        n_points=4,
+        default=default,
+        options=options,
+        processes=2,
+    )
+    assert parallel_front["cost"].to_list() == pytest.approx(
+        front["cost"].to_list(), abs=1e-1
+    )
+
+    with pytest.raises(Exception, match="Pareto front not supported"):
+        pareto_front(df_sets, df_parameters, Objectives.cost)
+
+
+@pytest.mark.component
+def test_toy_pareto_front_post_process_water_quality():
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    # Default water quality configuration, i.e., WaterQuality.post_process
+    default = {
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "node_capacity": True,
+        "subsurface_risk": SubsurfaceRisk.exclude_over_and_under_pressured_wells,
+    }
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": False,
+        "running_time": 200,
+        "gap": 0,
+    }
+    front, snapshots = pareto_front(
+        df_sets,
+        df_parameters,
+        Objectives.subsurface_risk,
+        n_points=3,
+        default=default,
+        options=options,
+    )
+
+    assert (front["status"] == "ok").all()
+    # The model is not left fixed by the water quality calculation: the secondary
+    # objective has a range and is bounded by epsilon at every point
+    assert front.loc[0, "epsilon"] > front.loc[2, "epsilon"]
+    assert (front["subsurface_risk"] <= front["epsilon"] + 1e-4).all()
+    assert (front["cost"].diff().dropna() >= -1e-1).all()
+    # The water quality of each point is part of its snapshot
+    for point in front.index:
+        assert snapshots[point]["v_Z"][None] == pytest.approx(front.loc[point, "cost"])
+        quality = snapshots[point]["quality.v_Q"]
+        assert quality and all(q is not None for q in quality.values())
+
+
+@pytest.mark.unit
+def test_toy_post_processed_snapshot(build_toy_strategic_model):
+    m = build_toy_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.post_process,
+        }
+    )
+    # Produced water of PP01 is disposed of at K01 through N01 in T01
+    m.v_F_Piped["PP01", "N01", "T01"].value = 10
+    m.v_F_Piped["N01", "K01", "T01"].value = 10
+    m.v_F_DisposalDestination["K01", "T01"].value = 10
+    for var in m.component_data_objects(pyo.Var):
+        if var.value is None:
+            var.value = 0
+    # Tiny values are fixed to zero by the water quality calculation
+    m.v_F_Piped["PP01", "N01", "T02"].value = 1e-9
+    fixed = [var.fixed for var in m.component_data_objects(pyo.Var)]
+    df_sets = dict(m.df_sets)
+
+    # The mass balances determine the water quality, so no solver is needed
+    snapshot = _post_processed_snapshot(m, solver=None)
+    assert snapshot["quality.v_Q"]["K01", "TDS", "T01"] > 0
+    assert snapshot["v_F_Piped"]["PP01", "N01", "T01"] == 10
+
+    # The model is left as it was for the next point
+    assert m.component("quality") is None
+    assert [var.fixed for var in m.component_data_objects(pyo.Var)] == fixed
+    assert m.v_F_Piped["PP01", "N01", "T02"].value == 1e-9
+    assert m.df_sets.keys() == df_sets.keys()
+
+
+@pytest.mark.unit
+def test_toy_network_presolve():
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    # A dead-end node, a production pad without production and an arc with a zero
+    # entry
+    df_sets = dict(df_sets)
+    df_sets["NetworkNodes"] = pd.concat(
+        [df_sets["NetworkNodes"], pd.Series(["N99"])], ignore_index=True
+    )
+    df_sets["ProductionPads"] = pd.concat(
+        [df_sets["ProductionPads"], pd.Series(["PP99"])], ignore_index=True
+    )
+    df_parameters = dict(df_parameters)
+    df_parameters["NNA"] = {**df_parameters["NNA"], ("N01", "N99"): 1}
+    df_parameters["PNA"] = {**df_parameters["PNA"], ("PP99", "N01"): 1}
+    df_parameters["PadRates"] = {
+        **df_parameters["PadRates"],
+        **{("PP99", t): 0 for t in df_sets["TimePeriods"]},
+    }
+    df_parameters["NKA"] = {**df_parameters["NKA"]}
+    zero_arc = next(iter(df_parameters["NKA"]))
+    df_parameters["NKA"][zero_arc] = 0
+
+    new_sets, new_parameters, removed = presolve_network(df_sets, df_parameters)
+
+    assert removed["PipelineArcs"] == [("PP99", "N01"), ("N01", "N99"), zero_arc]
+    assert removed["TruckingArcs"] == []
+    assert removed["Locations"] == ["PP99", "N99"]
+    assert "N99" not in list(new_sets["NetworkNodes"])
+    assert "PP99" not in list(new_sets["ProductionPads"])
+    assert ("N01", "N99") not in new_parameters["NNA"]
+    assert zero_arc not in new_parameters["NKA"]
+    assert not any(key[0] == "PP99" for key in new_parameters["PadRates"])
+    # The input data is left untouched
+    assert ("N01", "N99") in df_parameters["NNA"]
+    assert "N99" in list(df_sets["NetworkNodes"])
+
+    # A disposal site without capacity increments can still be expanded with the
+    # default increment of the model, but not with zero increments
+    k = list(df_sets["SWDSites"])[0]
+    no_capacity = dict(df_parameters)
+    no_capacity["InitialDisposalCapacity"] = {
+        **df_parameters["InitialDisposalCapacity"],
+        k: 0,
+    }
+    no_capacity["DisposalCapacityIncrements"] = {
+        key: v
+        for key, v in df_parameters["DisposalCapacityIncrements"].items()
+        if key[0] != k
+    }
+    _, _, removed_default = presolve_network(df_sets, no_capacity)
+    assert not any(
+        arc[1] == k and arc != zero_arc
+        for arc in removed_default["PipelineArcs"] + removed_default["TruckingArcs"]
+    )
+    no_capacity["DisposalCapacityIncrements"] = {
+        **no_capacity["DisposalCapacityIncrements"],
+        **{(k, i): 0 for i in df_sets["InjectionCapacities"]},
+    }
+    _, _, removed_zero = presolve_network(df_sets, no_capacity)
+    assert any(
+        arc[1] == k
+        for arc in removed_zero["PipelineArcs"] + removed_zero["TruckingArcs"]
+    )
+
+    m = create_model(
+        df_sets,
+        df_parameters,
+        default={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "network_presolve": True,
+        },
+    )
+    assert m.presolve_removed == removed
+    assert "N99" not in m.s_N
+    assert ("N01", "N99") not in m.s_LLA
+    assert zero_arc not in m.s_LLA
+
+
+@pytest.mark.unit
+def test_refine_discrete_quality_levels(build_toy_strategic_model):
+    m = build_toy_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.discrete,
+        }
+    )
+    levels = [pyo.value(m.p_discrete_quality["TDS", q]) for q in m.s_Q]
+    step = levels[1] - levels[0]
+    assert _discrete_quality_bin_widths(m) == {"TDS": {}}
+
+    # Flows at the lowest level and at Q3 use these two levels only
+    arc = next(iter(m.s_NonPLP))
+    t = m.s_T.first()
+    m.v_F_DiscretePiped[arc, t, "TDS", "Q0"].value = 1
+    m.v_L_DiscreteStorage[m.s_S.first(), t, "TDS", "Q3"].value = 1
+    widths = _discrete_quality_bin_widths(m)
+    assert list(widths["TDS"]) == ["Q0", "Q3"]
+    assert widths["TDS"]["Q0"] == 0
+    assert widths["TDS"]["Q3"] == pytest.approx(step)
+
+    # The first unused level moves to the middle of the Q3 bin, the lowest and
+    # highest levels stay
+    assert _refine_discrete_quality_levels(m, widths, tolerance=0)
+    assert pyo.value(m.p_discrete_quality["TDS", "Q1"]) == pytest.approx(
+        levels[3] - step / 2
+    )
+    for q, level in zip(["Q0", "Q2", "Q3", "Q4", "Q5"], levels[:1] + levels[2:]):
+        assert pyo.value(m.p_discrete_quality["TDS", q]) == pytest.approx(level)
+    assert _discrete_quality_bin_widths(m)["TDS"]["Q3"] == pytest.approx(step / 2)
+    assert not _refine_discrete_quality_levels(m, widths, tolerance=step)
+
+    m_continuous = build_toy_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.false,
+        }
+    )
+    with pytest.raises(Exception, match="discrete water quality"):
+        refine_discrete_water_quality(m_continuous, tolerance=1)
+
+
+@pytest.mark.unit
+def test_refine_discrete_water_quality_coarse_grid(
+    build_toy_strategic_model, monkeypatch, capsys
+):
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.discrete,
+        "discrete_quality_levels": 3,
+    }
+    m = build_toy_strategic_model(config_dict=config_dict)
+    assert list(m.s_Q) == ["Q0", "Q1", "Q2"]
+    levels = [pyo.value(m.p_discrete_quality["TDS", q]) for q in m.s_Q]
+    assert levels[1] == pytest.approx((levels[0] + levels[2]) / 2)
+
+    # A solution using every level cannot be refined further: the refinement stops
+    # and warns that the tolerance is not met
+    def solve_using_every_level(model, options=None):
+        for var in model.component_data_objects(pyo.Var):
+            var.set_value(0, skip_validation=True)
+        arc = next(iter(model.s_NonPLP))
+        for q in model.s_Q:
+            model.v_F_DiscretePiped[arc, model.s_T.first(), "TDS", q].value = 1
+        results = SolverResults()
+        results.solver.termination_condition = pyo.TerminationCondition.optimal
+        return results
+
+    monkeypatch.setattr(
+        "pareto.strategic_water_management.strategic_produced_water_optimization"
+        ".solve_model",
+        solve_using_every_level,
+    )
+    _, history = refine_discrete_water_quality(m, tolerance=1, max_iterations=3)
+    assert len(history) == 1
+    assert "tolerance is not met for ['TDS']" in capsys.readouterr().out
+
+    with pytest.raises(ValueError, match="at least 2"):
+        build_toy_strategic_model(
+            config_dict={**config_dict, "discrete_quality_levels": 1}
+        )
+
+
+@pytest.mark.component
+def test_run_toy_strategic_model_refined_discrete_water_quality(
+    build_toy_strategic_model,
+):
+    m = build_toy_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "node_capacity": True,
+            "water_quality": WaterQuality.discrete,
+        }
+    )
+    options = {
+        "deactivate_slacks": True,
+        "scale_model": False,
+        "running_time": 300,
+        "gap": 0,
+    }
+
+    results, history = refine_discrete_water_quality(
+        m, tolerance=1, options=options, max_iterations=3
+    )
+
+    assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+    assert 1 <= len(history) <= 3
+    assert list(history.columns) == ["termination_condition", "objective", "TDS"]
+    # The previous solution stays feasible on the refined grid
+    assert (history["objective"].diff().dropna() <= 1e-1).all()
+    assert len(m.s_Q) == 6
+
+
+@pytest.mark.unit
+def test_toy_aggregate_time_periods():
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    new_sets, new_parameters, blocks = aggregate_time_periods(
+        df_sets, df_parameters, block_size=4
+    )
+
+    assert len(blocks) == 13
+    assert list(blocks) == list(new_sets["TimePeriods"])
+    assert blocks["T01"] == ["T01", "T02", "T03", "T04"]
+    assert new_parameters["Units"]["decision period"] == "week_x4"
+    # Time-indexed data is averaged over the block, other data is unchanged
+    pad, t = next(iter(df_parameters["PadRates"]))
+    assert t == "T01"
+    assert new_parameters["PadRates"][pad, "T01"] == pytest.approx(
+        sum(df_parameters["PadRates"].get((pad, t), 0) for t in blocks["T01"]) / 4
+    )
+    # Missing rates are zero, so the average is over all periods of the block
+    p, t = next(iter(df_parameters["CompletionsDemand"]))
+    block = next(b for b, ts in blocks.items() if t in ts)
+    assert new_parameters["CompletionsDemand"][p, block] == pytest.approx(
+        sum(df_parameters["CompletionsDemand"].get((p, t), 0) for t in blocks[block])
+        / len(blocks[block])
+    )
+    assert new_parameters["PipelineCapacityIncrements"] == (
+        df_parameters["PipelineCapacityIncrements"]
+    )
+    # Lead times are converted from weeks to blocks of four weeks, rounded up
+    lead_times = df_parameters["DisposalExpansionLeadTime"]
+    index = next(i for i, v in lead_times.items() if v > 0)
+    assert new_parameters["DisposalExpansionLeadTime"][index] == math.ceil(
+        lead_times[index] / 4
+    )
+    # Aggregating again reuses the unit of the aggregated time periods
+    aggregate_time_periods(df_sets, df_parameters, block_size=4)
+    # The input data is left untouched
+    assert len(df_sets["TimePeriods"]) == 52
+    assert df_parameters["Units"]["decision period"] == "week"
+
+    config = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+    }
+    m = create_model(df_sets, df_parameters, default=config)
+    m_aggregated = create_model(new_sets, new_parameters, default=config)
+    assert len(m_aggregated.s_T) == 13
+    assert pyo.value(m_aggregated.p_beta_TotalProd) == pytest.approx(
+        pyo.value(m.p_beta_TotalProd)
+    )
+    assert pyo.value(m_aggregated.p_tau_DisposalExpansionLeadTime[index]) == math.ceil(
+        pyo.value(m.p_tau_DisposalExpansionLeadTime[index]) / 4
+    )
+
+    with pytest.raises(Exception, match="block_size"):
+        aggregate_time_periods(df_sets, df_parameters, block_size=0)
+    # A shorter last block would be modelled with the full block length
+    with pytest.raises(Exception, match="multiple of block_size"):
+        aggregate_time_periods(df_sets, df_parameters, block_size=5)
+
+
+@pytest.mark.component
+def test_run_toy_strategic_model_aggregated():
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    m_aggregated, m, results = solve_aggregated_model(
+        df_sets,
+        df_parameters,
+        block_size=4,
+        default={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+        },
+        options={
+            "deactivate_slacks": True,
+            "scale_model": False,
+            "running_time": 300,
+            "gap": 0,
+        },
+    )
+
+    assert len(m_aggregated.s_T) == 13
+    assert len(m.s_T) == 52
+    assert results.solver.termination_condition == pyo.TerminationCondition.optimal
+    # The build-out of the aggregated solution is kept
+    for index, var_data in m_aggregated.vb_y_Pipeline.items():
+        assert m.vb_y_Pipeline[index].fixed
+        assert pyo.value(m.vb_y_Pipeline[index]) == pytest.approx(pyo.value(var_data))
+
+
+@pytest.mark.unit
+def test_rolling_horizon_window(build_toy_strategic_model):
+    m = build_toy_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+        }
+    )
+    positions = {t: n for n, t in enumerate(m.s_T)}
+    s = m.s_S.first()
+
+    fixed_variables, deactivated = _restrict_to_window(m, positions, end=4)
+    # The time periods after the window are left out, the build-out is not
+    assert not m.v_L_Storage[s, "T04"].fixed
+    assert m.v_L_Storage[s, "T05"].fixed
+    assert pyo.value(m.v_L_Storage[s, "T05"]) == 0
+    assert m.StorageSiteBalance[s, "T04"].active
+    assert not m.StorageSiteBalance[s, "T05"].active
+    assert not any(var.fixed for var in m.vb_y_Storage.values())
+
+    unfix_variables(fixed_variables)
+    for con in deactivated:
+        con.activate()
+    assert not m.v_L_Storage[s, "T05"].fixed
+    assert m.StorageSiteBalance[s, "T05"].active
+
+    for t in ["T01", "T02", "T03"]:
+        m.v_L_Storage[s, t].value = 1
+    _commit_time_periods(m, positions, start=1, end=3)
+    assert not m.v_L_Storage[s, "T01"].fixed
+    assert m.v_L_Storage[s, "T02"].fixed
+    assert m.v_L_Storage[s, "T03"].fixed
+    assert not m.v_L_Storage[s, "T04"].fixed
+    for t in ["T02", "T03"]:
+        m.v_L_Storage[s, t].unfix()
+
+    # Infrastructure built in an earlier window is kept in the next windows
+    k = m.s_K.first()
+    built, not_built = None, None
+    for i in m.s_I:
+        if pyo.value(m.p_delta_Disposal[k, i]) > 0:
+            built = i
+        else:
+            not_built = i
+    m.vb_y_Disposal[k, built].value = 1
+    m.v_D_Capacity[k].value = pyo.value(
+        m.p_sigma_Disposal[k] + m.p_delta_Disposal[k, built]
+    )
+    if not_built is not None:
+        m.vb_y_Disposal[k, not_built].value = 0
+    _commit_build_out(m)
+    assert m.vb_y_Disposal[k, built].fixed
+    assert pyo.value(m.vb_y_Disposal[k, built]) == 1
+    assert m.v_D_Capacity[k].fixed
+    if not_built is not None:
+        assert not m.vb_y_Disposal[k, not_built].fixed
+    assert not any(var.fixed for var in m.vb_y_Storage.values())
+    m.vb_y_Disposal[k, built].unfix()
+    m.v_D_Capacity[k].unfix()
+
+    with pytest.raises(Exception, match="window"):
+        solve_rolling_horizon(m, window=0)
+    with pytest.raises(Exception, match="overlap"):
+        solve_rolling_horizon(m, window=4, overlap=4)
+
+
+@pytest.mark.component
+def test_run_toy_strategic_model_rolling_horizon():
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    comparison, m_monolithic, m = compare_rolling_horizon(
+        df_sets,
+        df_parameters,
+        window=26,
+        overlap=4,
+        default={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+        },
+        options={
+            "deactivate_slacks": True,
+            "scale_model": False,
+            "running_time": 300,
+            "gap": 0,
+        },
+    )
+
+    assert list(comparison.index) == ["monolithic", "rolling_horizon"]
+    assert list(comparison.columns) == [
+        "termination_condition",
+        "objective",
+        "run_time",
+    ]
+    assert (comparison["termination_condition"] == "optimal").all()
+    # The rolling horizon solution is feasible for the full horizon
+    assert comparison.loc["rolling_horizon", "objective"] >= pytest.approx(
+        comparison.loc["monolithic", "objective"]
+    )
+    # The time periods before the last window are committed
+    assert all(m.v_L_Storage[s, "T01"].fixed for s in m.s_S)
+    assert not any(m.v_L_Storage[s, "T52"].fixed for s in m.s_S)
+    # Only the storage built in the earlier windows is committed
+    for (s, c), var in m.vb_y_Storage.items():
+        if var.fixed:
+            assert pyo.value(var) == 1
+            assert pyo.value(m.p_delta_Storage[c]) > 0
+            assert m.v_X_Capacity[s].fixed
+
+
+@pytest.mark.unit
+def test_toy_initialize_from_solution(build_toy_strategic_model, tmp_path):
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.false,
+    }
+    m = build_toy_strategic_model(config_dict=config_dict)
+    arc = next(iter(m.s_LLA))
+    s = m.s_S.first()
+    pipeline = next(iter(m.vb_y_Pipeline))
+    m.v_F_Piped[arc, "T03"].value = 7
+    m.v_L_Storage[s, "T02"].value = 11
+    m.vb_y_Pipeline[pipeline].value = 1
+    m.v_F_TotalSourced.value = 13
+    fname = str(tmp_path / "report.xlsx")
+    generate_report(m, output_units=OutputUnits.user_units, fname=fname)
+
+    # Values of the report are converted back from user units to model units
+    m_report = build_toy_strategic_model(config_dict=config_dict)
+    assert initialize_from_solution(m_report, fname) == 4
+    assert pyo.value(m_report.v_F_Piped[arc, "T03"]) == pytest.approx(7)
+    assert pyo.value(m_report.v_L_Storage[s, "T02"]) == pytest.approx(11)
+    assert m_report.vb_y_Pipeline[pipeline].value == 1
+    assert pyo.value(m_report.v_F_TotalSourced) == pytest.approx(13)
+
+    # Variables and indices that are not in the model are skipped
+    m_snapshot = build_toy_strategic_model(config_dict=config_dict)
+    snapshot = {
+        "v_F_Piped": {(*arc, "T03"): 7, (*arc, "T99"): 1},
+        "v_L_Storage": {(s, "T02"): None},
+        "v_Missing": {None: 1},
+    }
+    assert initialize_from_solution(m_snapshot, snapshot) == 1
+    assert pyo.value(m_snapshot.v_F_Piped[arc, "T03"]) == 7
+    assert pyo.value(m_snapshot.v_L_Storage[s, "T02"]) == 0
+
+
+@pytest.fixture
+def build_toy_report_model(build_toy_strategic_model):
+    m = build_toy_strategic_model(
+        config_dict={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.false,
+        }
+    )
+    m.proprietary_data = True
+    arc = next(iter(m.s_LLA))
+    m.v_F_Piped[arc, "T03"].value = 7
+    m.v_F_TotalSourced.value = 13
+    return m
+
+
+@pytest.mark.unit
+def test_toy_excel_report_layout(build_toy_report_model, tmp_path):
+    m = build_toy_report_model
+    fname = str(tmp_path / "report.xlsx")
+    with nostdout():
+        _, headers = generate_report(m, is_print=PrintValues.detailed, fname=fname)
+
+    # The Excel report has the same layout as a report written with pandas
+    expected = tmp_path / "expected.xlsx"
+    with pd.ExcelWriter(expected) as writer:
+        for i in headers:
+            df = pd.DataFrame(headers[i][1:], columns=headers[i][0])
+            df.to_excel(writer, sheet_name=i[: -len("_dict")], index=False, startrow=1)
+    tabs = pd.read_excel(fname, sheet_name=None, header=None)
+    expected_tabs = pd.read_excel(expected, sheet_name=None, header=None)
+    assert list(tabs) == list(expected_tabs)
+    for tab in tabs:
+        pd.testing.assert_frame_equal(tabs[tab], expected_tabs[tab])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "report_format", [ReportFormat.csv, ReportFormat.parquet], ids=lambda f: f.name
+)
+def test_toy_report_formats(build_toy_report_model, tmp_path, report_format):
+    if report_format == ReportFormat.parquet:
+        pytest.importorskip("pyarrow")
+    m = build_toy_report_model
+    with nostdout():
+        _, headers = generate_report(
+            m,
+            is_print=PrintValues.detailed,
+            fname=str(tmp_path / "report"),
+            report_format=report_format,
+        )
+
+    # One file per tab, without the proprietary data footnote
+    def read_tab(tab):
+        path = tmp_path / "report" / (tab + "." + report_format.name)
+        if report_format == ReportFormat.csv:
+            return pd.read_csv(path)
+        return pd.read_parquet(path)
+
+    for i in headers:
+        df = read_tab(i[: -len("_dict")])
+        assert len(df.columns) == len(headers[i][0])
+        assert len(df) == len(headers[i]) - (2 if len(headers[i]) > 1 else 1)
+    df = read_tab("v_F_Piped")
+    assert list(df.columns) == list(headers["v_F_Piped_dict"][0])
+    assert df.values.tolist() == [list(headers["v_F_Piped_dict"][1])]
+
+
+@pytest.mark.integration
+def test_report_bulk_conversion_benchmark():
+    """
+    Report benchmark: the toy case study repeated over 520 weekly time periods,
+    which gives more than 1M variable entries. Run with `pytest -s` to see the
+    report time, and the time of converting the piped flows to user units in bulk
+    vs one value at a time.
+    """
+    with resources.path(
+        "pareto.case_studies",
+        "strategic_toy_case_study.xlsx",
+    ) as fpath:
+        [df_sets, df_parameters] = get_data(fpath)
+
+    # Repeat the time-indexed data of the 52 weeks 10 times
+    repeats = 10
+    periods = list(df_sets["TimePeriods"])
+    positions = {t: n for n, t in enumerate(periods)}
+    new_periods = [f"T{n:04d}" for n in range(1, len(periods) * repeats + 1)]
+    df_sets = {**df_sets, "TimePeriods": pd.Series(new_periods)}
+    df_parameters = dict(df_parameters)
+    for name, data in df_parameters.items():
+        if not isinstance(data, dict) or not any(
+            isinstance(key, tuple) and any(k in positions for k in key) for key in data
+        ):
+            continue
+        repeated = {}
+        for key, val in data.items():
+            t = next((k for k in key if k in positions), None)
+            if t is None:
+                repeated[key] = val
+                continue
+            j = key.index(t)
+            for r in range(repeats):
+                new_t = new_periods[r * len(periods) + positions[t]]
+                repeated[(*key[:j], new_t, *key[j + 1 :])] = val
+        df_parameters[name] = repeated
+
+    m = create_model(
+        df_sets,
+        df_parameters,
+        default={
+            "objective": Objectives.cost,
+            "pipeline_cost": PipelineCost.distance_based,
+            "pipeline_capacity": PipelineCapacity.input,
+            "water_quality": WaterQuality.false,
+        },
+    )
+    n_entries = 0
+    for n, var in enumerate(m.component_data_objects(pyo.Var)):
+        var.set_value(n % 7, skip_validation=True)
+        n_entries += 1
+    assert n_entries > 1_000_000
+
+    start = time.perf_counter()
+    with nostdout():
+        generate_report(m, is_print=PrintValues.detailed, fname=None)
+    report_time = time.perf_counter() - start
+
+    from_units = m.model_units["volume_time"]
+    to_units = m.user_units["volume_time"]
+    values = [var.value for var in m.v_F_Piped.values()]
+    start = time.perf_counter()
+    converted = [
+        pyo.units.convert_value(v, from_units=from_units, to_units=to_units)
+        for v in values
+    ]
+    per_value_time = time.perf_counter() - start
+    start = time.perf_counter()
+    bulk_converted = _convert_values(values, from_units, to_units, {})
+    bulk_time = time.perf_counter() - start
+
+    print(
+        f"{n_entries} variable entries: report {report_time:.1f} s; "
+        f"{len(values)} piped flows converted in bulk {bulk_time:.2f} s, "
+        f"one at a time {per_value_time:.2f} s"
+    )
+    assert bulk_converted == pytest.approx(converted)
+    assert bulk_time < per_value_time
+
+
+@pytest.mark.unit
+def test_toy_save_load_solution(build_toy_strategic_model, tmp_path):
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.false,
+    }
+    m = build_toy_strategic_model(config_dict=config_dict)
+    arc = next(iter(m.s_LLA))
+    s = m.s_S.first()
+    m.v_F_Piped[arc, "T03"].value = 7.25
+    m.v_L_Storage[s, "T02"].value = 0
+    m.v_F_TotalSourced.value = 13
+    m.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+    m.dual[m.StorageSiteBalance[s, "T02"]] = -2.5
+    fname = str(tmp_path / "solution.npz")
+    save_solution(m, fname)
+
+    m_loaded = build_toy_strategic_model(config_dict=config_dict)
+    m_loaded.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+    n_values = sum(
+        1
+        for var in m.component_data_objects(pyo.Var, descend_into=True)
+        if var.value is not None
+    )
+    assert load_solution(m_loaded, fname) == n_values
+    assert pyo.value(m_loaded.v_F_Piped[arc, "T03"]) == 7.25
+    assert pyo.value(m_loaded.v_L_Storage[s, "T02"]) == 0
+    assert pyo.value(m_loaded.v_F_TotalSourced) == 13
+    assert m_loaded.dual[m_loaded.StorageSiteBalance[s, "T02"]] == -2.5
+
+    # Only the changed entry differs between the two runs
+    assert diff_solutions(fname, fname).empty
+    m_loaded.v_F_Piped[arc, "T03"].value = 8
+    fname_changed = str(tmp_path / "solution_changed.npz")
+    save_solution(m_loaded, fname_changed)
+    diff = diff_solutions(fname, fname_changed)
+    assert diff.to_dict("records") == [
+        {
+            "kind": "var",
+            "component": "v_F_Piped",
+            "index": (*arc, "T03"),
+            "value_1": 7.25,
+            "value_2": 8,
+        }
+    ]
+
+
+@pytest.mark.unit
+def test_save_load_solution_mixed_index_types(tmp_path):
+    # Index positions mixing numbers and text keep the type of each entry
+    indices = [(1, "a"), ("b", "c"), (2.5, "d"), (True, "e")]
+    m = pyo.ConcreteModel()
+    m.v_Mixed = pyo.Var(indices, initialize=lambda m, i, j: len(j))
+    fname = str(tmp_path / "solution.npz")
+    save_solution(m, fname)
+
+    m_loaded = pyo.ConcreteModel()
+    m_loaded.v_Mixed = pyo.Var(indices)
+    assert load_solution(m_loaded, fname) == len(indices)
+    assert all(m_loaded.v_Mixed[i, j].value == len(j) for i, j in indices)
+    assert diff_solutions(fname, fname).empty
+
+
+@pytest.mark.unit
+def test_toy_water_quality_linear_system(build_toy_strategic_model):
+    config_dict = {
+        "objective": Objectives.cost,
+        "pipeline_cost": PipelineCost.distance_based,
+        "pipeline_capacity": PipelineCapacity.input,
+        "water_quality": WaterQuality.post_process,
+    }
+    m = build_toy_strategic_model(config_dict=config_dict)
+    # Produced water of PP01 is disposed of at K01 through N01 in T01
+    m.v_F_Piped["PP01", "N01", "T01"].value = 10
+    m.v_F_Piped["N01", "K01", "T01"].value = 10
+    m.v_F_DisposalDestination["K01", "T01"].value = 10
+    for var in m.component_data_objects(pyo.Var):
+        if var.value is None:
+            var.value = 0
+    water_quality(m)
+
+    assert solve_water_quality_linear_system(m)
+    pad_quality = pyo.value(m.quality.p_nu_pad["PP01", "TDS"])
+    assert pyo.value(m.quality.v_Q["N01", "TDS", "T01"]) == pytest.approx(pad_quality)
+    assert pyo.value(m.quality.v_Q["K01", "TDS", "T01"]) == pytest.approx(pad_quality)
+    # Locations without flow have no water quality
+    assert pyo.value(m.quality.v_Q["N01", "TDS", "T02"]) == 0
+    assert pyo.value(m.quality.v_Q["K02", "TDS", "T01"]) == 0
+
+    # Water that enters a node without leaving it does not give a water quality
+    m_unbalanced = build_toy_strategic_model(config_dict=config_dict)
+    m_unbalanced.v_F_Piped["PP01", "N01", "T01"].value = 10
+    for var in m_unbalanced.component_data_objects(pyo.Var):
+        if var.value is None:
+            var.value = 0
+    water_quality(m_unbalanced)
+    m_unbalanced.quality.v_Q["N01", "TDS", "T01"].value = 1
+    assert not solve_water_quality_linear_system(m_unbalanced)
+    assert m_unbalanced.quality.v_Q["N01", "TDS", "T01"].value == 1
+
+    # Without the balance of N01, the mass balances do not determine its water
+    # quality, which is left to the solver
+    m.quality.NetworkWaterQuality["N01", "TDS", "T01"].deactivate()
+    m.quality.v_Q["N01", "TDS", "T01"].value = 1
+    assert not solve_water_quality_linear_system(m)
+    assert m.quality.v_Q["N01", "TDS", "T01"].value == 1
+    m.quality.NetworkWaterQuality["N01", "TDS", "T01"].activate()
+
+    # Constraints that are not known mass balances are not silently left out
+    m.quality.extra = pyo.Constraint(expr=m.quality.v_Q["N01", "TDS", "T01"] <= 1)
+    with pytest.raises(Exception, match="quality.extra"):
+        solve_water_quality_linear_system(m)
+
+
 @pytest.fixture(scope="module")
 def build_permian_demo_strategic_model():
     # This emulates what the pyomo command-line tools does
@@ -1130,7 +2675,7 @@ def test_basic_permian_demo_build(build_permian_demo_strategic_model):
     )
     assert degrees_of_freedom(m) == 19397
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -1141,7 +2686,7 @@ def test_basic_permian_demo_build(build_permian_demo_strategic_model):
 
 # if solver cbc exists @solver
 @pytest.mark.component
-def test_run_permian_demo_strategic_model(build_permian_demo_strategic_model):
+def test_run_permian_demo_strategic_model(build_permian_demo_strategic_model, tmp_path):
     m = build_permian_demo_strategic_model(
         config_dict={
             "objective": Objectives.cost,
@@ -1159,7 +2704,7 @@ def test_run_permian_demo_strategic_model(build_permian_demo_strategic_model):
         m,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
@@ -1200,7 +2745,7 @@ def test_basic_treatment_demo_build_with_MD(
     )
     assert degrees_of_freedom(m) == 32941
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -1212,7 +2757,7 @@ def test_basic_treatment_demo_build_with_MD(
 # if solver cbc exists @solver
 @pytest.mark.component
 def test_run_treatment_demo_strategic_model_with_MD(
-    build_reduced_strategic_model_for_surrogates,
+    build_reduced_strategic_model_for_surrogates, tmp_path
 ):
     m = build_reduced_strategic_model_for_surrogates(
         config_dict={
@@ -1244,7 +2789,7 @@ def test_run_treatment_demo_strategic_model_with_MD(
         m,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
@@ -1268,7 +2813,7 @@ def test_basic_treatment_demo_build_with_MVC(
     )
     assert degrees_of_freedom(m) == 32941
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -1280,7 +2825,7 @@ def test_basic_treatment_demo_build_with_MVC(
 # if solver cbc exists @solver
 @pytest.mark.component
 def test_run_treatment_demo_strategic_model_with_MVC(
-    build_reduced_strategic_model_for_surrogates,
+    build_reduced_strategic_model_for_surrogates, tmp_path
 ):
     m = build_reduced_strategic_model_for_surrogates(
         config_dict={
@@ -1312,7 +2857,7 @@ def test_run_treatment_demo_strategic_model_with_MVC(
         m,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
@@ -1336,7 +2881,7 @@ def test_run_water_quality_with_MVC(
     )
     assert degrees_of_freedom(m) == 32941
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -1395,7 +2940,7 @@ def test_run_water_quality_with_MD(
 
 # if solver cbc exists @solver
 @pytest.mark.component
-def test_infrastructure_buildout(build_toy_strategic_model):
+def test_infrastructure_buildout(build_toy_strategic_model, tmp_path):
     # Build model: Test with capacity based pipeline config option
     m_capacity_based = build_toy_strategic_model(
         config_dict={
@@ -1440,14 +2985,14 @@ def test_infrastructure_buildout(build_toy_strategic_model):
         m_capacity_based,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
     generate_report(
         m_distance_based,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
@@ -1481,7 +3026,7 @@ def test_workshop_build(build_workshop_strategic_model):
     )
     assert degrees_of_freedom(m) == 4232
     # Check unit config arguments
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.config.objective
     assert isinstance(m.s_T, pyo.Set)
     assert isinstance(m.v_F_Piped, pyo.Var)
@@ -1538,7 +3083,7 @@ def test_subsurface_risk_build(build_toy_strategic_model):
         }
     )
     assert degrees_of_freedom(m) == 6303
-    assert len(m.config) == 10
+    assert len(m.config) == 13
     assert m.do_subsurface_risk_calcs
     assert m.config.objective
     assert isinstance(m.v_Z_SubsurfaceRisk, pyo.Var)
@@ -1548,7 +3093,7 @@ def test_subsurface_risk_build(build_toy_strategic_model):
 
 # if solver cbc exists @solver
 @pytest.mark.component
-def test_run_subsurface_risk_model(build_workshop_strategic_model):
+def test_run_subsurface_risk_model(build_workshop_strategic_model, tmp_path):
     m = build_workshop_strategic_model(
         config_dict={
             "objective": Objectives.subsurface_risk,
@@ -1590,7 +3135,7 @@ def test_run_subsurface_risk_model(build_workshop_strategic_model):
         results,
         is_print=PrintValues.essential,
         output_units=OutputUnits.user_units,
-        fname="test_strategic_print_results.xlsx",
+        fname=str(tmp_path / "test_strategic_print_results.xlsx"),
     )
 
 
@@ -29,7 +29,7 @@ from pareto.utilities.enums import (
     InfrastructureTiming,
 )
 from pareto.utilities.get_data import get_data
-from pareto.utilities.results import is_feasible, nostdout
+from pareto.utilities.results import is_feasible, nostdout, _convert_values
 from importlib import resources
 
 import pyomo.environ as pyo
@@ -41,6 +41,13 @@ from pareto.utilities.bounding_functions import VariableBounds
 from pareto.utilities.model_modifications import free_variables
 from pareto.utilities.model_modifications import deactivate_slacks
 from pareto.utilities.model_modifications import fix_vars
+from pareto.utilities.model_modifications import (
+    fix_variables,
+    unfix_variables,
+    bound_variables,
+    restore_variables,
+    deactivate_fixed_constraints,
+)
 from pareto.utilities.process_data import (
     check_required_data,
     MissingDataError,
@@ -237,7 +244,10 @@ def test_utilities_w_discrete_quality():
         "water_quality": WaterQuality.discrete,
         "removal_efficiency_method": RemovalEfficiencyMethod.concentration_based,
     }
-    model, _, _ = fetch_strategic_model(config_dict)
+    model, _, results = fetch_strategic_model(config_dict)
+
+    # The discrete water quality solve reports the time spent in each stage
+    assert {"relaxed_quality", "quality_subproblem"} <= set(results.solver.stage_times)
 
     # Add bounds and check to confirm that bounds have been added
     model = VariableBounds(model)
@@ -293,6 +303,72 @@ def test_fix_vars():
         assert is_feasible(model)
 
 
+############################
+def test_fix_variables():
+    m = pyo.ConcreteModel()
+    m.x = pyo.Var([1, 2], initialize=2)
+    m.y = pyo.Var(within=pyo.Binary, initialize=0.9999)
+    m.z = pyo.Var()
+    m.q = pyo.Var(initialize=1)
+    m.x[2].fix(3)
+    m.c1 = pyo.Constraint(expr=m.x[1] + m.x[2] + m.y <= 6)
+    m.c2 = pyo.Constraint(expr=m.x[1] + m.q >= 0)
+
+    # Variables without a value and variables in the exception list stay free
+    fixed_variables = fix_variables(m, exception_list=["q"])
+    assert fixed_variables == [m.x[1], m.y]
+    assert m.y.value == 1
+    assert not m.z.fixed and not m.q.fixed
+
+    # Only constraints without free variables are deactivated
+    assert deactivate_fixed_constraints(m) == [m.c1]
+    assert m.c2.active
+
+    # Variables that were fixed before are not freed
+    unfix_variables(fixed_variables)
+    assert not m.x[1].fixed and not m.y.fixed
+    assert m.x[2].fixed
+
+
+def test_bound_variables():
+    m = pyo.ConcreteModel()
+    m.x = pyo.Var([1, 2], bounds=(0, 150), initialize=100)
+    m.y = pyo.Var(within=pyo.Binary, initialize=0.9999)
+    m.z = pyo.Var()
+    m.q = pyo.Var(initialize=1)
+    m.x[2].fix(3)
+
+    # Variables without a value and variables in the exception list are unchanged
+    changed = bound_variables(m, exception_list=["q"], relative_bound=0.01)
+    assert [v for v, _, _ in changed] == [m.x[1], m.y]
+    assert m.x[1].lb == pytest.approx(99) and m.x[1].ub == pytest.approx(101)
+    assert not m.x[1].fixed
+    assert m.y.fixed and m.y.value == 1
+    assert not m.z.fixed and m.q.lb is None
+
+    # The bounds of the changed variables are restored
+    restore_variables(changed)
+    assert m.x[1].lb == 0 and m.x[1].ub == 150
+    assert not m.y.fixed
+    assert m.x[2].fixed
+
+
+############################
+def test_convert_values():
+    conversions = {}
+    values = [None, 0, 1.5, "Error", 7]
+    converted = _convert_values(
+        values,
+        pyo.units.koil_bbl / pyo.units.week,
+        pyo.units.oil_bbl / pyo.units.day,
+        conversions,
+    )
+    assert converted[0] is None
+    assert converted[3] == "Error"
+    assert converted[1:3] + converted[4:] == pytest.approx([0, 1500 / 7, 1000])
+    assert len(conversions) == 1
+
+
 ############################
 def test_data_check():
     # Check that MissingDataError is correctly raised
@@ -473,7 +549,7 @@ def test_infeasibility_check():
         )
 
 
-def test_plot_network():
+def test_plot_network(tmp_path):
     with resources.path(
         "pareto.case_studies",
         "strategic_toy_case_study.xlsx",
@@ -532,7 +608,7 @@ def test_plot_network():
         plot_network(
             strategic_model,
             show_results=True,
-            save_fig="test_network.png",
+            save_fig=str(tmp_path / "test_network.png"),
             show_fig=True,
         )
     except Exception as e:
@@ -94,6 +94,50 @@ def build_sets(model):
         initialize=list(model.df_parameters["LLT"].keys()), doc="Valid Trucking Arcs"
     )
 
+    # Build adjacency (in/out neighbor) sets for piping and trucking arcs so
+    # that balance and capacity rules only visit the arcs incident to a node
+    # instead of scanning every location. Neighbors are kept in the order of
+    # s_L so that the resulting expressions are identical to a full scan.
+    location_order = {l: i for i, l in enumerate(model.s_L)}
+    piping_in = {l: [] for l in model.s_L}
+    piping_out = {l: [] for l in model.s_L}
+    for l, l_tilde in model.s_LLA:
+        piping_in[l_tilde].append(l)
+        piping_out[l].append(l_tilde)
+    trucking_in = {l: [] for l in model.s_L}
+    trucking_out = {l: [] for l in model.s_L}
+    for l, l_tilde in model.s_LLT:
+        trucking_in[l_tilde].append(l)
+        trucking_out[l].append(l_tilde)
+    for adjacency in (piping_in, piping_out, trucking_in, trucking_out):
+        for neighbors in adjacency.values():
+            neighbors.sort(key=location_order.get)
+
+    model.s_PipingIn = Set(
+        model.s_L,
+        initialize=piping_in,
+        within=model.s_L,
+        doc="Locations with a valid piping arc into each location",
+    )
+    model.s_PipingOut = Set(
+        model.s_L,
+        initialize=piping_out,
+        within=model.s_L,
+        doc="Locations with a valid piping arc out of each location",
+    )
+    model.s_TruckingIn = Set(
+        model.s_L,
+        initialize=trucking_in,
+        within=model.s_L,
+        doc="Locations with a valid trucking arc into each location",
+    )
+    model.s_TruckingOut = Set(
+        model.s_L,
+        initialize=trucking_out,
+        within=model.s_L,
+        doc="Locations with a valid trucking arc out of each location",
+    )
+
     # Build sets specific to operational model
     if model.type == "operational":
         model.s_A = Set(
@@ -562,30 +606,29 @@ def build_common_params(model):
         # Set economic penalties for pipeline operational cost based on the
         # elevation changes.
         for k1 in model.s_L:
-            for k2 in model.s_L:
-                if (k1, k2) in model.s_LLA:
-                    elevation_delta = value(model.p_zeta_Elevation[k1]) - value(
-                        model.p_zeta_Elevation[k2]
-                    )
-                    p_pi_Pipeline_init[(k1, k2)] = max(
-                        0,
-                        (
-                            model.df_parameters["PipelineOperationalCost"][(k1, k2)]
-                            - (
-                                0.01
-                                * max(
-                                    [
-                                        val
-                                        for val in model.df_parameters[
-                                            "PipelineOperationalCost"
-                                        ].values()
-                                    ]
-                                )
-                                * elevation_delta
-                                / max_elevation_change
+            for k2 in model.s_PipingOut[k1]:
+                elevation_delta = value(model.p_zeta_Elevation[k1]) - value(
+                    model.p_zeta_Elevation[k2]
+                )
+                p_pi_Pipeline_init[(k1, k2)] = max(
+                    0,
+                    (
+                        model.df_parameters["PipelineOperationalCost"][(k1, k2)]
+                        - (
+                            0.01
+                            * max(
+                                [
+                                    val
+                                    for val in model.df_parameters[
+                                        "PipelineOperationalCost"
+                                    ].values()
+                                ]
                             )
-                        ),
-                    )
+                            * elevation_delta
+                            / max_elevation_change
+                        )
+                    ),
+                )
     else:
         p_pi_Pipeline_init = model.df_parameters["PipelineOperationalCost"]
 
@@ -808,14 +851,16 @@ def build_common_vars(model):
     """Build variables common to operational and strategic models."""
 
     # Some variables are only slightly different between the operational and
-    # strategic models, e.g., the tab name used for initialization.
-    if model.type == "strategic":
+    # strategic models, e.g., the tab name used for initialization. Unless
+    # the sparse_arcs option is selected, the strategic model indexes the arc
+    # variables over all pairs of locations.
+    if model.type == "strategic" and not model.config.sparse_arcs:
         v_C_Piped_idx = (model.s_L, model.s_L, model.s_T)
         v_C_Trucked_idx = (model.s_L, model.s_L, model.s_T)
         v_F_Capacity_idx = (model.s_L, model.s_L)
         v_S_PipelineCapacity_idx = (model.s_L, model.s_L)
         vb_y_Flow_idx = (model.s_L, model.s_L, model.s_T)
-    else:  # operational model
+    else:  # operational model or strategic model with sparse arcs
         v_C_Piped_idx = (model.s_LLA, model.s_T)
         v_C_Trucked_idx = (model.s_LLT, model.s_T)
         v_F_Capacity_idx = (model.s_LLA,)
@@ -1140,19 +1185,67 @@ def build_common_vars(model):
 def build_common_constraints(model):
     """Build constraints common to operational and strategic models."""
 
+    # Arc constraints are indexed over pairs of locations and skip the pairs
+    # that are not valid arcs. With sparse arcs, they are instead indexed over
+    # the valid arcs directly, restricted to the same origin and destination
+    # location types.
+    sparse_arcs = model.type == "strategic" and model.config.sparse_arcs
+    if sparse_arcs:
+        bidirectional_flow_idx = (
+            Set(
+                initialize=[
+                    (l, l_tilde)
+                    for (l, l_tilde) in model.s_LLA
+                    if l not in model.s_F
+                    and l not in model.s_O
+                    and l_tilde not in model.s_F
+                ],
+                dimen=2,
+            ),
+            model.s_T,
+        )
+        pipeline_capacity_expansion_idx = (model.s_LLA,)
+        piped_arc_idx = (
+            Set(
+                initialize=[
+                    (l, l_tilde)
+                    for (l, l_tilde) in model.s_LLA
+                    if l not in model.s_O
+                    and l not in model.s_K
+                    and l_tilde not in model.s_F
+                ],
+                dimen=2,
+            ),
+            model.s_T,
+        )
+        trucked_arc_idx = (model.s_LLT, model.s_T)
+    else:
+        bidirectional_flow_idx = (
+            (model.s_L - model.s_F - model.s_O),
+            (model.s_L - model.s_F),
+            model.s_T,
+        )
+        pipeline_capacity_expansion_idx = (model.s_L, model.s_L)
+        piped_arc_idx = (
+            (model.s_L - model.s_O - model.s_K),
+            (model.s_L - model.s_F),
+            model.s_T,
+        )
+        trucked_arc_idx = (model.s_L, model.s_L, model.s_T)
+
     def CompletionsPadDemandBalanceRule(model, p, t):
         expr = (
             sum(
                 model.v_F_Piped[l, p, t]
-                for l in (model.s_L - model.s_F)
-                if (l, p) in model.s_LLA
-            )
-            + sum(
-                model.v_F_Sourced[f, p, t] for f in model.s_F if (f, p) in model.s_LLA
+                for l in model.s_PipingIn[p]
+                if l not in model.s_F
             )
             + sum(
-                model.v_F_Trucked[l, p, t] for l in model.s_L if (l, p) in model.s_LLT
+                model.v_F_Sourced[f, p, t]
+                for f in model.s_PipingIn[p]
+                if f in model.s_F
             )
+            + sum(model.v_F_Trucked[l, p, t] for l in model.s_TruckingIn[p])
             + model.v_F_PadStorageOut[p, t]
             - model.v_F_PadStorageIn[p, t]
             + model.v_S_FracDemand[p, t]
@@ -1228,8 +1321,16 @@ def build_common_constraints(model):
 
     def ExternalWaterSourcingCapacityRule(model, f, t):
         constraint = (
-            sum(model.v_F_Sourced[f, p, t] for p in model.s_CP if model.p_FCA[f, p])
-            + sum(model.v_F_Trucked[f, p, t] for p in model.s_CP if model.p_FCT[f, p])
+            sum(
+                model.v_F_Sourced[f, p, t]
+                for p in model.s_PipingOut[f]
+                if p in model.s_CP and model.p_FCA[f, p]
+            )
+            + sum(
+                model.v_F_Trucked[f, p, t]
+                for p in model.s_TruckingOut[f]
+                if p in model.s_CP and model.p_FCT[f, p]
+            )
             <= model.p_sigma_ExternalWater[f, t]
         )
 
@@ -1244,7 +1345,7 @@ def build_common_constraints(model):
 
     def CompletionsPadTruckOffloadingCapacityRule(model, p, t):
         constraint = (
-            sum(model.v_F_Trucked[l, p, t] for l in model.s_L if (l, p) in model.s_LLT)
+            sum(model.v_F_Trucked[l, p, t] for l in model.s_TruckingIn[p])
             <= model.p_sigma_OffloadingPad[p]
         )
 
@@ -1259,7 +1360,7 @@ def build_common_constraints(model):
 
     def StorageSiteTruckOffloadingCapacityRule(model, s, t):
         constraint = (
-            sum(model.v_F_Trucked[l, s, t] for l in model.s_L if (l, s) in model.s_LLT)
+            sum(model.v_F_Trucked[l, s, t] for l in model.s_TruckingIn[s])
             <= model.p_sigma_OffloadingStorage[s]
         )
 
@@ -1274,10 +1375,8 @@ def build_common_constraints(model):
 
     def StorageSiteProcessingCapacityRule(model, s, t):
         constraint = (
-            sum(model.v_F_Piped[l, s, t] for l in model.s_L if (l, s) in model.s_LLA)
-            + sum(
-                model.v_F_Trucked[l, s, t] for l in model.s_L if (l, s) in model.s_LLT
-            )
+            sum(model.v_F_Piped[l, s, t] for l in model.s_PipingIn[s])
+            + sum(model.v_F_Trucked[l, s, t] for l in model.s_TruckingIn[s])
             <= model.p_sigma_ProcessingStorage[s]
         )
 
@@ -1298,10 +1397,8 @@ def build_common_constraints(model):
 
         constraint = (
             prod_var
-            == sum(model.v_F_Piped[p, l, t] for l in model.s_L if (p, l) in model.s_LLA)
-            + sum(
-                model.v_F_Trucked[p, l, t] for l in model.s_L if (p, l) in model.s_LLT
-            )
+            == sum(model.v_F_Piped[p, l, t] for l in model.s_PipingOut[p])
+            + sum(model.v_F_Trucked[p, l, t] for l in model.s_TruckingOut[p])
             + model.v_S_Production[p, t]
         )
         return process_constraint(constraint)
@@ -1321,10 +1418,8 @@ def build_common_constraints(model):
 
         constraint = (
             prod_var
-            == sum(model.v_F_Piped[p, l, t] for l in model.s_L if (p, l) in model.s_LLA)
-            + sum(
-                model.v_F_Trucked[p, l, t] for l in model.s_L if (p, l) in model.s_LLT
-            )
+            == sum(model.v_F_Piped[p, l, t] for l in model.s_PipingOut[p])
+            + sum(model.v_F_Trucked[p, l, t] for l in model.s_TruckingOut[p])
             + model.v_S_Flowback[p, t]
         )
 
@@ -1343,9 +1438,9 @@ def build_common_constraints(model):
         if hasattr(model, "s_MidstreamReceipt") and n in model.s_MidstreamReceipt:
             return Constraint.Skip
 
-        constraint = sum(
-            model.v_F_Piped[l, n, t] for l in model.s_L if (l, n) in model.s_LLA
-        ) == sum(model.v_F_Piped[n, l, t] for l in model.s_L if (n, l) in model.s_LLA)
+        constraint = sum(model.v_F_Piped[l, n, t] for l in model.s_PipingIn[n]) == sum(
+            model.v_F_Piped[n, l, t] for l in model.s_PipingOut[n]
+        )
 
         return process_constraint(constraint)
 
@@ -1363,9 +1458,7 @@ def build_common_constraints(model):
             return Constraint.Skip
 
     model.BidirectionalFlow1 = Constraint(
-        (model.s_L - model.s_F - model.s_O),
-        (model.s_L - model.s_F),
-        model.s_T,
+        *bidirectional_flow_idx,
         rule=BidirectionalFlowRule1,
         doc="Bi-directional flow",
     )
@@ -1381,9 +1474,7 @@ def build_common_constraints(model):
             return Constraint.Skip
 
     model.BidirectionalFlow2 = Constraint(
-        (model.s_L - model.s_F - model.s_O),
-        (model.s_L - model.s_F),
-        model.s_T,
+        *bidirectional_flow_idx,
         rule=BidirectionalFlowRule2,
         doc="Bi-directional flow",
     )
@@ -1396,14 +1487,10 @@ def build_common_constraints(model):
 
         expr = (
             expr
-            + sum(model.v_F_Piped[l, s, t] for l in model.s_L if (l, s) in model.s_LLA)
-            + sum(
-                model.v_F_Trucked[l, s, t] for l in model.s_L if (l, s) in model.s_LLT
-            )
-            - sum(model.v_F_Piped[s, l, t] for l in model.s_L if (s, l) in model.s_LLA)
-            - sum(
-                model.v_F_Trucked[s, l, t] for l in model.s_L if (s, l) in model.s_LLT
-            )
+            + sum(model.v_F_Piped[l, s, t] for l in model.s_PipingIn[s])
+            + sum(model.v_F_Trucked[l, s, t] for l in model.s_TruckingIn[s])
+            - sum(model.v_F_Piped[s, l, t] for l in model.s_PipingOut[s])
+            - sum(model.v_F_Trucked[s, l, t] for l in model.s_TruckingOut[s])
         )
 
         if model.type == "strategic":
@@ -1452,8 +1539,7 @@ def build_common_constraints(model):
             return Constraint.Skip
 
     model.PipelineCapacityExpansion = Constraint(
-        model.s_L,
-        model.s_L,
+        *pipeline_capacity_expansion_idx,
         rule=PipelineCapacityExpansionRule,
         doc="Pipeline capacity construction/expansion",
     )
@@ -1468,9 +1554,7 @@ def build_common_constraints(model):
             return Constraint.Skip
 
     model.PipelineCapacity = Constraint(
-        (model.s_L - model.s_O - model.s_K),
-        (model.s_L - model.s_F),
-        model.s_T,
+        *piped_arc_idx,
         rule=PipelineCapacityRule,
         doc="Pipeline capacity",
     )
@@ -1520,10 +1604,8 @@ def build_common_constraints(model):
 
     def DisposalCapacityRule(model, k, t):
         constraint = (
-            sum(model.v_F_Piped[l, k, t] for l in model.s_L if (l, k) in model.s_LLA)
-            + sum(
-                model.v_F_Trucked[l, k, t] for l in model.s_L if (l, k) in model.s_LLT
-            )
+            sum(model.v_F_Piped[l, k, t] for l in model.s_PipingIn[k])
+            + sum(model.v_F_Trucked[l, k, t] for l in model.s_TruckingIn[k])
             <= model.v_D_Capacity[k]
         )
         return process_constraint(constraint)
@@ -1533,9 +1615,9 @@ def build_common_constraints(model):
     )
 
     def TreatmentCapacityRule(model, r, t):
-        LHS = sum(
-            model.v_F_Piped[l, r, t] for l in model.s_L if (l, r) in model.s_LLA
-        ) + sum(model.v_F_Trucked[l, r, t] for l in model.s_L if (l, r) in model.s_LLT)
+        LHS = sum(model.v_F_Piped[l, r, t] for l in model.s_PipingIn[r]) + sum(
+            model.v_F_Trucked[l, r, t] for l in model.s_TruckingIn[r]
+        )
         RHS = model.v_S_TreatmentCapacity[r]
         if model.type == "strategic":
             RHS = RHS + model.v_T_Capacity[r]
@@ -1585,8 +1667,8 @@ def build_common_constraints(model):
                 sum(
                     sum(
                         model.v_F_Sourced[f, p, t]
-                        for f in model.s_F
-                        if model.p_FCA[f, p]
+                        for f in model.s_PipingIn[p]
+                        if f in model.s_F and model.p_FCA[f, p]
                     )
                     for p in model.s_CP
                 )
@@ -1596,8 +1678,8 @@ def build_common_constraints(model):
                 sum(
                     sum(
                         model.v_F_Trucked[f, p, t]
-                        for f in model.s_F
-                        if model.p_FCT[f, p]
+                        for f in model.s_TruckingIn[p]
+                        if f in model.s_F and model.p_FCT[f, p]
                     )
                     for p in model.s_CP
                 )
@@ -1616,14 +1698,8 @@ def build_common_constraints(model):
         constraint = (
             model.v_C_Disposal[k, t]
             == (
-                sum(
-                    model.v_F_Piped[l, k, t] for l in model.s_L if (l, k) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[l, k, t]
-                    for l in model.s_L
-                    if (l, k) in model.s_LLT
-                )
+                sum(model.v_F_Piped[l, k, t] for l in model.s_PipingIn[k])
+                + sum(model.v_F_Trucked[l, k, t] for l in model.s_TruckingIn[k])
             )
             * model.p_pi_Disposal[k]
         )
@@ -1664,13 +1740,13 @@ def build_common_constraints(model):
             (
                 sum(
                     model.v_F_Piped[l, p, t]
-                    for l in (model.s_L - model.s_F)
-                    if (l, p) in model.s_LLA
+                    for l in model.s_PipingIn[p]
+                    if l not in model.s_F
                 )
                 + sum(
                     model.v_F_Trucked[l, p, t]
-                    for l in (model.s_L - model.s_F)
-                    if (l, p) in model.s_LLT
+                    for l in model.s_TruckingIn[p]
+                    if l not in model.s_F
                 )
             )
             * model.p_pi_Reuse[p]
@@ -1714,21 +1790,27 @@ def build_common_constraints(model):
             return Constraint.Skip
 
     model.PipingCost = Constraint(
-        (model.s_L - model.s_O - model.s_K),
-        (model.s_L - model.s_F),
-        model.s_T,
+        *piped_arc_idx,
         rule=PipingCostRule,
         doc="Piping cost",
     )
 
     def TotalPipingCostRule(model):
+        if sparse_arcs:
+            constraint = model.v_C_TotalPiping == sum(
+                model.v_C_Piped[l, l_tilde, t]
+                for (l, l_tilde) in piped_arc_idx[0]
+                for t in model.s_T
+            )
+            return process_constraint(constraint)
+
         constraint = model.v_C_TotalPiping == (
             sum(
                 sum(
                     sum(
                         model.v_C_Piped[l, l_tilde, t]
-                        for l in (model.s_L - model.s_O - model.s_K)
-                        if (l, l_tilde) in model.s_LLA
+                        for l in model.s_PipingIn[l_tilde]
+                        if l not in model.s_O and l not in model.s_K
                     )
                     for l_tilde in (model.s_L - model.s_F)
                 )
@@ -1744,14 +1826,8 @@ def build_common_constraints(model):
     def StorageDepositCostRule(model, s, t):
         constraint = model.v_C_Storage[s, t] == (
             (
-                sum(
-                    model.v_F_Piped[l, s, t] for l in model.s_L if (l, s) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[l, s, t]
-                    for l in model.s_L
-                    if (l, s) in model.s_LLT
-                )
+                sum(model.v_F_Piped[l, s, t] for l in model.s_PipingIn[s])
+                + sum(model.v_F_Trucked[l, s, t] for l in model.s_TruckingIn[s])
             )
             * model.p_pi_Storage[s]
         )
@@ -1775,14 +1851,8 @@ def build_common_constraints(model):
     def StorageWithdrawalCreditRule(model, s, t):
         constraint = model.v_R_Storage[s, t] == (
             (
-                sum(
-                    model.v_F_Piped[s, l, t] for l in model.s_L if (s, l) in model.s_LLA
-                )
-                + sum(
-                    model.v_F_Trucked[s, l, t]
-                    for l in model.s_L
-                    if (s, l) in model.s_LLT
-                )
+                sum(model.v_F_Piped[s, l, t] for l in model.s_PipingOut[s])
+                + sum(model.v_F_Trucked[s, l, t] for l in model.s_TruckingOut[s])
             )
             * model.p_rho_Storage[s]
         )
@@ -1821,17 +1891,24 @@ def build_common_constraints(model):
             return Constraint.Skip
 
     model.TruckingCost = Constraint(
-        model.s_L, model.s_L, model.s_T, rule=TruckingCostRule, doc="Trucking cost"
+        *trucked_arc_idx, rule=TruckingCostRule, doc="Trucking cost"
     )
 
     def TotalTruckingCostRule(model):
+        if sparse_arcs:
+            constraint = model.v_C_TotalTrucking == sum(
+                model.v_C_Trucked[l, l_tilde, t]
+                for (l, l_tilde) in model.s_LLT
+                for t in model.s_T
+            )
+            return process_constraint(constraint)
+
         constraint = model.v_C_TotalTrucking == (
             sum(
                 sum(
                     sum(
                         model.v_C_Trucked[l, l_tilde, t]
-                        for l in model.s_L
-                        if (l, l_tilde) in model.s_LLT
+                        for l in model.s_TruckingIn[l_tilde]
                     )
                     for l_tilde in model.s_L
                 )
@@ -1864,14 +1941,21 @@ def build_common_constraints(model):
                 sum(model.v_S_Flowback[p, t] * model.p_psi_Flowback for p in model.s_CP)
                 for t in model.s_T
             )
-            + sum(
+            + (
                 sum(
                     model.v_S_PipelineCapacity[l, l_tilde]
                     * model.p_psi_PipelineCapacity
-                    for l in model.s_L
-                    if (l, l_tilde) in model.s_LLA
+                    for (l, l_tilde) in model.s_LLA
+                )
+                if sparse_arcs
+                else sum(
+                    sum(
+                        model.v_S_PipelineCapacity[l, l_tilde]
+                        * model.p_psi_PipelineCapacity
+                        for l in model.s_PipingIn[l_tilde]
+                    )
+                    for l_tilde in model.s_L
                 )
-                for l_tilde in model.s_L
             )
             + sum(
                 model.v_S_StorageCapacity[s] * model.p_psi_StorageCapacity
@@ -1897,13 +1981,11 @@ def build_common_constraints(model):
 
     def ReuseDestinationDeliveriesRule(model, p, t):
         constraint = model.v_F_ReuseDestination[p, t] == sum(
-            model.v_F_Piped[l, p, t]
-            for l in (model.s_L - model.s_F)
-            if (l, p) in model.s_LLA
+            model.v_F_Piped[l, p, t] for l in model.s_PipingIn[p] if l not in model.s_F
         ) + sum(
             model.v_F_Trucked[l, p, t]
-            for l in (model.s_L - model.s_F)
-            if (l, p) in model.s_LLT
+            for l in model.s_TruckingIn[p]
+            if l not in model.s_F
         )
 
         return process_constraint(constraint)
@@ -1917,8 +1999,8 @@ def build_common_constraints(model):
 
     def DisposalDestinationDeliveriesRule(model, k, t):
         constraint = model.v_F_DisposalDestination[k, t] == sum(
-            model.v_F_Piped[l, k, t] for l in model.s_L if (l, k) in model.s_LLA
-        ) + sum(model.v_F_Trucked[l, k, t] for l in model.s_L if (l, k) in model.s_LLT)
+            model.v_F_Piped[l, k, t] for l in model.s_PipingIn[k]
+        ) + sum(model.v_F_Trucked[l, k, t] for l in model.s_TruckingIn[k])
 
         return process_constraint(constraint)
 
@@ -1931,8 +2013,8 @@ def build_common_constraints(model):
 
     def BeneficialReuseDeliveriesRule(model, o, t):
         constraint = model.v_F_BeneficialReuseDestination[o, t] == sum(
-            model.v_F_Piped[l, o, t] for l in model.s_L if (l, o) in model.s_LLA
-        ) + sum(model.v_F_Trucked[l, o, t] for l in model.s_L if (l, o) in model.s_LLT)
+            model.v_F_Piped[l, o, t] for l in model.s_PipingIn[o]
+        ) + sum(model.v_F_Trucked[l, o, t] for l in model.s_TruckingIn[o])
         return process_constraint(constraint)
 
     model.BeneficialReuseDeliveries = Constraint(
@@ -17,7 +17,12 @@ format that Pyomo requires
 Authors: PARETO Team (Andres J. Calderon, Markus G. Drouven)
 """
 
+import functools
+import hashlib
 import logging
+import os
+import pickle
+import re
 import time
 import warnings
 from pathlib import Path
@@ -27,10 +32,13 @@ from typing import List
 from typing import Union
 
 import pandas as pd
+from pandas.io.parsers import TextParser
 import requests
 import numpy as np
 import warnings
 
+from pareto import __version__
+
 _logger = logging.getLogger(__name__)
 
 
@@ -238,12 +246,6 @@ def get_valid_input_parameter_tab_names(model_type):
     return valid_input_param
 
 
-try:
-    _dataframe_map = pd.DataFrame.map
-except AttributeError:
-    # compatibility with pandas 2.0.x
-    _dataframe_map = pd.DataFrame.applymap
-
 try:
     pd.set_option("future.no_silent_downcasting", True)
 except pd.errors.OptionError:
@@ -273,24 +275,184 @@ class DataLoadingError(ValueError):
         return lines
 
 
+# pd.read_excel() keyword arguments that define the Set and Parameter views of a sheet
+_set_sheet_kwargs = dict(
+    header=0,
+    index_col=None,
+    usecols=[0],
+    dtype="string",
+    keep_default_na=False,
+)
+_parameter_sheet_kwargs = dict(
+    header=1,
+    index_col=None,
+    usecols=None,
+    keep_default_na=False,
+)
+
+
+def _grid_to_df(grid: List[list], **kwargs) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Convert the raw cell grid of a sheet into a data frame. The grid is handed to
+    the same parser pd.read_excel() uses internally, so the result is identical to
+    reading the sheet again with the given keyword arguments.
+    """
+    if not grid:
+        # pd.read_excel() returns an empty data frame for sheets without data
+        return pd.DataFrame()
+    return TextParser(grid, skip_blank_lines=False, **kwargs).read().squeeze("columns")
+
+
+def _parse_csv_cell(val):
+    """
+    Convert the text of a CSV parameter value cell into an int or a float if it holds
+    a number.
+    """
+    if not isinstance(val, str) or not _number_pattern.fullmatch(val):
+        return val
+    try:
+        return int(val)
+    except ValueError:
+        return float(val)
+
+
+# Integer and decimal numbers, optionally in scientific notation
+_number_pattern = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+
+class _TableDirectory:
+    """
+    Directory with one CSV or Parquet file per input tab, named after the tab (e.g.
+    CompletionsDemand.csv or CompletionsDemand.parquet). Each file holds the table of
+    its tab with the header in the first row, i.e., the description row that sits above
+    the header of Parameter tabs in Excel workbooks is omitted.
+    """
+
+    suffixes = (".csv", ".parquet")
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.files = {}
+        for file in sorted(self.path.iterdir()):
+            if file.suffix.lower() not in self.suffixes:
+                continue
+            if file.stem in self.files:
+                raise ValueError(
+                    f"Input tab {file.stem!r} is provided by more than one file "
+                    f"in {self.path}"
+                )
+            self.files[file.stem] = file
+        self.sheet_names = list(self.files)
+
+    def read_grid(self, sheet_name: str) -> List[list]:
+        file = self.files[sheet_name]
+        if file.suffix.lower() == ".csv":
+            try:
+                df = pd.read_csv(
+                    file,
+                    header=None,
+                    dtype=object,
+                    keep_default_na=False,
+                    skip_blank_lines=False,
+                )
+            except pd.errors.EmptyDataError:
+                return []
+            # CSV cells are read as text, the numbers in parameter value columns are
+            # converted once the index columns are known (see _read_data())
+            return df.values.tolist()
+        df = pd.read_parquet(file)
+        # Missing values become empty cells, just like blank cells in Excel
+        values = df.astype(object).where(df.notna(), "")
+        return [list(df.columns)] + values.values.tolist()
+
+
+def _is_csv_tab(src, sheet_name):
+    """
+    Return True if the tab is read from a CSV file of a table directory
+    """
+    return (
+        isinstance(src, _TableDirectory)
+        and sheet_name in src.files
+        and src.files[sheet_name].suffix.lower() == ".csv"
+    )
+
+
+def _open_input(src):
+    """
+    Open the input data source: a directory of per-tab CSV/Parquet files or an Excel
+    workbook.
+    """
+    if isinstance(src, (str, os.PathLike)) and Path(src).is_dir():
+        return _TableDirectory(src)
+    return pd.ExcelFile(src)
+
+
+def _read_excel_grid(file: pd.ExcelFile, sheet_name: str) -> List[list]:
+    """
+    Read the raw cell grid of an Excel sheet, without interpreting any header.
+    """
+    return pd.read_excel(
+        file,
+        sheet_name=sheet_name,
+        header=None,
+        dtype=object,
+        keep_default_na=False,
+    ).values.tolist()
+
+
 def _sheets_to_dfs(
-    src: Union[str, Path],
+    src: Union[str, Path, pd.ExcelFile, _TableDirectory],
+    set_sheet_names: Iterable[str],
+    parameter_sheet_names: Iterable[str],
     raises: bool = True,
-    **kwargs,
-) -> Dict[str, pd.DataFrame]:
-    out = {}
+) -> List[Dict[str, Union[pd.DataFrame, pd.Series]]]:
+    """
+    Parse every Set and Parameter sheet in the input exactly once into a raw cell
+    grid and derive both views from it:
+    - Sets: column A, with the header in row 1
+    - Parameters: all columns, with the header in row 2 (row 1 for table files)
+    Sheets that are neither a Set nor a Parameter tab are not parsed.
+    """
+    set_sheet_names = set(set_sheet_names)
+    parameter_sheet_names = set(parameter_sheet_names)
+    if not isinstance(src, (pd.ExcelFile, _TableDirectory)):
+        src = _open_input(src)
+    if isinstance(src, _TableDirectory):
+        read_grid = src.read_grid
+        parameter_sheet_kwargs = dict(_parameter_sheet_kwargs, header=0)
+    else:
+        read_grid = functools.partial(_read_excel_grid, src)
+        parameter_sheet_kwargs = _parameter_sheet_kwargs
+    sets = {}
+    parameters = {}
     failed = {}
-    file = pd.ExcelFile(src)
-    for sheet_name in file.sheet_names:
+    for sheet_name in src.sheet_names:
+        views = []
+        if sheet_name in set_sheet_names:
+            views.append((sets, _set_sheet_kwargs))
+        if sheet_name in parameter_sheet_names:
+            views.append((parameters, parameter_sheet_kwargs))
+        if not views:
+            continue
+
         try:
-            df = pd.read_excel(file, sheet_name=sheet_name, **kwargs).squeeze("columns")
+            grid = read_grid(sheet_name)
         except Exception as e:
             _logger.warning("Loading failed for sheet %r: %r", sheet_name, e)
             _logger.info("An empty dataframe will be used as fallback.")
             failed[sheet_name] = e
-            df = pd.DataFrame()
-        finally:
-            out[sheet_name] = df
+            grid = []
+
+        for out, kwargs in views:
+            try:
+                df = _grid_to_df(grid, **kwargs)
+            except Exception as e:
+                _logger.warning("Loading failed for sheet %r: %r", sheet_name, e)
+                _logger.info("An empty dataframe will be used as fallback.")
+                failed[sheet_name] = e
+                df = pd.DataFrame()
+            finally:
+                out[sheet_name] = df
     if failed:
         exc = DataLoadingError(failed)
         if raises:
@@ -300,7 +462,57 @@ def _sheets_to_dfs(
                 exc.summary
                 + "\nFor these sheets, an empty dataframe is used as fallback.\n"
             )
-    return out
+    return [sets, parameters]
+
+
+# Entries and column names with these keywords are treated as proprietary data
+_proprietary_data_keywords = [
+    "PROPRIETARY DATA",
+    "proprietary data",
+    "Proprietary Data",
+]
+# Columns whose names contain these keywords are removed
+_remove_column_keywords = ["unnamed", "proprietary data"]
+# Literal "\t", "\n", "\r" sequences as well as tab, new line and carriage return
+# characters are removed from string entries
+_whitespace_pattern = r"\\[tnr]|[\t\n\r]"
+
+
+def _clean_parameter_df(df):
+    """
+    Clean a raw parameter data frame:
+    - Entries with the keyword "PROPRIETARY DATA" are replaced by an empty string
+    - Tabs and new lines are removed from string entries, which are then stripped
+    - Columns that are unnamed or named "proprietary data" are removed
+    - Rows that contain only empty strings are removed
+    Only columns holding strings are processed; numeric columns are left as is.
+    The cleaned data frame is returned together with a flag indicating whether the
+    tab contains proprietary data.
+    """
+    proprietary_data = bool(df.columns.isin(_proprietary_data_keywords).any())
+    for j in range(len(df.columns)):
+        col = df.iloc[:, j]
+        if pd.api.types.infer_dtype(col, skipna=True) not in (
+            "string",
+            "mixed",
+            "mixed-integer",
+        ):
+            continue
+        is_keyword = col.isin(_proprietary_data_keywords)
+        if is_keyword.any():
+            proprietary_data = True
+        # Non-string entries are NaN after .str operations and are kept unchanged
+        cleaned = col.str.replace(_whitespace_pattern, "", regex=True).str.strip()
+        df.isetitem(j, cleaned.where(cleaned.notna(), col).mask(is_keyword, ""))
+
+    drop_col = [
+        j
+        for j in df.columns
+        if any(x in str(j).lower() for x in _remove_column_keywords)
+    ]
+    df = df.drop(columns=drop_col)
+    df = df[~df.eq("").all(axis=1)]
+    return [df, proprietary_data]
 
 
 def _read_data(
@@ -343,8 +555,8 @@ def _read_data(
     # Check all names available in the input sheet
     # If the sheet name is unused (not a valid Set or Parameter tab, not "Overview", and not "Schematic"), raise a warning.
     unused_tab_list = []
-    df = pd.ExcelFile(_fname)
-    sheet_list = df.sheet_names
+    workbook = _open_input(_fname)
+    sheet_list = workbook.sheet_names
     for name in sheet_list:
         if (
             name not in valid_set_tab_names
@@ -371,24 +583,15 @@ def _read_data(
     _data_column = ["value"]
     proprietary_data = False
 
-    # pd.read_excel() does not support empty lists in recent versions of pandas
-    # Read all tabs in the input file
-    _df_sets = _sheets_to_dfs(
-        _fname,
+    # Each Set and Parameter tab is parsed once; tabs that are not specified by the
+    # user and are not valid PARETO inputs are skipped
+    [_df_sets, _df_parameters] = _sheets_to_dfs(
+        workbook,
+        valid_set_tab_names,
+        valid_parameter_tab_names,
         raises=raises,
-        header=0,
-        index_col=None,
-        usecols="A",
-        dtype="string",
-        keep_default_na=False,
     )
 
-    # Filter for sets - remove tabs that are not specified as sets by user and
-    # are not valid PARETO inputs
-    _df_sets = {
-        key: value for key, value in _df_sets.items() if key in valid_set_tab_names
-    }
-
     # Cleaning Sets. Checking for empty entries, and entries with the keyword: PROPRIETARY DATA
     for df in _df_sets:
         for idx, i in enumerate(_df_sets[df]):
@@ -397,25 +600,6 @@ def _read_data(
         _df_sets[df].replace("", np.nan, inplace=True)
         _df_sets[df].dropna(inplace=True)
 
-    # pd.read_excel() does not support empty lists in recent versions of pandas
-    # Read all tabs in the input file
-    _df_parameters = _sheets_to_dfs(
-        _fname,
-        raises=raises,
-        header=1,
-        index_col=None,
-        usecols=None,
-        keep_default_na=False,
-    )
-
-    # Filter for parameters - remove tabs that are not specified as parameters
-    # by user and are not valid PARETO inputs
-    _df_parameters = {
-        key: value
-        for key, value in _df_parameters.items()
-        if key in valid_parameter_tab_names
-    }
-
     # Cleaning inputs.
     # A parameter can be defined in column format or table format.
     # Detect if columns which will be used to reshape the dataframe by defining
@@ -432,41 +616,11 @@ def _read_data(
     valid_set_tab_names = list(set(valid_set_tab_names))
     _data_column = list(set(_data_column))
     generic_words = ["index", "nodes", "time", "pads", "quantity"]
-    remove_columns = ["unnamed", "proprietary data"]
-    keyword_strings = ["PROPRIETARY DATA", "proprietary data", "Proprietary Data"]
     for i in _df_parameters:
-        if proprietary_data is False:
-            proprietary_data = any(
-                x in _df_parameters[i].values.astype(str) for x in keyword_strings
-            )
-            if proprietary_data is False:
-                proprietary_data = any(
-                    x in _df_parameters[i].columns for x in keyword_strings
-                )
-        # Checking for tabs, new lines and entries with the keyword "PROPRIETARY DATA" and replacing them for an empty string
-        _df_parameters[i].replace(
-            to_replace=keyword_strings,
-            value="",
-            inplace=True,
+        [_df_parameters[i], tab_proprietary_data] = _clean_parameter_df(
+            _df_parameters[i]
         )
-        _df_parameters[i].replace(
-            to_replace=[r"\\t|\\n|\\r", "\t|\n|\r"], value="", regex=True, inplace=True
-        )
-        # Removing whitespaces
-        _df_parameters[i] = _dataframe_map(
-            _df_parameters[i], lambda x: x.strip() if isinstance(x, str) else x
-        )
-        # Removing all the columns that contain only empty strings
-        # _df_parameters[i] = _df_parameters[i][_df_parameters[i].columns[~_df_parameters[i].eq('').all(0)]]
-        # Removing columns that are unnamed or have the keyword "proprietary data" as column name
-        drop_col = [
-            i
-            for i in _df_parameters[i].columns
-            if any(x in str(i).lower() for x in remove_columns)
-        ]
-        _df_parameters[i].drop(columns=drop_col, inplace=True)
-        # Removing all the rows that contain only empty strings
-        _df_parameters[i] = _df_parameters[i][~_df_parameters[i].eq("").all(1)]
+        proprietary_data = proprietary_data or tab_proprietary_data
 
         index_col = []
         for j in _df_parameters[i].columns:
@@ -485,6 +639,14 @@ def _read_data(
         if len(index_col) != 0:
             _df_parameters[i].set_index(index_col, inplace=True)
 
+        # CSV cells are text, so the numbers in the value columns are converted to
+        # hold the same values as a workbook. Set elements and indices such as "0012"
+        # are kept as text, as in a workbook.
+        if _is_csv_tab(workbook, i):
+            values = _df_parameters[i]
+            for j in range(len(values.columns)):
+                values.isetitem(j, values.iloc[:, j].map(_parse_csv_cell))
+
     # Creating a DataFrame that contains a boolean for proprietary_data. This is used as a "flag" in
     # generate_report() to output warnings if the report contains proprietary data.
     _df_parameters["proprietary_data"] = pd.DataFrame(
@@ -536,11 +698,31 @@ def _df_to_param(data_frame, data_column, sum_repeated_indexes):
             _df_parameters[i] = _temp_df_parameters[i][data_column_key]
 
         else:
-            _df_parameters[i] = data_frame[i].stack().to_dict()
+            _df_parameters[i] = _table_to_param(data_frame[i])
 
     return _df_parameters
 
 
+def _table_to_param(data_frame):
+    """
+    This module converts a parameter in table format into {(row_index, column_header): value}.
+    Empty (NaN) cells are skipped. The result is the same as data_frame.stack().to_dict(),
+    but the stacked data frame is never built.
+    """
+    # to_numpy() upcasts mixed numeric columns to a common dtype, just like stack()
+    values = data_frame.to_numpy()
+    if values.dtype.kind not in "biufO":
+        values = data_frame.to_numpy(dtype=object)
+    rows, cols = np.nonzero(pd.notna(values))
+    index = data_frame.index[rows].tolist()
+    columns = data_frame.columns[cols].tolist()
+    if isinstance(data_frame.index, pd.MultiIndex):
+        keys = [(*idx, col) for idx, col in zip(index, columns)]
+    else:
+        keys = zip(index, columns)
+    return dict(zip(keys, values[rows, cols].tolist()))
+
+
 def get_data(
     fname,
     set_list=None,
@@ -548,9 +730,11 @@ def get_data(
     model_type="strategic",
     sum_repeated_indexes=False,
     raises: bool = False,
+    cache_dir: Union[str, Path, None] = None,
 ):
     """
     This method uses Pandas methods to read data for Sets and Parameters from excel spreadsheets.
+    fname can also be a directory with one CSV or Parquet file per tab (see export_input_tables()).
     - Sets are assumed to not have neither a header nor an index column. In addition, the data
       should be placed in column A, row 2
     - Parameters can be in either table or column format. Table format: Requires a header
@@ -567,6 +751,13 @@ def get_data(
     By default, errors encountered while performing data pre-processing are collected and displayed as warnings.
     If ``raises=True``, an exception will be raised instead.
 
+    If ``cache_dir`` is given, the processed data is stored in that directory and reused by
+    later calls with the same workbook contents, model_type, set_list, parameter_list and
+    sum_repeated_indexes. The cache is invalidated automatically when the workbook or the
+    PARETO version changes. Warnings raised while reading the workbook are not repeated when
+    the data is loaded from the cache. The cache is only used when fname is a path: other
+    inputs, e.g. file-like objects, are always read.
+
     Outputs:
     The method returns one dictionary that contains a list for each set, and one dictionary that
     contains parameters in format {`param1`:{(set1, set2): value}, `param1`:{(set1, set2): value}}
@@ -612,6 +803,21 @@ def get_data(
     on the input tab: PadWaterQuality which is indexed by QC and the Set for Air Quality Index
     "model.s_AC" is derived by the method based on the input tab AirEmissionCoefficients.
     """
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = _get_cache_file(
+            fname,
+            cache_dir,
+            set_list,
+            parameter_list,
+            model_type,
+            sum_repeated_indexes,
+        )
+    if cache_file is not None:
+        cached_data = _load_cache_file(cache_file)
+        if cached_data is not None:
+            return cached_data
+
     # Call _read_data with the correct model type
     if model_type in ["strategic", "operational", "critical_mineral", "none"]:
         # Reading raw data, two data frames are output, one for Sets, and another one for Parameters
@@ -645,9 +851,159 @@ def get_data(
     # The data frame for Parameters is preprocessed to match the format required by Pyomo
     _df_parameters = _df_to_param(_df_parameters, data_column, sum_repeated_indexes)
 
+    if cache_file is not None:
+        _write_cache_file(cache_file, [_df_sets, _df_parameters])
+
     return [_df_sets, _df_parameters]
 
 
+def _get_cache_file(
+    fname,
+    cache_dir,
+    set_list,
+    parameter_list,
+    model_type,
+    sum_repeated_indexes,
+):
+    """
+    Return the path of the cache file for the given get_data() arguments. The file name is
+    a hash of the workbook contents, the PARETO version and the arguments that affect the
+    processed data. None is returned, so that the cache is bypassed, when fname is not the
+    path of an existing workbook or directory (e.g. a file-like object).
+    """
+    if not isinstance(fname, (str, os.PathLike)) or not Path(fname).exists():
+        _logger.debug("Input data cache bypassed for %r", fname)
+        return None
+    key = hashlib.sha256()
+    if Path(fname).is_dir():
+        # File names identify the tabs, so they are part of the key as well
+        files = [(file.name, file) for file in _TableDirectory(fname).files.values()]
+    else:
+        files = [("", fname)]
+    for name, file in files:
+        key.update(name.encode())
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                key.update(chunk)
+    key.update(
+        repr(
+            (
+                __version__,
+                None if set_list is None else sorted(set(set_list)),
+                None if parameter_list is None else sorted(set(parameter_list)),
+                model_type,
+                bool(sum_repeated_indexes),
+            )
+        ).encode()
+    )
+    return Path(cache_dir) / f"{Path(fname).stem}_{key.hexdigest()}.pkl"
+
+
+def _load_cache_file(cache_file):
+    """
+    Load [df_sets, df_parameters] from a cache file. None is returned if the file does not
+    exist or cannot be read.
+    """
+    if not cache_file.is_file():
+        return None
+    try:
+        with open(cache_file, "rb") as f:
+            data = pickle.load(f)
+    except Exception as e:
+        _logger.warning("Ignoring unreadable cache file %s: %r", cache_file, e)
+        return None
+    _logger.debug("Input data loaded from cache file %s", cache_file)
+    return data
+
+
+def _write_cache_file(cache_file, data):
+    """
+    Write [df_sets, df_parameters] to a cache file. The data is written to a temporary file
+    first so that concurrent readers never see a partially written cache file.
+    """
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+
+def export_input_tables(
+    fname,
+    output_dir,
+    file_format="csv",
+    set_list=None,
+    model_type="strategic",
+):
+    """
+    This method exports every tab of a PARETO input workbook to a CSV or Parquet file in
+    output_dir, which can be passed to get_data() instead of the workbook.
+    - file_format is either 'csv' or 'parquet'. Writing Parquet files requires pyarrow or
+      fastparquet.
+    - Tabs that are valid Sets for model_type or are listed in set_list are written as is.
+      For all other tabs, the description row above the header is dropped so that the
+      header is the first row of the file. The "Overview" and "Schematic" tabs are skipped.
+
+    Numbers and text read back from CSV files are the same as in the workbook. Parquet
+    stores one type per column, so integer columns with blank cells are read back as floats
+    and columns mixing numbers and text are stored as text.
+
+    The method returns the list of files written.
+    """
+    if file_format not in ("csv", "parquet"):
+        raise ValueError(
+            f"Invalid file format {file_format!r}. Valid formats: 'csv', 'parquet'"
+        )
+    set_tab_names = set(get_valid_input_set_tab_names(model_type))
+    if set_list is not None:
+        set_tab_names.update(set_list)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workbook = pd.ExcelFile(fname)
+    output_files = []
+    for sheet_name in workbook.sheet_names:
+        if sheet_name in ("Overview", "Schematic"):
+            continue
+        grid = _read_excel_grid(workbook, sheet_name)
+        if sheet_name not in set_tab_names:
+            grid = grid[1:]
+
+        output_file = output_dir / f"{sheet_name}.{file_format}"
+        if file_format == "csv":
+            pd.DataFrame(grid).to_csv(output_file, header=False, index=False)
+        else:
+            _grid_to_parquet(grid, output_file)
+        output_files.append(output_file)
+
+    return output_files
+
+
+def _grid_to_parquet(grid, output_file):
+    """
+    Write a cell grid whose first row is the header to a Parquet file. Column names are
+    de-duplicated the same way pd.read_excel() does, and blank cells are stored as nulls.
+    """
+    if not grid:
+        pd.DataFrame().to_parquet(output_file)
+        return
+    df = TextParser(
+        grid, header=0, skip_blank_lines=False, keep_default_na=False
+    ).read()
+    df.columns = df.columns.astype(str)
+    for j in range(len(df.columns)):
+        col = df.iloc[:, j]
+        if col.dtype != object:
+            continue
+        col = col.mask(col.eq(""), None)
+        # Parquet columns hold a single type; columns mixing strings and numbers are
+        # stored as strings
+        if pd.api.types.infer_dtype(col, skipna=True) in ("mixed", "mixed-integer"):
+            col = col.mask(col.notna(), col.astype(str))
+        df.isetitem(j, col)
+    df.to_parquet(output_file, index=False)
+
+
 def set_consistency_check(param, *args):
     """
     Purpose:    This method checks if the elements included in a table or parameter have been defined as part of the
@@ -13,10 +13,12 @@
 
 ###--- Imports ---###
 from pyomo.environ import (
+    Constraint,
     Var,
     Binary,
     units as pyunits,
 )
+from pyomo.core.expr.visitor import identify_variables
 import logging
 
 _log = logging.getLogger(__name__)
@@ -49,6 +51,98 @@ def free_variables(model, exception_list=None, time_period=None):
     return None
 
 
+# fix variables at their current values
+def fix_variables(model, exception_list=None):
+    """
+    Fix every free variable of the model that has a value to that value, with integer
+    and binary variables rounded to the nearest integer. Variables of the components
+    named in exception_list are left free. Returns the fixed variables, so that only
+    these are freed again with unfix_variables().
+    """
+    exception_list = set() if exception_list is None else set(exception_list)
+    fixed_variables = []
+    for var in model.component_objects(Var):
+        if var.name in exception_list:
+            continue
+        for index_var in var.values():
+            if index_var.fixed or index_var.value is None:
+                continue
+            if index_var.is_integer():
+                index_var.fix(round(index_var.value))
+            else:
+                index_var.fix()
+            fixed_variables.append(index_var)
+    return fixed_variables
+
+
+def unfix_variables(variables):
+    for var in variables:
+        var.unfix()
+    return None
+
+
+# bound variables around their current values
+def bound_variables(model, exception_list=None, relative_bound=0.01):
+    """
+    Bound every free variable of the model that has a value to within relative_bound
+    of that value (e.g., 0.01 for +/-1%), within its existing bounds, and fix integer
+    and binary variables to their value rounded to the nearest integer. Variables of
+    the components named in exception_list are left unchanged. Returns the changed
+    variables with their previous bounds, so that these are restored with
+    restore_variables().
+    """
+    exception_list = set() if exception_list is None else set(exception_list)
+    changed = []
+    for var in model.component_objects(Var):
+        if var.name in exception_list:
+            continue
+        for index_var in var.values():
+            if index_var.fixed or index_var.value is None:
+                continue
+            changed.append((index_var, index_var.lower, index_var.upper))
+            if index_var.is_integer():
+                index_var.fix(round(index_var.value))
+                continue
+            # Values slightly outside the existing bounds are moved onto them
+            lb, ub = index_var.lb, index_var.ub
+            current = index_var.value
+            if lb is not None:
+                current = max(current, lb)
+            if ub is not None:
+                current = min(current, ub)
+            margin = relative_bound * abs(current)
+            lower, upper = current - margin, current + margin
+            index_var.setlb(lower if lb is None else max(lb, lower))
+            index_var.setub(upper if ub is None else min(ub, upper))
+    return changed
+
+
+def restore_variables(changed):
+    """
+    Free the variables returned by bound_variables() and restore their bounds
+    """
+    for var, lower, upper in changed:
+        var.unfix()
+        var.setlb(lower)
+        var.setub(upper)
+    return None
+
+
+# deactivate constraints without free variables
+def deactivate_fixed_constraints(model):
+    """
+    Deactivate the active constraints of the model in which all variables are fixed,
+    so that they are not sent to the solver. Returns the deactivated constraints, so
+    that they can be activated again.
+    """
+    deactivated = []
+    for con in model.component_data_objects(Constraint, active=True):
+        if next(identify_variables(con.body, include_fixed=False), None) is None:
+            con.deactivate()
+            deactivated.append(con)
+    return deactivated
+
+
 # deactivate slacks model
 def deactivate_slacks(model):
     model.v_C_Slack.fix(0)
@@ -21,12 +21,15 @@ Authors: PARETO Team
 """
 
 # Imports
+import math
+import numbers
 import warnings
+import pandas as pd
 from pareto.utilities.get_data import (
     get_valid_input_set_tab_names,
     get_valid_input_parameter_tab_names,
 )
-from pyomo.environ import Expression, value
+from pyomo.environ import Expression, value, units as pyunits
 
 
 def get_valid_trucking_arc_list():
@@ -690,6 +693,385 @@ def check_required_data(df_sets, df_parameters, config, model_type="strategic"):
     return (df_sets, df_parameters)
 
 
+def presolve_network(df_sets, df_parameters):
+    """
+    Remove the piping and trucking arcs that cannot carry flow in the strategic model,
+    and the production pads, external water sources and network nodes left without
+    arcs, together with their parameter data.
+
+    An arc can carry flow only if water can reach its origin from a supply (a pad
+    with production or flowback, an external water source with availability, or a
+    storage site with an initial level) and can be passed on from its destination to
+    a sink (a completions pad with demand or pad storage, or a disposal, storage,
+    treatment or beneficial reuse site with capacity or capacity expansion options).
+    As in the model parameters, missing capacity increments take a nonzero default,
+    so that a site without increments in the input data can still be expanded.
+    Network nodes, storage sites and treatment sites pass water on, while the other
+    locations only send or only receive water. Arcs with a zero entry in their arc
+    tab are removed as well. Locations that are listed in another set tab (e.g.,
+    MidstreamReceiptNodes) or that have a supply are kept.
+
+    Returns copies of df_sets and df_parameters without the removed arcs and
+    locations, and a dictionary with the lists of removed "PipelineArcs",
+    "TruckingArcs" and "Locations".
+    """
+    locations = {
+        tab: set(_set_elements(df_sets, tab))
+        for tab in [
+            "ProductionPads",
+            "CompletionsPads",
+            "ExternalWaterSources",
+            "SWDSites",
+            "StorageSites",
+            "TreatmentSites",
+            "ReuseOptions",
+            "NetworkNodes",
+        ]
+    }
+    pads = locations["ProductionPads"] | locations["CompletionsPads"]
+
+    # Locations with water to send
+    supplies = (
+        _positive_locations(df_parameters, "PadRates", pads)
+        | _positive_locations(df_parameters, "FlowbackRates", pads)
+        | _positive_locations(
+            df_parameters,
+            "ExtWaterSourcingAvailability",
+            locations["ExternalWaterSources"],
+        )
+        | _positive_locations(
+            df_parameters, "InitialStorageLevel", locations["StorageSites"]
+        )
+    )
+
+    # Locations that can receive water and keep it, or treat it
+    treatment_sites = _positive_locations(
+        df_parameters, "InitialTreatmentCapacity", locations["TreatmentSites"]
+    )
+    if _has_increment(
+        df_parameters,
+        "TreatmentCapacityIncrements",
+        [
+            (wt, j)
+            for wt in _set_elements(df_sets, "TreatmentTechnologies")
+            for j in _set_elements(df_sets, "TreatmentCapacities")
+        ],
+    ):
+        treatment_sites = locations["TreatmentSites"]
+    storage_sites = _positive_locations(
+        df_parameters, "InitialStorageCapacity", locations["StorageSites"]
+    )
+    if _has_increment(
+        df_parameters,
+        "StorageCapacityIncrements",
+        _set_elements(df_sets, "StorageCapacities"),
+    ):
+        storage_sites = locations["StorageSites"]
+    disposal_sites = {
+        k
+        for k in locations["SWDSites"]
+        if _has_increment(
+            df_parameters,
+            "DisposalCapacityIncrements",
+            [(k, i) for i in _set_elements(df_sets, "InjectionCapacities")],
+        )
+    }
+    # A beneficial reuse option without capacity data for a period is unbounded
+    reuse_capacity = df_parameters.get("ReuseCapacity", {})
+    reuse_options = {
+        o
+        for o in locations["ReuseOptions"]
+        if any(
+            reuse_capacity.get((o, t), -1) != 0
+            for t in _set_elements(df_sets, "TimePeriods")
+        )
+    }
+    sinks = (
+        _positive_locations(
+            df_parameters, "CompletionsDemand", locations["CompletionsPads"]
+        )
+        | _positive_locations(
+            df_parameters, "CompletionsPadStorage", locations["CompletionsPads"]
+        )
+        | _positive_locations(
+            df_parameters, "InitialDisposalCapacity", locations["SWDSites"]
+        )
+        | disposal_sites
+        | storage_sites
+        | treatment_sites
+        | reuse_options
+    )
+
+    transit = locations["NetworkNodes"] | locations["StorageSites"] | treatment_sites
+    can_send = supplies | transit
+    can_receive = sinks | transit
+
+    # Arcs listed in the arc tabs, mapped to True if one of their entries is nonzero
+    piping_arcs = _listed_arcs(df_parameters, get_valid_piping_arc_list())
+    trucking_arcs = _listed_arcs(df_parameters, get_valid_trucking_arc_list())
+    arcs_out = {}
+    arcs_in = {}
+    for arcs in (piping_arcs, trucking_arcs):
+        for (l, l_tilde), nonzero in arcs.items():
+            if nonzero:
+                arcs_out.setdefault(l, []).append(l_tilde)
+                arcs_in.setdefault(l_tilde, []).append(l)
+
+    # Locations water can reach from a supply
+    reached = set(supplies)
+    queue = list(supplies)
+    while queue:
+        l = queue.pop()
+        for l_tilde in arcs_out.get(l, []):
+            if l_tilde in can_receive and l_tilde not in reached:
+                reached.add(l_tilde)
+                if l_tilde in transit:
+                    queue.append(l_tilde)
+
+    # Locations water can be passed on from to a sink
+    useful = set(sinks)
+    queue = list(sinks)
+    while queue:
+        l_tilde = queue.pop()
+        for l in arcs_in.get(l_tilde, []):
+            if l in can_send and l not in useful:
+                useful.add(l)
+                if l in transit:
+                    queue.append(l)
+
+    def _usable(arcs, arc):
+        l, l_tilde = arc
+        return (
+            arcs[arc]
+            and l in reached
+            and l in can_send
+            and l_tilde in useful
+            and l_tilde in can_receive
+        )
+
+    removed_piping_arcs = [arc for arc in piping_arcs if not _usable(piping_arcs, arc)]
+    removed_trucking_arcs = [
+        arc for arc in trucking_arcs if not _usable(trucking_arcs, arc)
+    ]
+
+    # Locations left without arcs
+    connected = {
+        l
+        for arcs in (piping_arcs, trucking_arcs)
+        for arc in arcs
+        if _usable(arcs, arc)
+        for l in arc
+    }
+    listed_elsewhere = {
+        element
+        for tab in df_sets
+        if tab not in locations
+        for element in _set_elements(df_sets, tab)
+    }
+    removable = (
+        locations["ProductionPads"]
+        | locations["ExternalWaterSources"]
+        | locations["NetworkNodes"]
+    ) - supplies
+    removed_locations = removable - connected - listed_elsewhere
+
+    new_df_sets = {}
+    for tab, elements in df_sets.items():
+        if tab in locations and removed_locations:
+            if isinstance(elements, pd.Series):
+                elements = elements[~elements.isin(list(removed_locations))]
+            elif isinstance(elements, list):
+                elements = [e for e in elements if e not in removed_locations]
+        new_df_sets[tab] = elements
+
+    removed_arcs = {
+        tab: set(removed)
+        for tabs, removed in (
+            (get_valid_piping_arc_list(), removed_piping_arcs),
+            (get_valid_trucking_arc_list(), removed_trucking_arcs),
+        )
+        for tab in tabs
+    }
+    new_df_parameters = {}
+    for tab, data in df_parameters.items():
+        if tab in removed_arcs:
+            data = {arc: v for arc, v in data.items() if arc not in removed_arcs[tab]}
+        elif isinstance(data, dict) and removed_locations:
+            data = {
+                key: v
+                for key, v in data.items()
+                if not _references_locations(key, removed_locations)
+            }
+        new_df_parameters[tab] = data
+
+    removed = {
+        "PipelineArcs": removed_piping_arcs,
+        "TruckingArcs": removed_trucking_arcs,
+        "Locations": [
+            l
+            for tab in locations
+            for l in _set_elements(df_sets, tab)
+            if l in removed_locations
+        ],
+    }
+    return new_df_sets, new_df_parameters, removed
+
+
+def _set_elements(df_sets, tab):
+    # Set tabs are pandas Series, or empty dictionaries for missing tabs
+    return list(df_sets.get(tab, []))
+
+
+def _positive_locations(df_parameters, tab, candidates):
+    # Locations among candidates with a positive value in a parameter tab indexed by
+    # location first
+    positive = set()
+    for key, v in df_parameters.get(tab, {}).items():
+        location = key[0] if isinstance(key, tuple) else key
+        if location in candidates and v > 0:
+            positive.add(location)
+    return positive
+
+
+def _has_increment(df_parameters, tab, keys):
+    # True if a capacity increment in the tab is positive for one of keys. Missing
+    # increments take the nonzero default of the model parameters.
+    increments = df_parameters.get(tab, {})
+    return any(key not in increments or increments[key] > 0 for key in keys)
+
+
+def _listed_arcs(df_parameters, arc_tabs):
+    # Arcs listed in the arc tabs, in order of first appearance, mapped to True if
+    # one of their entries is nonzero
+    arcs = {}
+    for tab in arc_tabs:
+        for arc, arc_value in df_parameters.get(tab, {}).items():
+            arcs[arc] = arcs.get(arc, False) or bool(arc_value)
+    return arcs
+
+
+def _references_locations(key, locations):
+    if isinstance(key, tuple):
+        return any(k in locations for k in key)
+    return key in locations
+
+
+# Time-indexed rates for which a missing entry means zero
+_zero_default_rate_tabs = [
+    "CompletionsDemand",
+    "PadRates",
+    "FlowbackRates",
+    "ExtWaterSourcingAvailability",
+    "ReuseMinimum",
+]
+
+# Lead times in decision periods
+_lead_time_tabs = [
+    "TreatmentExpansionLeadTime",
+    "DisposalExpansionLeadTime",
+    "StorageExpansionLeadTime",
+    "PipelineExpansionLeadTime_Capac",
+]
+
+
+def aggregate_time_periods(df_sets, df_parameters, block_size):
+    """
+    Aggregate consecutive time periods of the input data into blocks of block_size
+    periods, for a smaller strategic model over the same horizon.
+
+    Each block is labelled by its first time period. The rates that default to zero
+    (e.g., PadRates and CompletionsDemand) are averaged over all periods of the
+    block, other time-indexed parameter values over the periods of the block that
+    have a value (non-numeric values are taken from the first of these periods).
+    The decision period becomes a new unit of block_size decision periods (e.g.,
+    "week_x4" for blocks of four weeks), so that the model unit conversions scale
+    rates and capacities to the block length. The lead times, which are given in
+    decision periods, are converted to blocks and rounded up to a whole block. The
+    number of time periods must be a multiple of block_size, since every block is
+    modelled with the full block length.
+
+    Returns copies of df_sets and df_parameters for the aggregated time periods,
+    and a dictionary mapping each block to the list of its time periods.
+    """
+    if not isinstance(block_size, int) or block_size < 1:
+        raise Exception("block_size must be a positive integer")
+
+    periods = _set_elements(df_sets, "TimePeriods")
+    if len(periods) % block_size != 0:
+        raise Exception(
+            f"The number of time periods ({len(periods)}) must be a multiple of "
+            f"block_size ({block_size})"
+        )
+    blocks = {
+        periods[i]: periods[i : i + block_size]
+        for i in range(0, len(periods), block_size)
+    }
+    period_block = {t: block for block, ts in blocks.items() for t in ts}
+
+    new_df_sets = dict(df_sets)
+    time_periods = df_sets["TimePeriods"]
+    if isinstance(time_periods, pd.Series):
+        new_df_sets["TimePeriods"] = time_periods[time_periods.isin(list(blocks))]
+    else:
+        new_df_sets["TimePeriods"] = list(blocks)
+
+    new_df_parameters = {}
+    for tab, data in df_parameters.items():
+        if isinstance(data, dict) and tab != "Units":
+            grouped = {}
+            time_indexed = False
+            for key, v in data.items():
+                if isinstance(key, tuple):
+                    block_key = tuple(period_block.get(k, k) for k in key)
+                else:
+                    block_key = period_block.get(key, key)
+                time_indexed = time_indexed or block_key != key
+                grouped.setdefault(block_key, []).append(v)
+            if time_indexed:
+                data = {
+                    key: _block_value(tab, key, values, blocks)
+                    for key, values in grouped.items()
+                }
+        if tab in _lead_time_tabs:
+            data = {
+                key: math.ceil(v / block_size) if isinstance(v, numbers.Number) else v
+                for key, v in data.items()
+            }
+        elif tab == "PipelineExpansionLeadTime_Dist":
+            # Lead time per unit distance, rounded up once multiplied by the distance
+            data = {
+                key: v / block_size if isinstance(v, numbers.Number) else v
+                for key, v in data.items()
+            }
+        new_df_parameters[tab] = data
+
+    # Define the unit of the aggregated time periods, unless an earlier aggregation
+    # already did
+    decision_period = df_parameters["Units"]["decision period"]
+    block_unit = f"{decision_period}_x{block_size}"
+    if not hasattr(pyunits, block_unit):
+        pyunits.load_definitions_from_strings(
+            [f"{block_unit} = {block_size} * {decision_period}"]
+        )
+    new_df_parameters["Units"] = {
+        **df_parameters["Units"],
+        "decision period": block_unit,
+    }
+    return new_df_sets, new_df_parameters, blocks
+
+
+def _block_value(tab, key, values, blocks):
+    # Value of a time-indexed parameter for the block in key, from the values of
+    # the periods of the block
+    if not all(isinstance(v, numbers.Number) for v in values):
+        return values[0]
+    if tab in _zero_default_rate_tabs:
+        key = key if isinstance(key, tuple) else (key,)
+        block = next(k for k in key if k in blocks)
+        return sum(values) / len(blocks[block])
+    return sum(values) / len(values)
+
+
 def model_infeasibility_detection(strategic_model):
     # check_required_data() performs basic feasibility checks:
     # - at least one source node in the model
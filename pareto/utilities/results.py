@@ -22,17 +22,26 @@ from pareto.utilities.enums import (
     PipelineCost,
     InfrastructureTiming,
 )
-from pyomo.environ import Constraint, Var, Expression, units as pyunits, value
+from pyomo.environ import (
+    Constraint,
+    Var,
+    Expression,
+    Suffix,
+    units as pyunits,
+    value,
+)
 
-import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
 from enum import Enum
 
 import contextlib
+import os
 import sys
 import numpy as np
 
+# plotly is imported by the plotting functions when they are called, as it is slow
+# to import and not needed to solve models or write reports
+
 
 class FakeIO:
     def write(self, x):
@@ -63,16 +72,56 @@ class OutputUnits(Enum):
     unscaled_model_units = 1
 
 
+class ReportFormat(Enum):
+    # A single Excel workbook with one tab per variable
+    excel = 0
+    # A directory with one CSV file per tab
+    csv = 1
+    # A directory with one Parquet file per tab (requires pyarrow)
+    parquet = 2
+
+
+def _convert_values(values, from_units, to_units, conversions):
+    """
+    Convert a list of values from from_units to to_units in bulk. Values that are
+    None or text are kept as they are. The conversion is affine, to_value = factor *
+    from_value + offset, so that it also holds for units with an offset. The factor
+    and offset of each pair of units are only computed once with pint and are stored
+    in the conversions dictionary.
+    """
+    key = (from_units.to_string(), to_units.to_string())
+    if key not in conversions:
+        offset = pyunits.convert_value(0, from_units=from_units, to_units=to_units)
+        factor = (
+            pyunits.convert_value(1, from_units=from_units, to_units=to_units) - offset
+        )
+        conversions[key] = (factor, offset)
+    factor, offset = conversions[key]
+
+    numeric = [v is not None and not isinstance(v, str) for v in values]
+    array = np.array(
+        [v if is_numeric else np.nan for v, is_numeric in zip(values, numeric)],
+        dtype=float,
+    )
+    converted = (array * factor + offset).tolist()
+    return [
+        c if is_numeric else v for v, c, is_numeric in zip(values, converted, numeric)
+    ]
+
+
 def generate_report(
     model,
     results_obj=None,
     is_print=None,
     output_units=OutputUnits.user_units,
     fname="PARETO_report.xlsx",
+    report_format=ReportFormat.excel,
 ):
     """
     This method identifies the type of model: [strategic, operational], create a printing list based on is_print,
     and creates a dictionary that contains headers for all the variables that will be included in an Excel report.
+    With report_format=ReportFormat.csv or ReportFormat.parquet, fname is a directory and each tab is written to
+    its own file in it instead.
     IMPORTANT: If an indexed variable is added or removed from a model, the printing lists and headers should be updated
     accordingly.
     """
@@ -1129,6 +1178,18 @@ def generate_report(
     else:
         raise Exception("Model type {0} is not supported".format(model.type))
 
+    # The Excel report is streamed: the tab of each indexed variable or expression is
+    # written as soon as its rows are extracted, the other tabs at the end
+    excel_writer = None
+    if fname is not None:
+        if report_format == ReportFormat.excel:
+            excel_writer = _ExcelReportWriter(headers, model.proprietary_data)
+        elif report_format not in (ReportFormat.csv, ReportFormat.parquet):
+            raise Exception("Report format {0} is not supported".format(report_format))
+
+    # Conversion factors of the pairs of units used in the report
+    conversions = {}
+
     # Loop through all the variables in the model
     for variable in model.component_objects(Var):
         # we may also choose to not convert, additionally not all of our variables have units (binary variables),
@@ -1165,18 +1226,16 @@ def generate_report(
             to_unit = None
 
         if variable._data is not None:
-            # Loop through the indices of a variable. "i" is a tuple of indices
-            for i in variable._data:
-                # Convert the value to display units if necessary
-                if units_true and variable._data[i].value:
-                    var_value = pyunits.convert_value(
-                        variable._data[i].value,
-                        from_units=variable.get_units(),
-                        to_units=to_unit,
-                    )
-                else:
-                    var_value = variable._data[i].value
+            indices = list(variable._data)
+            var_values = [variable._data[i].value for i in indices]
+            # Convert the values to display units if necessary
+            if units_true:
+                var_values = _convert_values(
+                    var_values, variable.get_units(), to_unit, conversions
+                )
 
+            # Loop through the indices of a variable. "i" is a tuple of indices
+            for i, var_value in zip(indices, var_values):
                 if not variable.is_indexed():
                     # Create the overview report with variables that are not indexed, e.g.:
                     # total piped water, total trucked water, total externally sourced water, etc.
@@ -1225,72 +1284,67 @@ def generate_report(
                     ):
                         headers[str(variable.name) + "_dict"].append((*i, var_value))
 
+        if excel_writer is not None and variable.is_indexed():
+            excel_writer.write_tab(headers, str(variable.name) + "_dict")
+
     # Loop through all the expressions in the model
     for expr in model.component_objects(Expression):
+        indices = list(expr)
+        if not indices:
+            continue
         # The get_units function does not work properly when called on an
         # indexed expression, so we have to grab the units from the first
-        # index when we iterate through the expression. When we do that, we
-        # mark the units_fetched flag as True so we only do it once.
-        units_fetched = False
-        # Loop through the indexes of the expression.
-        for i in expr:
-            if not units_fetched:
-                units_true = (
-                    pyunits.get_units(expr[i]) is not None
-                    and pyunits.get_units(expr[i]).to_string() != "dimensionless"
-                )
+        # index of the expression.
+        from_unit = pyunits.get_units(expr[indices[0]])
+        units_true = from_unit is not None and from_unit.to_string() != "dimensionless"
 
-                # If units are used, determine what the display units should be based off user input
-                if units_true:
-                    from_unit = pyunits.get_units(expr[i])
-                    from_unit_string = from_unit.to_string()
-                    # the display units (to_unit) is defined by output_units from module parameter
-                    if output_units == OutputUnits.unscaled_model_units:
-                        to_unit = model.model_to_unscaled_model_display_units[
-                            from_unit_string
-                        ]
-                    elif output_units == OutputUnits.user_units:
-                        to_unit = model.model_to_user_units[from_unit_string]
-                    else:
-                        print(
-                            f"WARNING: Report output units selected by user for expression {expr.name} are not valid"
-                        )
-                        to_unit = None
-
-                    # If expression data is not none and indexed, update headers to display unit
-                    # if len(expr) > 1 and list(expr.keys())[0] is not None:
-                    if expr.is_indexed():
-                        header = list(headers[str(expr.name) + "_dict"][0])
-                        header[-1] = (
-                            headers[str(expr.name) + "_dict"][0][-1]
-                            + " ["
-                            + to_unit.to_string().replace("oil_bbl", "bbl")
-                            + "]"
-                        )
-                        headers[str(expr.name) + "_dict"][0] = tuple(header)
+        # If units are used, determine what the display units should be based off user input
+        if units_true:
+            from_unit_string = from_unit.to_string()
+            # the display units (to_unit) is defined by output_units from module parameter
+            if output_units == OutputUnits.unscaled_model_units:
+                to_unit = model.model_to_unscaled_model_display_units[from_unit_string]
+            elif output_units == OutputUnits.user_units:
+                to_unit = model.model_to_user_units[from_unit_string]
+            else:
+                print(
+                    f"WARNING: Report output units selected by user for expression {expr.name} are not valid"
+                )
+                to_unit = None
 
-                else:
-                    to_unit = None
+            # If expression data is not none and indexed, update headers to display unit
+            if expr.is_indexed():
+                header = list(headers[str(expr.name) + "_dict"][0])
+                header[-1] = (
+                    headers[str(expr.name) + "_dict"][0][-1]
+                    + " ["
+                    + to_unit.to_string().replace("oil_bbl", "bbl")
+                    + "]"
+                )
+                headers[str(expr.name) + "_dict"][0] = tuple(header)
 
-                units_fetched = True
+        else:
+            to_unit = None
 
-            # Convert the expression value to display units if necessary
-            # Use a try/except block to handle any errors in getting the value
-            # of the expression (e.g., division by zero)
+        # Evaluate the expression and convert the values to display units if
+        # necessary. Use a try/except block to handle any errors in getting the
+        # value of the expression (e.g., division by zero)
+        expr_values = []
+        for i in indices:
             try:
-                val = value(expr[i])
-                if units_true:
-                    expr_value = pyunits.convert_value(
-                        val,
-                        from_units=from_unit,
-                        to_units=to_unit,
-                    )
-                else:
-                    expr_value = val
-
+                expr_values.append(value(expr[i]))
+            except:
+                expr_values.append("Error")
+        if units_true:
+            try:
+                expr_values = _convert_values(
+                    expr_values, from_unit, to_unit, conversions
+                )
             except:
-                expr_value = "Error"
+                expr_values = ["Error"] * len(indices)
 
+        # Loop through the indexes of the expression.
+        for i, expr_value in zip(indices, expr_values):
             if not expr.is_indexed():
                 # Add non-indexed expressions to the v_F_Overview tab
                 if to_unit is None or expr_value == "Error":
@@ -1310,6 +1364,9 @@ def generate_report(
                 if expr_value is not None and expr_value != "Error" and expr_value != 0:
                     headers[str(expr.name) + "_dict"].append((*i, expr_value))
 
+        if excel_writer is not None and expr.is_indexed():
+            excel_writer.write_tab(headers, str(expr.name) + "_dict")
+
     # The sites_included result from the subsurface risk module is a bit
     # unique - it's the only result we have that is implemented as a Param. Add
     # it to the results file.
@@ -1418,19 +1475,382 @@ def generate_report(
             )
         )
 
-    # Creating the Excel report
-    if fname is not None:
-        with pd.ExcelWriter(fname) as writer:
-            for i in headers:
-                df = pd.DataFrame(headers[i][1:], columns=headers[i][0])
-                df.fillna("")
-                df.to_excel(
-                    writer, sheet_name=i[: -len("_dict")], index=False, startrow=1
-                )
+    # Creating the report
+    if excel_writer is not None:
+        excel_writer.save(headers, fname)
+    elif fname is not None:
+        _write_tabular_report(headers, fname, report_format)
 
     return model, headers
 
 
+def _excel_cell_value(val):
+    """
+    Convert a report value to what pandas writes to Excel: missing values are written
+    as empty text and infinite values as text
+    """
+    if val is None:
+        return ""
+    if isinstance(val, float):
+        if np.isnan(val):
+            return ""
+        if np.isinf(val):
+            return "inf" if val > 0 else "-inf"
+    return val
+
+
+class _ExcelReportWriter:
+    """
+    Write the report tabs to an Excel workbook opened in write-only mode, so that rows
+    are streamed to the file as they are appended instead of being held in memory as
+    cells (or as DataFrames). Each tab is written once, either with write_tab as soon
+    as its rows are final or by save for the tabs that were not written yet. The
+    layout is the same as DataFrame.to_excel(startrow=1, index=False): an empty first
+    row, the header row in bold with thin borders, and one row per entry.
+    """
+
+    def __init__(self, headers, proprietary_data):
+        from openpyxl import Workbook
+        from openpyxl.styles import Alignment, Border, Font, Side
+
+        thin = Side(style="thin")
+        self.header_font = Font(bold=True)
+        self.header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        self.header_alignment = Alignment(horizontal="center", vertical="top")
+        self.proprietary_data = proprietary_data
+        self.workbook = Workbook(write_only=True)
+        # The sheets are created upfront so that they keep the order of the tabs
+        self.sheets = {
+            i: self.workbook.create_sheet(title=i[: -len("_dict")]) for i in headers
+        }
+        self.written = set()
+
+    def write_tab(self, headers, tab):
+        """
+        Write the header and the rows of tab, followed by the "PROPRIETARY DATA"
+        footnote that generate_report adds to the tabs with entries if needed
+        """
+        if tab not in headers or tab in self.written:
+            return
+        rows = headers[tab][1:]
+        if self.proprietary_data is True and rows:
+            rows = rows + [("PROPRIETARY DATA",)]
+        self._write_rows(tab, headers[tab][0], rows)
+
+    def save(self, headers, fname):
+        """
+        Write the tabs that were not written yet, as they are in headers, and save
+        the workbook to fname
+        """
+        for i in headers:
+            if i not in self.written:
+                self._write_rows(i, headers[i][0], headers[i][1:])
+        self.workbook.save(fname)
+
+    def _write_rows(self, tab, header, rows):
+        from openpyxl.cell import WriteOnlyCell
+
+        if tab not in self.sheets:
+            self.sheets[tab] = self.workbook.create_sheet(title=tab[: -len("_dict")])
+        sheet = self.sheets[tab]
+        sheet.append([])
+        header_row = []
+        for column in header:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = self.header_font
+            cell.border = self.header_border
+            cell.alignment = self.header_alignment
+            header_row.append(cell)
+        sheet.append(header_row)
+        # Rows shorter than the header (e.g. footnotes) are padded like in a DataFrame
+        padding = [""] * len(header)
+        for row in rows:
+            values = [_excel_cell_value(val) for val in row]
+            sheet.append(values + padding[len(values) :])
+        self.written.add(tab)
+
+
+def _write_tabular_report(headers, dirname, report_format):
+    """
+    Write each report tab in headers to its own CSV or Parquet file in dirname, named
+    after the tab. These files are meant to be read by other programs, so they only
+    contain the header and the entries of each tab: the "PROPRIETARY DATA" footnote
+    is not written, and repeated column names (e.g. "Location") are renamed "Location.1"
+    and so on, as pandas does when reading CSV files.
+    """
+    os.makedirs(dirname, exist_ok=True)
+    for i in headers:
+        columns = []
+        repeats = {}
+        for column in headers[i][0]:
+            if column in repeats:
+                repeats[column] += 1
+                columns.append("{0}.{1}".format(column, repeats[column]))
+            else:
+                repeats[column] = 0
+                columns.append(column)
+        rows = [row for row in headers[i][1:] if row != ("PROPRIETARY DATA",)]
+        df = pd.DataFrame(rows, columns=columns)
+        tab = i[: -len("_dict")]
+        if report_format == ReportFormat.csv:
+            df.to_csv(os.path.join(dirname, tab + ".csv"), index=False)
+        else:
+            # Parquet columns must have a single type, so the entries of columns
+            # mixing numbers and text (e.g. "Error" entries) are written as text
+            for column in df.columns:
+                if df[column].dtype == object:
+                    df[column] = df[column].map(
+                        lambda v: v if isinstance(v, str) or pd.isna(v) else str(v)
+                    )
+            df.to_parquet(os.path.join(dirname, tab + ".parquet"), index=False)
+
+
+def _report_solution_values(fname):
+    """
+    Read the variable values of an Excel report written by generate_report() into a
+    dictionary mapping tab names to {index: value} dictionaries
+    """
+    tabs = pd.read_excel(fname, sheet_name=None, header=1)
+    solution = {}
+    for tab, df in tabs.items():
+        if tab == "v_F_Overview":
+            # Variables that are not indexed are reported in the overview tab
+            for name, var_value in zip(df["Variable Name"], df["Total"]):
+                solution[name] = {None: var_value}
+        elif df.shape[1] >= 2:
+            indices = list(df.iloc[:, :-1].itertuples(index=False, name=None))
+            if df.shape[1] == 2:
+                indices = [index[0] for index in indices]
+            solution[tab] = dict(zip(indices, df.iloc[:, -1]))
+    return solution
+
+
+def initialize_from_solution(model, solution, output_units=OutputUnits.user_units):
+    """
+    Set the variable values of a model from a previous solution, e.g., to warm start
+    solve_model() with the option "warmstart": True when re-solving a similar case.
+
+    solution is either the file name of an Excel report written by generate_report()
+    with the given output_units, or a solution snapshot in model units mapping
+    variable names to {index: value} dictionaries, e.g., from pareto_front().
+    Values are matched by variable name and index, values of variables or indices
+    that are not in the model are skipped.
+
+    Returns the number of variable values set.
+    """
+    from_report = not isinstance(solution, dict)
+    if from_report:
+        solution = _report_solution_values(solution)
+
+    matched = 0
+    skipped = 0
+    for name, var_values in solution.items():
+        variable = model.find_component(name)
+        if variable is None or variable.ctype is not Var:
+            # Tabs of the report that are not variables are not counted
+            if not from_report:
+                skipped += len(var_values)
+            continue
+
+        # Values of a report are in display units
+        to_unit = None
+        units = variable.get_units()
+        if from_report and units is not None and units.to_string() != "dimensionless":
+            if output_units == OutputUnits.unscaled_model_units:
+                from_unit = model.model_to_unscaled_model_display_units[
+                    units.to_string()
+                ]
+            else:
+                from_unit = model.model_to_user_units[units.to_string()]
+            to_unit = units
+
+        for index, var_value in var_values.items():
+            if index not in variable or var_value is None or pd.isna(var_value):
+                skipped += 1
+                continue
+            if to_unit is not None:
+                var_value = pyunits.convert_value(
+                    float(var_value), from_units=from_unit, to_units=to_unit
+                )
+            if variable[index].is_integer():
+                var_value = round(var_value)
+            variable[index].set_value(var_value, skip_validation=True)
+            matched += 1
+
+    print(
+        f"Initialized {matched} variable values from the solution, skipped {skipped} "
+        "values without a matching model variable or value"
+    )
+    return matched
+
+
+# Types of the entries of index positions with mixed types in a solution file, and
+# how to convert them back from text
+_index_types = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": lambda entry: entry == "True",
+}
+
+
+def _solution_arrays(kind, component, items):
+    """
+    Return the arrays of a component in a solution file written by save_solution():
+    one array per index position and one array with the values
+    """
+    items = list(items)
+    indices = [index if isinstance(index, tuple) else (index,) for index, _ in items]
+    if len({len(index) for index in indices}) > 1:
+        print(f"WARNING: {component} is not saved, its indices have different lengths")
+        return {}
+    arrays = {
+        f"{kind}/{component}/value": np.array(
+            [np.nan if v is None else v for _, v in items], dtype=float
+        )
+    }
+    if items and indices[0] != (None,):
+        for position, column in enumerate(zip(*indices)):
+            types = [type(entry).__name__ for entry in column]
+            if len(set(types)) > 1:
+                # Index positions with mixed types are stored as text, with the type
+                # of each entry so that they are converted back when read
+                if not set(types) <= set(_index_types):
+                    print(
+                        f"WARNING: {component} is not saved, its indices have "
+                        f"types that cannot be saved: {sorted(set(types))}"
+                    )
+                    return {}
+                arrays[f"{kind}/{component}/index_type/{position}"] = np.array(types)
+                column = [str(entry) for entry in column]
+            arrays[f"{kind}/{component}/index/{position}"] = np.array(column)
+    return arrays
+
+
+def save_solution(model, fname):
+    """
+    Save the values of all variables of a model, and the duals of the constraints if
+    the model has a "dual" suffix with values, to fname in the compressed NumPy
+    format (.npz). The file holds one array of values per component and one array
+    per index position, so that large solutions are written and read quickly and
+    solutions of different runs can be compared with diff_solutions(). Index
+    positions mixing types (e.g. numbers and text) are saved as text together with
+    the type of each entry, so that the indices read back are the same.
+    """
+    arrays = {}
+    for var in model.component_objects(Var, descend_into=True):
+        arrays.update(
+            _solution_arrays(
+                "var", var.name, ((index, v.value) for index, v in var.items())
+            )
+        )
+
+    dual = model.component("dual")
+    if isinstance(dual, Suffix) and len(dual) > 0:
+        constraints = {}
+        for con, dual_value in dual.items():
+            if con.ctype is Constraint:
+                constraints.setdefault(con.parent_component().name, []).append(
+                    (con.index(), dual_value)
+                )
+        for name, items in constraints.items():
+            arrays.update(_solution_arrays("dual", name, items))
+
+    np.savez_compressed(fname, **arrays)
+
+
+def _read_solution(fname):
+    """
+    Read a solution file written by save_solution() into a dictionary mapping
+    ("var" or "dual", component name) to {index: value} dictionaries
+    """
+    solution = {}
+    with np.load(fname, allow_pickle=False) as data:
+        for key in data.files:
+            kind, component, field = key.split("/", 2)
+            if field != "value":
+                continue
+            values = data[key].tolist()
+            index_keys = sorted(
+                (k for k in data.files if k.startswith(f"{kind}/{component}/index/")),
+                key=lambda k: int(k.rsplit("/", 1)[1]),
+            )
+            columns = []
+            for k in index_keys:
+                column = data[k].tolist()
+                position = k.rsplit("/", 1)[1]
+                type_key = f"{kind}/{component}/index_type/{position}"
+                if type_key in data.files:
+                    column = [
+                        _index_types[entry_type](entry)
+                        for entry_type, entry in zip(data[type_key].tolist(), column)
+                    ]
+                columns.append(column)
+            if not columns:
+                indices = [None] * len(values)
+            elif len(columns) == 1:
+                indices = columns[0]
+            else:
+                indices = list(zip(*columns))
+            solution[kind, component] = dict(zip(indices, values))
+    return solution
+
+
+def load_solution(model, fname):
+    """
+    Load the variable values, and the duals if the model has a "dual" suffix, saved
+    with save_solution() into a model, matching them by component name and index
+    like initialize_from_solution(). Returns the number of variable values set.
+    """
+    solution = _read_solution(fname)
+    matched = initialize_from_solution(
+        model,
+        {
+            component: values
+            for (kind, component), values in solution.items()
+            if kind == "var"
+        },
+    )
+
+    dual = model.component("dual")
+    if isinstance(dual, Suffix):
+        for (kind, component), values in solution.items():
+            con = model.find_component(component)
+            if kind != "dual" or con is None or con.ctype is not Constraint:
+                continue
+            for index, dual_value in values.items():
+                if index in con and not np.isnan(dual_value):
+                    dual[con[index]] = dual_value
+    return matched
+
+
+def diff_solutions(fname_1, fname_2, tolerance=1e-6):
+    """
+    Compare two solution files written by save_solution(). Returns a DataFrame with
+    the entries whose values differ by more than tolerance or that are only in one
+    of the files, with columns: kind ("var" or "dual"), component, index, value_1
+    and value_2.
+    """
+    solution_1 = _read_solution(fname_1)
+    solution_2 = _read_solution(fname_2)
+    rows = []
+    for key in sorted(solution_1.keys() | solution_2.keys()):
+        values_1 = solution_1.get(key, {})
+        values_2 = solution_2.get(key, {})
+        indices = list(values_1) + [i for i in values_2 if i not in values_1]
+        for index in indices:
+            value_1 = values_1.get(index, np.nan)
+            value_2 = values_2.get(index, np.nan)
+            if (
+                np.isnan(value_1) != np.isnan(value_2)
+                or abs(value_1 - value_2) > tolerance
+            ):
+                rows.append((*key, index, value_1, value_2))
+    return pd.DataFrame(
+        rows, columns=["kind", "component", "index", "value_1", "value_2"]
+    )
+
+
 def plot_sankey(input_data={}, args=None):
     """
     This method receives data in the form of 3 separate lists (origin, destination, value lists), generate_report dictionary
@@ -1779,6 +2199,8 @@ def generate_sankey(source=[], destination=[], value=[], label=[], args=None):
             else:
                 figure_output = args["output_file"]
 
+    import plotly.graph_objects as go
+
     # Creating links and nodes based on the passed in lists to be used as the data for generating the sankey diagram
     link = dict(source=source, target=destination, value=value)
     node = dict(label=label, pad=30, thickness=15, line=dict(color="black", width=0.5))
@@ -1825,6 +2247,8 @@ def plot_bars(input_data, args):
     The 'group_by' key accepts a value that is equal to a column name of the variable data, this will specify which column to use for the x axis. Finally, the 'labels'
     key accepts a tuple of labels to be assigned to the get_data format(list) variable since no labels are provided from the get_data method.
     """
+    import plotly.express as px
+
     # Suppress SettingWithCopyWarning because of false positives
     pd.options.mode.chained_assignment = None
 
@@ -2130,6 +2554,8 @@ def plot_scatter(input_data, args):
     for the size argument and assigning those size values to their respective rows. Once these data modifications are completed, the scatter plot
     is created with the data and arguments that are provided.
     """
+    import plotly.express as px
+
     # Suppress SettingWithCopyWarning because of false positives
     pd.options.mode.chained_assignment = None
 
@@ -10,9 +10,15 @@
 # the Software to reproduce, distribute copies to the public, prepare derivative works, and perform
 # publicly and display publicly, and to permit others to do so.
 #####################################################################################################
-from pyomo.opt.base.solvers import SolverFactory, OptSolver, check_available_solvers
+from pyomo.common import Executable
+
+# Importing SolverFactory from pyomo.environ registers the solver plugins
+from pyomo.environ import SolverFactory
+from pyomo.opt.base.solvers import OptSolver, check_available_solvers
 from numbers import Number
-from typing import Iterable
+import os
+import time
+from typing import Iterable, List, Optional
 
 
 class SolverError(ValueError):
@@ -27,6 +33,24 @@ class NoAvailableSolver(SolverError):
         return f"No available solver found among choices: {self.choices}"
 
 
+# Solvers supported by PARETO, checked by `pareto solvers` if no names are given
+SUPPORTED_SOLVERS = (
+    "gurobi_direct",
+    "gurobi",
+    "gams:CPLEX",
+    "cbc",
+    "appsi_gurobi",
+    "appsi_cplex",
+    "appsi_highs",
+    "ipopt",
+)
+
+# Result of the availability and license check of each solver name in this process:
+# {name: (available, time taken by the check [s])}
+_solver_checks = {}
+_idaes_ext_solvers_enabled = False
+
+
 def _enable_idaes_ext_solvers() -> None:
     """
     Apply the steps required to be able to use the IDAES-EXT solvers, i.e. the solvers installed by the `idaes get-extensions` command, within the current Python process.
@@ -35,18 +59,91 @@ def _enable_idaes_ext_solvers() -> None:
     are applied as an import side-effect.
     Additionally, since the standard Python import mechanism is used, calling this function again after the first time
     has no effect (and no impact on performance).
+    Pyomo caches the location of solver executables, so the cache is cleared for the modified search path to be used.
     """
+    global _idaes_ext_solvers_enabled
     import idaes
 
+    Executable.rehash()
+    _idaes_ext_solvers_enabled = True
+
+
+def _idaes_ext_solvers_installed() -> bool:
+    """
+    Check if the IDAES-EXT solvers are installed, without importing IDAES, by looking for executables in the IDAES bin
+    directory (the same location as `idaes.config.get_data_directory()`).
+    """
+    if "IDAES_DATA" in os.environ:
+        data_directory = os.environ["IDAES_DATA"]
+    elif os.name == "nt":
+        data_directory = os.path.join(os.environ.get("LOCALAPPDATA", ""), "idaes")
+    else:
+        data_directory = os.path.join(os.path.expanduser("~"), ".idaes")
+    try:
+        with os.scandir(os.path.join(data_directory, "bin")) as entries:
+            return any(
+                entry.is_file() and os.access(entry.path, os.X_OK) for entry in entries
+            )
+    except OSError:
+        return False
+
+
+def _solver_is_available(name: str, solver: OptSolver, refresh: bool = False) -> bool:
+    """
+    Check if a solver is available and has a valid license. The result is cached for the current process, since the license
+    checks of commercial solvers can take several seconds; use refresh=True to check again.
+    """
+    if refresh or name not in _solver_checks:
+        start = time.perf_counter()
+        try:
+            available = bool(
+                solver.available(exception_flag=True) and solver.license_is_valid()
+            )
+        except:
+            available = False
+        _solver_checks[name] = (available, time.perf_counter() - start)
+    return _solver_checks[name][0]
+
 
-def get_solver(*solver_names: Iterable[str]) -> OptSolver:
+def _first_available_solver(
+    solver_names: Iterable[str], refresh: bool = False
+) -> Optional[OptSolver]:
+    """
+    Return a solver object for the first of the names that is available and has a valid license, or None.
+    """
+    for name in solver_names:
+        try:
+            solver = SolverFactory(name)
+        except:
+            continue
+        if _solver_is_available(name, solver, refresh=refresh):
+            print(f"Model solved using {name}")
+            return solver
+    return None
+
+
+def clear_solver_cache() -> None:
+    """
+    Clear the cached availability and license checks of the solvers, e.g. after installing a solver or a license.
+    """
+    _solver_checks.clear()
+    Executable.rehash()
+
+
+def get_solver(*solver_names: Iterable[str], refresh: bool = False) -> OptSolver:
     """
     Return a solver object from one or more names.
 
     This is a thin wrapper around pyomo's SolverFactory; apart from basic validation to check if a solver is available, all functionality is currently delegated to it.
+    If the IDAES-EXT solvers are installed, they take precedence over solvers of the same name found on the PATH.
+    As importing IDAES is slow, it is only imported if the IDAES bin directory contains executables, or if none of the
+    choices is available otherwise.
+    Whether a solver is available is only checked the first time its name is requested in the current process;
+    a new solver object is still returned on every call.
 
     Args:
         solver_names: one or more solver names to attempt for instantiating the solver object. If multiple names are given, the first available solver will be returned.
+        refresh: if True, check again whether the solvers are available instead of using the results of previous checks.
 
     Returns:
         The instantiated solver object.
@@ -55,23 +152,64 @@ def get_solver(*solver_names: Iterable[str]) -> OptSolver:
         NoAvailableSolver if none of the choices succeed.
     """
 
-    _enable_idaes_ext_solvers()
+    if not _idaes_ext_solvers_enabled and _idaes_ext_solvers_installed():
+        _enable_idaes_ext_solvers()
+    solver = _first_available_solver(solver_names, refresh=refresh)
+    if solver is None and not _idaes_ext_solvers_enabled:
+        _enable_idaes_ext_solvers()
+        solver = _first_available_solver(solver_names, refresh=True)
+    if solver is None:
+        raise NoAvailableSolver(solver_names)
+    # TODO add extra solver validation, logging, etc
+    return solver
+
 
+def check_solvers(
+    solver_names: Iterable[str] = SUPPORTED_SOLVERS, refresh: bool = True
+) -> List[dict]:
+    """
+    Check which solvers are available, including the IDAES-EXT solvers.
+
+    Args:
+        solver_names: the solver names to check. Default = SUPPORTED_SOLVERS
+        refresh: if False, report the results of previous checks in this process instead of checking again.
+
+    Returns:
+        A list with a dictionary for each solver name, with keys "solver", "available" and "check_time" (time taken by the
+        availability and license check, in seconds).
+    """
+    if not _idaes_ext_solvers_enabled:
+        _enable_idaes_ext_solvers()
+        refresh = True
+    checks = []
     for name in solver_names:
-        # Checks for solver is available and then for valid license
         try:
             solver = SolverFactory(name)
-            if solver.available(exception_flag=True):
-                if solver.license_is_valid():
-                    print(f"Model solved using {name}")
-                    break
         except:
-            pass
+            _solver_checks[name] = (False, 0.0)
+        else:
+            _solver_is_available(name, solver, refresh=refresh)
+        available, check_time = _solver_checks[name]
+        checks.append(
+            {"solver": name, "available": available, "check_time": check_time}
+        )
+    return checks
 
-    else:
-        raise NoAvailableSolver(solver_names)
-    # TODO add extra solver validation, logging, etc
-    return solver
+
+def is_persistent(solver) -> bool:
+    """
+    Check if a solver object is a Pyomo persistent solver interface (APPSI, e.g. `appsi_gurobi`, `appsi_cplex` or `appsi_highs`).
+
+    Persistent solvers keep the model loaded between solves and only push the changes made to the model since the previous solve (fixed variables, bounds, mutable parameters, objective), instead of writing and loading the whole model again.
+
+    Args:
+        solver: the solver object to check.
+    Returns:
+        True if the solver is a persistent solver interface, False otherwise.
+    """
+    from pyomo.contrib.appsi.base import PersistentSolver
+
+    return isinstance(solver, PersistentSolver)
 
 
 def set_timeout(solver: OptSolver, timeout_s: Number) -> OptSolver:
@@ -86,6 +224,20 @@ def set_timeout(solver: OptSolver, timeout_s: Number) -> OptSolver:
     Raises:
         SolverError if no mapping for the option key is found for the given solver.
     """
+    if is_persistent(solver):
+        # Persistent solver interfaces have a solver-independent time limit option.
+        # However, the solve() method of the interfaces created by SolverFactory
+        # resets it on every call, so the time limit is also set as a solver option.
+        solver.config.time_limit = float(timeout_s)
+        persistent_key_mapping = {
+            "gurobi_options": "TimeLimit",
+            "cplex_options": "timelimit",
+            "highs_options": "time_limit",
+        }
+        for options_name, option_key in persistent_key_mapping.items():
+            if hasattr(solver, options_name):
+                getattr(solver, options_name)[option_key] = float(timeout_s)
+        return solver
     name_key_mapping = {
         "gurobi": "timeLimit",
         "gurobi_direct": "timeLimit",
@@ -20,10 +20,10 @@ same name from pyomo.core.base.units_container.
 
 from pyomo.core.expr.numvalue import (
     native_types,
-    pyomo_constant_types,
+    NumericConstant,
 )
 
-from pyomo.core.expr import current as EXPR
+from pyomo.core.expr.visitor import StreamBasedExpressionVisitor
 from pyomo.core.base.units_container import _PyomoUnit
 from pyomo.environ import units as pyunits
 
@@ -190,7 +190,7 @@ def units_setup(model):
         model.model_to_unscaled_model_display_units[model_unit] = developer_output
 
 
-class PintUnitExtractionVisitor(EXPR.StreamBasedExpressionVisitor):
+class PintUnitExtractionVisitor(StreamBasedExpressionVisitor):
     def __init__(self, pyomo_units_container):
         """
         Visitor class used to determine units of an expression. This class is
@@ -227,7 +227,7 @@ class PintUnitExtractionVisitor(EXPR.StreamBasedExpressionVisitor):
         # These nodes are dimensionless,
         # and for PARETO purposes should not return a unit
         # (e.g. dimensionless -1 to represent subtraction)
-        if nodetype in native_types or nodetype in pyomo_constant_types:
+        if nodetype in native_types or nodetype is NumericConstant:
             return
 
         if not node.is_expression_type():
@@ -69,6 +69,7 @@ setup(
         "pyomo>=6.2",
         "numpy",
         "pandas>=2,<3",
+        "scipy",
         "openpyxl",
         # for the moment mainly for getting solvers with `idaes get-extensions`
         # https://peps.python.org/pep-0440/#compatible-release
@@ -104,6 +105,7 @@ setup(
     entry_points={
         "console_scripts": [
             "stagedfright=stagedfright:main",
+            "pareto=pareto.cli:main",
         ]
     },
 )